@@ -0,0 +1,403 @@
+"""
+Hedged LLM requests: race a secondary model when the primary is slow.
+
+A hedged call starts on the primary (provider, model). If it has not answered
+within a percentile of the primary's recent latencies, the same request is sent
+to a secondary (provider, model) and whichever answers first wins. Both sides
+run over the streaming endpoint, so the loser is cancelled by closing its
+connection, which stops the generation server-side. The async variants race
+two tasks on the event loop instead of two threads.
+"""
+import asyncio
+import logging
+import queue
+import threading
+import time
+from collections import deque
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional, Tuple
+
+from SimpleLLM.language.llm_providers.resilience import StreamHandle, bind_stream_handle
+from SimpleLLM.language.llm_result import bind_context, current_result
+
+# Latency percentile after which a hedge is sent, and the samples needed before it is trusted
+DEFAULT_PERCENTILE = 95
+DEFAULT_MIN_SAMPLES = 10
+
+# Seconds to wait before hedging while too few latencies are known, and the lower bound on the hedge delay
+DEFAULT_INITIAL_DELAY = 30.0
+DEFAULT_MIN_DELAY = 1.0
+
+# Recent latencies kept per (provider, model, mode), and hedge records kept for stats
+LATENCY_WINDOW = 200
+MAX_HEDGE_RECORDS = 500
+
+_CHUNK = "chunk"
+_DONE = "done"
+_ERROR = "error"
+
+
+def _provider_name(llm) -> str:
+    return getattr(llm.provider, "name", str(llm.provider))
+
+
+class LatencyTracker:
+    """Sliding window of recent call latencies per key."""
+
+    def __init__(self, window: int = LATENCY_WINDOW):
+        self.window = window
+        self._samples: Dict[Tuple, deque] = {}
+        self._lock = threading.Lock()
+
+    def record(self, key: Tuple, seconds: float) -> None:
+        with self._lock:
+            self._samples.setdefault(key, deque(maxlen=self.window)).append(seconds)
+
+    def percentile(self, key: Tuple, percentile: float, min_samples: int = 1) -> Optional[float]:
+        """The given percentile (0-100) of the key's latencies, or None with fewer than min_samples."""
+        with self._lock:
+            samples = sorted(self._samples.get(key, ()))
+        if not samples or len(samples) < min_samples:
+            return None
+        index = min(len(samples) - 1, int(len(samples) * percentile / 100))
+        return samples[index]
+
+
+class HedgeRecorder:
+    """Counts hedged calls per primary model and keeps a log of recent hedges."""
+
+    def __init__(self, max_records: int = MAX_HEDGE_RECORDS):
+        self.records = deque(maxlen=max_records)
+        self._counts: Dict[str, Dict[str, int]] = {}
+        self._lock = threading.Lock()
+
+    def record_call(self, primary: str) -> None:
+        with self._lock:
+            self._counts.setdefault(primary, {"calls": 0, "hedged": 0, "secondary_wins": 0, "failed": 0})["calls"] += 1
+
+    def record_hedge(self, primary: str, secondary: str, mode: str, delay: float,
+                     winner: Optional[str], elapsed: float) -> None:
+        """
+        Record one hedged call.
+
+        Args:
+            primary: "provider/model" of the primary
+            secondary: "provider/model" of the secondary
+            mode: "text" or "stream"
+            delay: Seconds waited before the hedge was sent
+            winner: "primary", "secondary", or None if both failed
+            elapsed: Seconds from the primary's start until the winner was chosen
+        """
+        with self._lock:
+            counts = self._counts.setdefault(primary, {"calls": 0, "hedged": 0, "secondary_wins": 0, "failed": 0})
+            counts["hedged"] += 1
+            if winner == "secondary":
+                counts["secondary_wins"] += 1
+            elif winner is None:
+                counts["failed"] += 1
+            self.records.append({
+                "time": time.time(),
+                "primary": primary,
+                "secondary": secondary,
+                "mode": mode,
+                "delay": round(delay, 3),
+                "winner": winner,
+                "elapsed": round(elapsed, 3),
+            })
+        logging.info(f"Hedged {primary} with {secondary} after {delay:.1f}s; winner: {winner or 'none'} at {elapsed:.1f}s")
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        """Call, hedge, secondary-win and failure counts per primary "provider/model"."""
+        with self._lock:
+            return {primary: dict(counts) for primary, counts in self._counts.items()}
+
+    def reset(self) -> None:
+        with self._lock:
+            self.records.clear()
+            self._counts.clear()
+
+
+# Shared by every hedged LLM in the process
+latency_tracker = LatencyTracker()
+hedge_recorder = HedgeRecorder()
+
+
+class HedgePolicy:
+    """
+    When and where to hedge an LLM's requests.
+
+    Args:
+        provider: LLMProvider of the secondary
+        model_name: Model name of the secondary
+        percentile: Primary latency percentile (0-100) after which the hedge is sent
+        min_samples: Latencies needed before the percentile replaces initial_delay
+        initial_delay: Seconds to wait before hedging while too few latencies are known
+        min_delay: Lower bound on the hedge delay, so fast models are not hedged on every call
+    """
+
+    def __init__(self, provider, model_name: str, percentile: float = DEFAULT_PERCENTILE,
+                 min_samples: int = DEFAULT_MIN_SAMPLES, initial_delay: float = DEFAULT_INITIAL_DELAY,
+                 min_delay: float = DEFAULT_MIN_DELAY):
+        self.provider = provider
+        self.model_name = model_name
+        self.percentile = percentile
+        self.min_samples = min_samples
+        self.initial_delay = initial_delay
+        self.min_delay = min_delay
+        self._secondaries: Dict[Tuple, Any] = {}
+        self._lock = threading.Lock()
+
+    def delay(self, key: Tuple) -> float:
+        """Seconds to wait on the primary before hedging."""
+        threshold = latency_tracker.percentile(key, self.percentile, self.min_samples)
+        if threshold is None:
+            return self.initial_delay
+        return max(self.min_delay, threshold)
+
+    def secondary_for(self, primary):
+        """The secondary LLM, built with the primary's generation parameters."""
+        settings = (primary.temperature, primary.top_p, primary.max_tokens)
+        with self._lock:
+            if settings not in self._secondaries:
+                self._secondaries[settings] = type(primary)(self.provider, self.model_name, *settings)
+            return self._secondaries[settings]
+
+
+def _report_winner(llm) -> None:
+    """Mark the call in progress as hedged and report the model that answered it."""
+    result = current_result()
+    if result is not None:
+        result.hedged = True
+        result.provider = _provider_name(llm)
+        result.model = llm.model_name
+
+
+class _Contender:
+    """Runs one side of a race on a daemon thread, reporting chunks to a shared queue."""
+
+    def __init__(self, name: str, llm, events: queue.Queue, args: Tuple):
+        self.name = name
+        self.llm = llm
+        self.events = events
+        self.args = args
+        self.chunks: List[str] = []
+        # Holds the streamed response, so the race can close it while this thread is blocked reading
+        self.handle = StreamHandle()
+        self.started = time.monotonic()
+        # Bound to the caller's context so usage and retries count against the call's result
+        threading.Thread(target=bind_context(self._run), name=f"hedge-{name}", daemon=True).start()
+
+    @property
+    def label(self) -> str:
+        return f"{_provider_name(self.llm)}/{self.llm.model_name}"
+
+    def cancel(self) -> None:
+        """Stop this contender, closing its connection even if no chunk has arrived yet."""
+        self.handle.cancel()
+
+    def _run(self) -> None:
+        try:
+            with bind_stream_handle(self.handle):
+                stream = self.llm._provider_stream(*self.args)
+                try:
+                    for chunk in stream:
+                        if self.handle.cancelled.is_set():
+                            return
+                        self.events.put((self, _CHUNK, chunk))
+                finally:
+                    # Ends the stream and settles its rate-limiter reservation
+                    stream.close()
+            self.events.put((self, _DONE, None))
+        except Exception as e:
+            self.events.put((self, _ERROR, e))
+
+
+def _race(primary, mode: str, args: Tuple) -> Iterator[str]:
+    """
+    Run a hedged call and yield the winner's chunks.
+
+    In "text" mode the first contender to finish wins; in "stream" mode the
+    first to produce a chunk wins and the rest of its stream is passed through.
+    A primary that fails before the hedge is sent raises at once (the provider
+    layer has already retried it); once both are running, the call fails only
+    if both do.
+    """
+    policy: HedgePolicy = primary.hedge
+    primary_label = f"{_provider_name(primary)}/{primary.model_name}"
+    key = (_provider_name(primary), primary.model_name, mode)
+    delay = policy.delay(key)
+    hedge_recorder.record_call(primary_label)
+
+    events: queue.Queue = queue.Queue()
+    first = _Contender("primary", primary, events, args)
+    contenders = [first]
+    errors: Dict[str, Exception] = {}
+    winner: Optional[_Contender] = None
+    done = False
+    try:
+        while winner is None:
+            timeout = None
+            if len(contenders) == 1:
+                timeout = max(0.0, first.started + delay - time.monotonic())
+            try:
+                contender, kind, payload = events.get(timeout=timeout)
+            except queue.Empty:
+                contenders.append(_Contender("secondary", policy.secondary_for(primary), events, args))
+                continue
+            if kind == _ERROR:
+                errors[contender.name] = payload
+                if len(errors) == len(contenders):
+                    if len(contenders) > 1:
+                        hedge_recorder.record_hedge(primary_label, contenders[1].label, mode, delay, None,
+                                                    time.monotonic() - first.started)
+                    raise errors.get("primary", payload)
+                continue
+            if kind == _CHUNK:
+                contender.chunks.append(payload)
+            done = kind == _DONE
+            if done or mode == "stream":
+                winner = contender
+
+        elapsed = time.monotonic() - first.started
+        for contender in contenders:
+            if contender is not winner:
+                contender.cancel()
+        # A cancelled primary's latency is at least elapsed; recording it keeps the slow tail in the window
+        latency_tracker.record(key, elapsed)
+        if len(contenders) > 1:
+            hedge_recorder.record_hedge(primary_label, contenders[1].label, mode, delay, winner.name, elapsed)
+            _report_winner(winner.llm)
+
+        yield from winner.chunks
+        while not done:
+            contender, kind, payload = events.get()
+            if contender is not winner:
+                continue
+            if kind == _ERROR:
+                raise payload
+            if kind == _CHUNK:
+                yield payload
+            done = kind == _DONE
+    finally:
+        for contender in contenders:
+            contender.cancel()
+
+
+def hedged_generate_text(primary, user_prompt: str, system_prompt: str = "",
+                         response_format: Optional[dict] = None) -> str:
+    """Generate text with primary.hedge; the first contender to finish wins."""
+    return "".join(_race(primary, "text", (user_prompt, system_prompt, response_format)))
+
+
+def hedged_generate_text_stream(primary, user_prompt: str, system_prompt: str = "",
+                                response_format: Optional[dict] = None) -> Iterator[str]:
+    """Stream text with primary.hedge; the first contender to produce a chunk wins."""
+    return _race(primary, "stream", (user_prompt, system_prompt, response_format))
+
+
+class _AsyncContender:
+    """Runs one side of an async race as a task, reporting chunks to a shared asyncio queue."""
+
+    def __init__(self, name: str, llm, events: asyncio.Queue, args: Tuple):
+        self.name = name
+        self.llm = llm
+        self.events = events
+        self.args = args
+        self.chunks: List[str] = []
+        self.started = time.monotonic()
+        # Tasks copy the caller's context, so usage and retries count against the call's result
+        self.task = asyncio.ensure_future(self._run())
+
+    @property
+    def label(self) -> str:
+        return f"{_provider_name(self.llm)}/{self.llm.model_name}"
+
+    async def _run(self) -> None:
+        stream = self.llm._provider_stream_async(*self.args)
+        try:
+            async for chunk in stream:
+                self.events.put_nowait((self, _CHUNK, chunk))
+            self.events.put_nowait((self, _DONE, None))
+        except Exception as e:
+            self.events.put_nowait((self, _ERROR, e))
+        finally:
+            # Closing the response stops the losing generation server-side
+            await stream.aclose()
+
+
+async def _race_async(primary, mode: str, args: Tuple) -> AsyncIterator[str]:
+    """Async _race: the same rules, with the contenders as tasks that are cancelled when they lose."""
+    policy: HedgePolicy = primary.hedge
+    primary_label = f"{_provider_name(primary)}/{primary.model_name}"
+    key = (_provider_name(primary), primary.model_name, mode)
+    delay = policy.delay(key)
+    hedge_recorder.record_call(primary_label)
+
+    events: asyncio.Queue = asyncio.Queue()
+    first = _AsyncContender("primary", primary, events, args)
+    contenders = [first]
+    errors: Dict[str, Exception] = {}
+    winner: Optional[_AsyncContender] = None
+    done = False
+    try:
+        while winner is None:
+            timeout = None
+            if len(contenders) == 1:
+                timeout = max(0.0, first.started + delay - time.monotonic())
+            try:
+                contender, kind, payload = await asyncio.wait_for(events.get(), timeout)
+            except asyncio.TimeoutError:
+                contenders.append(_AsyncContender("secondary", policy.secondary_for(primary), events, args))
+                continue
+            if kind == _ERROR:
+                errors[contender.name] = payload
+                if len(errors) == len(contenders):
+                    if len(contenders) > 1:
+                        hedge_recorder.record_hedge(primary_label, contenders[1].label, mode, delay, None,
+                                                    time.monotonic() - first.started)
+                    raise errors.get("primary", payload)
+                continue
+            if kind == _CHUNK:
+                contender.chunks.append(payload)
+            done = kind == _DONE
+            if done or mode == "stream":
+                winner = contender
+
+        elapsed = time.monotonic() - first.started
+        for contender in contenders:
+            if contender is not winner:
+                contender.task.cancel()
+        latency_tracker.record(key, elapsed)
+        if len(contenders) > 1:
+            hedge_recorder.record_hedge(primary_label, contenders[1].label, mode, delay, winner.name, elapsed)
+            _report_winner(winner.llm)
+
+        for chunk in winner.chunks:
+            yield chunk
+        while not done:
+            contender, kind, payload = await events.get()
+            if contender is not winner:
+                continue
+            if kind == _ERROR:
+                raise payload
+            if kind == _CHUNK:
+                yield payload
+            done = kind == _DONE
+    finally:
+        for contender in contenders:
+            contender.task.cancel()
+
+
+async def hedged_generate_text_async(primary, user_prompt: str, system_prompt: str = "",
+                                     response_format: Optional[dict] = None) -> str:
+    """Async hedged_generate_text."""
+    race = _race_async(primary, "text", (user_prompt, system_prompt, response_format))
+    try:
+        return "".join([chunk async for chunk in race])
+    finally:
+        await race.aclose()
+
+
+def hedged_generate_text_stream_async(primary, user_prompt: str, system_prompt: str = "",
+                                      response_format: Optional[dict] = None) -> AsyncIterator[str]:
+    """Async hedged_generate_text_stream."""
+    return _race_async(primary, "stream", (user_prompt, system_prompt, response_format))
@@ -0,0 +1,265 @@
+"""
+Single-pass repair parser for malformed JSON from LLMs.
+
+Valid JSON is parsed with json.loads. Anything else goes through a linear-time
+state machine that builds the value directly while tolerating the usual LLM
+mistakes: prose or code fences around the value, trailing or missing commas,
+Python literals (True/False/None), single-quoted strings, unquoted keys,
+unescaped quotes or raw line breaks inside strings, and output cut off
+mid-value, whose open strings and containers are closed where they stop.
+"""
+import json
+import re
+from typing import Any, Dict, List, Optional
+
+# Parser states for the innermost open container
+_KEY = "key"            # expecting an object key or "}"
+_COLON = "colon"        # after an object key
+_VALUE = "value"        # expecting a value (object member or array item) or "]"
+_NEXT = "next"          # after a value: expecting "," or the closing bracket
+
+_WHITESPACE = " \t\r\n"
+_NUMBER_CHARS = frozenset("0123456789+-.eE")
+_LITERALS = {
+    "true": True, "True": True,
+    "false": False, "False": False,
+    "null": None, "None": None, "undefined": None,
+}
+_ESCAPES = {'"': '"', "'": "'", "\\": "\\", "/": "/", "b": "\b", "f": "\f", "n": "\n", "r": "\r", "t": "\t"}
+
+# Runs of ordinary string characters, so strings are copied in slices rather than char by char
+_STRING_RUNS = {'"': re.compile(r'[^"\\]+'), "'": re.compile(r"[^'\\]+")}
+_WORD_RE = re.compile(r"[A-Za-z_$][A-Za-z0-9_$]*")
+_BARE_VALUE_RE = re.compile(r"[^,}\]\n]*")
+_BARE_KEY_RE = re.compile(r"[^:,{}\[\]\"'\n]*")
+
+
+class JSONRepairError(ValueError):
+    """Raised when no JSON value can be recovered from the text."""
+
+
+class _Frame:
+    """An open object or array and what the parser expects next inside it."""
+
+    __slots__ = ("container", "state", "key")
+
+    def __init__(self, container):
+        self.container = container
+        self.state = _KEY if isinstance(container, dict) else _VALUE
+        self.key: Optional[str] = None
+
+
+def repair_json(text: str, start: str = "{[") -> Any:
+    """
+    Parse JSON from LLM output, repairing it if needed.
+
+    Args:
+        text: Raw LLM output
+        start: Characters that may open the value; repair begins at the first
+            of them, so brackets in a preamble are skipped when only "{" is allowed
+
+    Returns:
+        The parsed (possibly repaired) value, usually a dict or list
+
+    Raises:
+        JSONRepairError: If the text contains no object or array
+    """
+    if not isinstance(text, str):
+        raise JSONRepairError(f"Expected text, got {type(text).__name__}")
+    try:
+        return json.loads(text, strict=False)
+    except ValueError:
+        pass
+    return _RepairParser(text, start).parse()
+
+
+class _RepairParser:
+    def __init__(self, text: str, start_chars: str = "{["):
+        self.text = text
+        self.start_chars = start_chars
+        self.pos = 0
+        self.length = len(text)
+
+    def parse(self) -> Any:
+        text = self.text
+        start = min((i for i in map(text.find, self.start_chars) if i != -1), default=-1)
+        if start == -1:
+            kind = "object" if self.start_chars == "{" else "object or array"
+            raise JSONRepairError(f"No JSON {kind} found")
+        self.pos = start
+
+        root = self._open(text[start])
+        self.pos += 1
+        stack: List[_Frame] = [_Frame(root)]
+
+        while stack and self.pos < self.length:
+            char = text[self.pos]
+            if char in _WHITESPACE:
+                self.pos += 1
+                continue
+            frame = stack[-1]
+            state = frame.state
+
+            if state == _NEXT:
+                if char == ",":
+                    self.pos += 1
+                    frame.state = _KEY if isinstance(frame.container, dict) else _VALUE
+                elif char in "}]":
+                    self.pos += 1
+                    stack.pop()
+                else:
+                    # Missing comma: carry on with the next key or item
+                    frame.state = _KEY if isinstance(frame.container, dict) else _VALUE
+            elif state == _KEY:
+                if char in "}]":
+                    self.pos += 1
+                    stack.pop()
+                elif char == ",":
+                    self.pos += 1  # Trailing or doubled comma
+                elif char in "\"'":
+                    frame.key = self._string(char)
+                    frame.state = _COLON
+                else:
+                    match = _BARE_KEY_RE.match(text, self.pos)
+                    key = match.group().strip()
+                    if key:
+                        frame.key = key
+                        frame.state = _COLON
+                        self.pos = match.end()
+                    else:
+                        self.pos += 1  # Stray character
+            elif state == _COLON:
+                if char == ":":
+                    self.pos += 1
+                frame.state = _VALUE
+            else:  # _VALUE
+                if char in "}]" or char == ",":
+                    if isinstance(frame.container, dict):
+                        frame.key = None  # A key without a value is dropped
+                        frame.state = _KEY if char == "," else _NEXT
+                    elif char == ",":
+                        self.pos += 1  # Empty item
+                        continue
+                    else:
+                        frame.state = _NEXT
+                    continue
+                if char in "{[":
+                    child = self._open(char)
+                    self.pos += 1
+                    self._attach(frame, child)
+                    stack.append(_Frame(child))
+                else:
+                    self._attach(frame, self._scalar(char))
+
+        return root
+
+    @staticmethod
+    def _open(char: str):
+        return {} if char == "{" else []
+
+    @staticmethod
+    def _attach(frame: _Frame, value: Any) -> None:
+        if isinstance(frame.container, dict):
+            frame.container[frame.key] = value
+            frame.key = None
+        else:
+            frame.container.append(value)
+        frame.state = _NEXT
+
+    def _scalar(self, char: str) -> Any:
+        text = self.text
+        if char in "\"'":
+            return self._string(char)
+        if char == "-" or char.isdigit():
+            start = self.pos
+            while self.pos < self.length and text[self.pos] in _NUMBER_CHARS:
+                self.pos += 1
+            return self._number(text[start:self.pos])
+        match = _WORD_RE.match(text, self.pos)
+        if match and match.group() in _LITERALS:
+            self.pos = match.end()
+            return _LITERALS[match.group()]
+        # Unquoted text runs to the next delimiter and is kept as a string
+        match = _BARE_VALUE_RE.match(text, self.pos)
+        self.pos = max(match.end(), self.pos + 1)
+        return match.group().strip() or None
+
+    @staticmethod
+    def _number(token: str) -> Any:
+        token = token.rstrip("+-.eE") or "0"  # A number cut off mid-exponent or after the point
+        try:
+            return int(token)
+        except ValueError:
+            pass
+        try:
+            return float(token)
+        except ValueError:
+            return token
+
+    def _closes_string(self, index: int) -> bool:
+        """Whether the quote at index ends the string: only if a delimiter (or the end) follows it."""
+        text = self.text
+        index += 1
+        while index < self.length and text[index] in " \t\r":
+            index += 1
+        return index >= self.length or text[index] in ",:}]\n"
+
+    def _string(self, quote: str) -> str:
+        """Read a string starting at the opening quote; an unterminated string runs to the end."""
+        text = self.text
+        runs = _STRING_RUNS[quote]
+        parts: List[str] = []
+        self.pos += 1
+        while self.pos < self.length:
+            match = runs.match(text, self.pos)
+            if match:
+                parts.append(match.group())
+                self.pos = match.end()
+                if self.pos >= self.length:
+                    break
+            char = text[self.pos]
+            if char == quote:
+                if self._closes_string(self.pos):
+                    self.pos += 1
+                    return "".join(parts)
+                parts.append(char)  # An unescaped quote inside the value
+                self.pos += 1
+                continue
+            # Backslash escape
+            escape = text[self.pos + 1:self.pos + 2]
+            if escape == "u":
+                try:
+                    code = int(text[self.pos + 2:self.pos + 6], 16)
+                except ValueError:
+                    code = None
+                if code is not None:
+                    self.pos += 6
+                    if 0xD800 <= code < 0xDC00 and text[self.pos:self.pos + 2] == "\\u":
+                        try:
+                            low = int(text[self.pos + 2:self.pos + 6], 16)
+                        except ValueError:
+                            low = 0
+                        if 0xDC00 <= low < 0xE000:
+                            code = 0x10000 + ((code - 0xD800) << 10) + (low - 0xDC00)
+                            self.pos += 6
+                    parts.append(chr(code))
+                    continue
+            parts.append(_ESCAPES.get(escape, escape))
+            self.pos += 2
+        return "".join(parts)
+
+
+def repair_json_object(text: str) -> Dict[str, Any]:
+    """
+    Repair LLM output that should hold a JSON object.
+
+    Repair starts at the first "{", so a preamble such as "Here is [the] result:"
+    is skipped rather than parsed as an array.
+
+    Raises:
+        JSONRepairError: If no object can be recovered
+    """
+    value = repair_json(text, start="{")
+    if not isinstance(value, dict):
+        raise JSONRepairError(f"Expected a JSON object, got {type(value).__name__}")
+    return value
@@ -0,0 +1,214 @@
+"""
+Incremental JSON parser for streamed LLM output.
+
+The parser validates JSON syntax one character at a time as chunks arrive, so
+a caller can abort a generation as soon as it can no longer be valid JSON and
+stop reading as soon as the top-level value closes.
+"""
+
+# Parser states
+_VALUE = "value"                    # expecting any value
+_OBJECT_KEY_OR_END = "key_or_end"   # just after "{"
+_OBJECT_KEY = "key"                 # after "," in an object
+_COLON = "colon"                    # after an object key
+_OBJECT_COMMA_OR_END = "obj_next"   # after an object member value
+_ARRAY_VALUE_OR_END = "item_or_end" # just after "["
+_ARRAY_COMMA_OR_END = "arr_next"    # after an array item
+_STRING = "string"
+_STRING_ESCAPE = "escape"
+_STRING_UNICODE = "unicode"
+_NUMBER = "number"
+_LITERAL = "literal"
+
+_WHITESPACE = " \t\r\n"
+_NUMBER_CHARS = "0123456789+-.eE"
+_LITERALS = {"t": "true", "f": "false", "n": "null"}
+
+
+class InvalidJSONStreamError(ValueError):
+    """Raised when streamed output can no longer become valid JSON."""
+
+
+class JSONStreamParser:
+    """
+    Push-style JSON syntax checker.
+
+    Text before the first "{" or "[" (code fences, a short preamble) is
+    skipped, up to max_prefix characters; with start="{" a "[" in the
+    preamble is skipped too. Raw control characters inside strings are
+    tolerated, matching json.loads(strict=False).
+    """
+
+    def __init__(self, max_prefix: int = 200, start: str = "{["):
+        self.max_prefix = max_prefix
+        self.start = start
+        self.complete = False
+        self._buffer = []
+        self._started = False
+        self._prefix_length = 0
+        self._stack = []
+        self._state = _VALUE
+        self._string_is_key = False
+        self._unicode_left = 0
+        self._literal = ""
+        self._literal_pos = 0
+        self._number = ""
+
+    @property
+    def text(self) -> str:
+        """The JSON text consumed so far (the full value once complete)."""
+        return "".join(self._buffer)
+
+    def feed(self, chunk: str) -> bool:
+        """
+        Consume a chunk of streamed output.
+
+        Args:
+            chunk: Next piece of the response
+
+        Returns:
+            True once the top-level value has closed; the rest of the chunk is ignored
+
+        Raises:
+            InvalidJSONStreamError: If the output can no longer be valid JSON
+        """
+        if self.complete:
+            return True
+        for char in chunk:
+            if not self._started:
+                if char in self.start:
+                    self._started = True
+                else:
+                    self._prefix_length += 1
+                    if self._prefix_length > self.max_prefix:
+                        raise InvalidJSONStreamError("No JSON value started within the allowed preamble")
+                    continue
+            self._buffer.append(char)
+            self._consume(char)
+            if self.complete:
+                return True
+        return False
+
+    def _fail(self, char: str):
+        raise InvalidJSONStreamError(
+            f"Unexpected {char!r} at position {len(self._buffer) - 1} while expecting {self._state}"
+        )
+
+    def _end_value(self) -> None:
+        """Move to the state that follows a finished value."""
+        if not self._stack:
+            self.complete = True
+        elif self._stack[-1] == "{":
+            self._state = _OBJECT_COMMA_OR_END
+        else:
+            self._state = _ARRAY_COMMA_OR_END
+
+    def _consume(self, char: str) -> None:
+        state = self._state
+
+        if state == _STRING:
+            if char == "\\":
+                self._state = _STRING_ESCAPE
+            elif char == '"':
+                if self._string_is_key:
+                    self._state = _COLON
+                else:
+                    self._end_value()
+            return
+        if state == _STRING_ESCAPE:
+            if char == "u":
+                self._unicode_left = 4
+                self._state = _STRING_UNICODE
+            elif char in '"\\/bfnrt':
+                self._state = _STRING
+            else:
+                self._fail(char)
+            return
+        if state == _STRING_UNICODE:
+            if char not in "0123456789abcdefABCDEF":
+                self._fail(char)
+            self._unicode_left -= 1
+            if self._unicode_left == 0:
+                self._state = _STRING
+            return
+        if state == _LITERAL:
+            if char != self._literal[self._literal_pos]:
+                self._fail(char)
+            self._literal_pos += 1
+            if self._literal_pos == len(self._literal):
+                self._end_value()
+            return
+        if state == _NUMBER:
+            if char in _NUMBER_CHARS:
+                self._number += char
+                return
+            self._check_number()
+            self._end_value()
+            if self.complete:
+                return
+            state = self._state  # The terminating character belongs to the enclosing container
+
+        if char in _WHITESPACE:
+            return
+
+        if state in (_VALUE, _ARRAY_VALUE_OR_END):
+            if state == _ARRAY_VALUE_OR_END and char == "]":
+                self._close()
+            else:
+                self._start_value(char)
+        elif state in (_OBJECT_KEY_OR_END, _OBJECT_KEY):
+            if char == '"':
+                self._string_is_key = True
+                self._state = _STRING
+            elif char == "}" and state == _OBJECT_KEY_OR_END:
+                self._close()
+            else:
+                self._fail(char)
+        elif state == _COLON:
+            if char != ":":
+                self._fail(char)
+            self._state = _VALUE
+        elif state == _OBJECT_COMMA_OR_END:
+            if char == ",":
+                self._state = _OBJECT_KEY
+            elif char == "}":
+                self._close()
+            else:
+                self._fail(char)
+        elif state == _ARRAY_COMMA_OR_END:
+            if char == ",":
+                self._state = _VALUE
+            elif char == "]":
+                self._close()
+            else:
+                self._fail(char)
+
+    def _start_value(self, char: str) -> None:
+        if char == "{":
+            self._stack.append("{")
+            self._state = _OBJECT_KEY_OR_END
+        elif char == "[":
+            self._stack.append("[")
+            self._state = _ARRAY_VALUE_OR_END
+        elif char == '"':
+            self._string_is_key = False
+            self._state = _STRING
+        elif char in _LITERALS:
+            self._literal = _LITERALS[char]
+            self._literal_pos = 1
+            self._state = _LITERAL
+        elif char == "-" or char.isdigit():
+            self._number = char
+            self._state = _NUMBER
+        else:
+            self._fail(char)
+
+    def _check_number(self) -> None:
+        try:
+            float(self._number)
+        except ValueError:
+            raise InvalidJSONStreamError(f"Invalid number {self._number!r}")
+
+    def _close(self) -> None:
+        self._stack.pop()
+        self._end_value()
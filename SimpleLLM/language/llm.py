@@ -1,7 +1,20 @@
 import SimpleLLM.language.llm_providers.openai_llm as openai_llm
 import SimpleLLM.language.llm_providers.openrouter_llm as openrouter_llm
+from SimpleLLM.language.hedging import (
+    hedged_generate_text,
+    hedged_generate_text_async,
+    hedged_generate_text_stream,
+    hedged_generate_text_stream_async,
+)
+from SimpleLLM.language.llm_cache import make_cache_key, replay_chunks
+from SimpleLLM.language.llm_result import AsyncTrackedStream, LLMResult, TrackedStream, track_result
+from SimpleLLM.language.rate_limiter import estimate_tokens, rate_limiter
+from SimpleLLM.language.singleflight import SingleFlight
 from enum import Enum
 
+# Identical generate calls in flight at the same time, from any LLM instance, share one request
+llm_flight = SingleFlight()
+
 
 class LLMProvider(Enum):
     OPENAI = 1
@@ -9,60 +22,304 @@ class LLMProvider(Enum):
 
 
 class LLM:
-    def __init__(self, provider=LLMProvider.OPENAI, model_name="gpt-3.5-turbo", temperature=0.7, top_p=1.0, max_tokens=2000):
+    def __init__(self, provider=LLMProvider.OPENAI, model_name="gpt-3.5-turbo", temperature=0.7, top_p=1.0, max_tokens=2000,
+                 cache=None, hedge=None, coalesce=True):
         self.provider = provider
         self.model_name = model_name
         self.temperature = temperature
         self.top_p = top_p
         self.max_tokens = max_tokens
+        self.cache = cache  # Optional LLMCache shared by generate_text and generate_text_stream
+        self.hedge = hedge  # Optional HedgePolicy: race a secondary model when this one is slow
+        self.coalesce = coalesce  # Concurrent identical calls and streams share one provider request
 
     @staticmethod
-    def create(provider=LLMProvider.OPENAI, model_name="gpt-3.5-turbo", temperature=0.7, top_p=1.0, max_tokens=2000):
+    def create(provider=LLMProvider.OPENAI, model_name="gpt-3.5-turbo", temperature=0.7, top_p=1.0, max_tokens=2000,
+               cache=None, hedge=None, coalesce=True):
         """Factory method to create an LLM instance."""
-        return LLM(provider, model_name, temperature, top_p, max_tokens)
+        return LLM(provider, model_name, temperature, top_p, max_tokens, cache, hedge, coalesce)
+
+    def cache_key(self, user_prompt, system_prompt="", response_format=None):
+        """Return the response cache key for a prompt with this instance's settings."""
+        return make_cache_key(self.provider, self.model_name, self.temperature, self.top_p, self.max_tokens,
+                              system_prompt, user_prompt, response_format)
+
+    def invalidate_cached(self, user_prompt, system_prompt="", response_format=None):
+        """Forget a cached response, e.g. one that could not be parsed."""
+        if self.cache is not None:
+            self.cache.invalidate(self.cache_key(user_prompt, system_prompt, response_format))
+
+    def _new_result(self, user_prompt, system_prompt, stream=False):
+        prompt_estimate = estimate_tokens(system_prompt) + estimate_tokens(user_prompt)
+        return LLMResult(getattr(self.provider, "name", str(self.provider)), self.model_name, prompt_estimate, stream)
+
+    def generate(self, user_prompt, system_prompt="", use_cache=True, response_format=None):
+        """
+        Generate text and return it as an LLMResult with token usage, latency, model and retries.
+
+        Repeats are served from the cache if one is set. With coalesce set, a call
+        identical to one already in flight waits for it and shares its text instead
+        of sending another request; calls with use_cache=False are never shared.
+
+        response_format is passed to the provider as-is (e.g. a JSON schema for
+        structured output); providers raise StructuredOutputUnsupportedError if the
+        model rejects it.
+        """
+        with track_result(self._new_result(user_prompt, system_prompt)) as result:
+            key = self.cache_key(user_prompt, system_prompt, response_format)
+            caching = use_cache and self.cache is not None
+            if caching:
+                cached = self.cache.get(key)
+                if cached is not None:
+                    result.text = cached
+                    result.cache_hit = True
+                    return result
+
+            # A caller bypassing the cache wants a fresh response, so it is never coalesced
+            if self.coalesce and use_cache:
+                result.text, result.coalesced = llm_flight.do(
+                    key, lambda: self._generate_text(user_prompt, system_prompt, response_format)
+                )
+            else:
+                result.text = self._generate_text(user_prompt, system_prompt, response_format)
+            if caching and not result.coalesced:
+                self.cache.set(key, result.text)
+            return result
+
+    def generate_text(self, user_prompt, system_prompt="", use_cache=True, response_format=None):
+        """Generate text using the specified LLM provider; see generate for the full result."""
+        return self.generate(user_prompt, system_prompt, use_cache, response_format).text
+
+    def generate_text_stream(self, user_prompt, system_prompt="", use_cache=True, response_format=None):
+        """
+        Generate streaming text; cached responses are replayed as chunks.
+
+        With coalesce set, a stream identical to one already being read follows it,
+        replaying the chunks read so far instead of sending another request.
+
+        Returns a TrackedStream: iterate it for the chunks, and read its result (an LLMResult,
+        including time to first token) once the stream has ended or been closed.
+        """
+        result = self._new_result(user_prompt, system_prompt, stream=True)
+        key = self.cache_key(user_prompt, system_prompt, response_format)
+        caching = use_cache and self.cache is not None
+        if caching:
+            cached = self.cache.get(key)
+            if cached is not None:
+                result.cache_hit = True
+                return TrackedStream(replay_chunks(cached), result)
+
+        def open_stream():
+            if caching:
+                return self._stream_and_cache(key, user_prompt, system_prompt, response_format)
+            return self._generate_text_stream(user_prompt, system_prompt, response_format)
+
+        if not (self.coalesce and use_cache):
+            return TrackedStream(open_stream(), result)
+        # Followers replay the leader's chunks; only the leader's stream reaches the provider and the cache
+        return TrackedStream(
+            llm_flight.stream(key, open_stream, lambda: setattr(result, "coalesced", True)), result
+        )
+
+    def _stream_and_cache(self, key, user_prompt, system_prompt, response_format=None):
+        """Pass chunks through and cache the full text once the stream completes."""
+        chunks = []
+        stream = self._generate_text_stream(user_prompt, system_prompt, response_format)
+        try:
+            for chunk in stream:
+                chunks.append(chunk)
+                yield chunk
+        finally:
+            # Propagates an early stop by the caller to the provider's connection
+            if hasattr(stream, "close"):
+                stream.close()
+        self.cache.set(key, "".join(chunks))
+
+    async def generate_async(self, user_prompt, system_prompt="", use_cache=True, response_format=None):
+        """
+        Awaitable generate over the shared async HTTP client.
+
+        Uses the same cache, rate limits, retries, circuit breakers and hedging as the
+        blocking calls. Cancelling the awaiting task closes the connection and releases
+        the rate-limit reservation.
+        """
+        with track_result(self._new_result(user_prompt, system_prompt)) as result:
+            key = self.cache_key(user_prompt, system_prompt, response_format)
+            caching = use_cache and self.cache is not None
+            if caching:
+                cached = self.cache.get(key)
+                if cached is not None:
+                    result.text = cached
+                    result.cache_hit = True
+                    return result
+
+            # A caller bypassing the cache wants a fresh response, so it is never coalesced
+            if self.coalesce and use_cache:
+                result.text, result.coalesced = await llm_flight.do_async(
+                    key, lambda: self._generate_text_async(user_prompt, system_prompt, response_format)
+                )
+            else:
+                result.text = await self._generate_text_async(user_prompt, system_prompt, response_format)
+            if caching and not result.coalesced:
+                self.cache.set(key, result.text)
+            return result
+
+    async def generate_text_async(self, user_prompt, system_prompt="", use_cache=True, response_format=None):
+        """Awaitable generate_text; see generate_async."""
+        return (await self.generate_async(user_prompt, system_prompt, use_cache, response_format)).text
+
+    def generate_text_stream_async(self, user_prompt, system_prompt="", use_cache=True, response_format=None):
+        """
+        Async generate_text_stream: returns an AsyncTrackedStream to consume with async for.
+
+        Closing it with aclose(), or cancelling the consuming task, closes the connection.
+        """
+        result = self._new_result(user_prompt, system_prompt, stream=True)
+        key = self.cache_key(user_prompt, system_prompt, response_format)
+        caching = use_cache and self.cache is not None
+        if caching:
+            cached = self.cache.get(key)
+            if cached is not None:
+                result.cache_hit = True
+                return AsyncTrackedStream(_replay_chunks_async(cached), result)
+
+        def open_stream():
+            if caching:
+                return self._stream_and_cache_async(key, user_prompt, system_prompt, response_format)
+            return self._generate_text_stream_async(user_prompt, system_prompt, response_format)
+
+        if not (self.coalesce and use_cache):
+            return AsyncTrackedStream(open_stream(), result)
+        return AsyncTrackedStream(
+            llm_flight.stream_async(key, open_stream, lambda: setattr(result, "coalesced", True)), result
+        )
+
+    async def _stream_and_cache_async(self, key, user_prompt, system_prompt, response_format=None):
+        chunks = []
+        stream = self._generate_text_stream_async(user_prompt, system_prompt, response_format)
+        try:
+            async for chunk in stream:
+                chunks.append(chunk)
+                yield chunk
+        finally:
+            if hasattr(stream, "aclose"):
+                await stream.aclose()
+        self.cache.set(key, "".join(chunks))
 
-    def generate_text(self, user_prompt, system_prompt=""):
-        """Generate text using the specified LLM provider."""
+    def _provider_module(self):
         if self.provider == LLMProvider.OPENAI:
-            return openai_llm.generate_text(
-                user_prompt=user_prompt,
-                system_prompt=system_prompt,
-                model=self.model_name,
-                temperature=self.temperature,
-                top_p=self.top_p,
-                max_tokens=self.max_tokens
-            )
+            return openai_llm
         elif self.provider == LLMProvider.OPENROUTER:
-            return openrouter_llm.generate_text(
-                user_prompt=user_prompt,
-                system_prompt=system_prompt,
-                model=self.model_name,
-                temperature=self.temperature,
-                top_p=self.top_p,
-                max_tokens=self.max_tokens
-            )
+            return openrouter_llm
         else:
             raise ValueError(f"Unsupported LLM provider: {self.provider}")
 
-    def generate_text_stream(self, user_prompt, system_prompt=""):
-        """Generate streaming text using the specified LLM provider."""
-        if self.provider == LLMProvider.OPENAI:
-            return openai_llm.generate_text_stream(
+    def _reserve(self, prompt_tokens):
+        """Wait for the shared rate limiter to admit a call of this size."""
+        return rate_limiter.acquire(getattr(self.provider, "name", str(self.provider)), self.model_name,
+                                    prompt_tokens + self.max_tokens)
+
+    def _generate_text(self, user_prompt, system_prompt="", response_format=None):
+        if self.hedge is not None:
+            return hedged_generate_text(self, user_prompt, system_prompt, response_format)
+        provider_module = self._provider_module()
+        prompt_tokens = estimate_tokens(system_prompt) + estimate_tokens(user_prompt)
+        reservation = self._reserve(prompt_tokens)
+        text = ""
+        try:
+            text = provider_module.generate_text(
                 user_prompt=user_prompt,
                 system_prompt=system_prompt,
                 model=self.model_name,
                 temperature=self.temperature,
                 top_p=self.top_p,
-                max_tokens=self.max_tokens
+                max_tokens=self.max_tokens,
+                response_format=response_format
             )
-        elif self.provider == LLMProvider.OPENROUTER:
-            return openrouter_llm.generate_text_stream(
+            return text
+        finally:
+            rate_limiter.settle(reservation, prompt_tokens + estimate_tokens(text))
+
+    def _generate_text_stream(self, user_prompt, system_prompt="", response_format=None):
+        if self.hedge is not None:
+            return hedged_generate_text_stream(self, user_prompt, system_prompt, response_format)
+        return self._provider_stream(user_prompt, system_prompt, response_format)
+
+    def _provider_stream(self, user_prompt, system_prompt="", response_format=None):
+        """Stream from this instance's provider, holding a rate-limiter reservation for the call."""
+        provider_module = self._provider_module()
+        prompt_tokens = estimate_tokens(system_prompt) + estimate_tokens(user_prompt)
+        reservation = self._reserve(prompt_tokens)
+        received = 0
+        stream = provider_module.generate_text_stream(
+            user_prompt=user_prompt,
+            system_prompt=system_prompt,
+            model=self.model_name,
+            temperature=self.temperature,
+            top_p=self.top_p,
+            max_tokens=self.max_tokens,
+            response_format=response_format
+        )
+        try:
+            for chunk in stream:
+                received += len(chunk)
+                yield chunk
+        finally:
+            stream.close()
+            rate_limiter.settle(reservation, prompt_tokens + received // 4)
+
+    async def _generate_text_async(self, user_prompt, system_prompt="", response_format=None):
+        if self.hedge is not None:
+            return await hedged_generate_text_async(self, user_prompt, system_prompt, response_format)
+        provider_module = self._provider_module()
+        prompt_tokens = estimate_tokens(system_prompt) + estimate_tokens(user_prompt)
+        reservation = await rate_limiter.acquire_async(getattr(self.provider, "name", str(self.provider)),
+                                                       self.model_name, prompt_tokens + self.max_tokens)
+        text = ""
+        try:
+            text = await provider_module.generate_text_async(
                 user_prompt=user_prompt,
                 system_prompt=system_prompt,
                 model=self.model_name,
                 temperature=self.temperature,
                 top_p=self.top_p,
-                max_tokens=self.max_tokens
+                max_tokens=self.max_tokens,
+                response_format=response_format
             )
-        else:
-            raise ValueError(f"Unsupported LLM provider: {self.provider}")
+            return text
+        finally:
+            rate_limiter.settle(reservation, prompt_tokens + estimate_tokens(text))
+
+    def _generate_text_stream_async(self, user_prompt, system_prompt="", response_format=None):
+        if self.hedge is not None:
+            return hedged_generate_text_stream_async(self, user_prompt, system_prompt, response_format)
+        return self._provider_stream_async(user_prompt, system_prompt, response_format)
+
+    async def _provider_stream_async(self, user_prompt, system_prompt="", response_format=None):
+        """Async _provider_stream: stream from this instance's provider under a rate-limiter reservation."""
+        provider_module = self._provider_module()
+        prompt_tokens = estimate_tokens(system_prompt) + estimate_tokens(user_prompt)
+        reservation = await rate_limiter.acquire_async(getattr(self.provider, "name", str(self.provider)),
+                                                       self.model_name, prompt_tokens + self.max_tokens)
+        received = 0
+        stream = provider_module.generate_text_stream_async(
+            user_prompt=user_prompt,
+            system_prompt=system_prompt,
+            model=self.model_name,
+            temperature=self.temperature,
+            top_p=self.top_p,
+            max_tokens=self.max_tokens,
+            response_format=response_format
+        )
+        try:
+            async for chunk in stream:
+                received += len(chunk)
+                yield chunk
+        finally:
+            await stream.aclose()
+            rate_limiter.settle(reservation, prompt_tokens + received // 4)
+
+
+async def _replay_chunks_async(text):
+    for chunk in replay_chunks(text):
+        yield chunk
@@ -4,102 +4,218 @@ LLM addons module with helper functions.
 from typing import Type, TypeVar, Dict, Any
 import json
 import logging
+import threading
+from functools import lru_cache
 from pydantic import BaseModel, ValidationError
 
+from SimpleLLM.language.json_repair import JSONRepairError, repair_json_object
+from SimpleLLM.language.json_stream import InvalidJSONStreamError, JSONStreamParser
 from SimpleLLM.language.llm import LLM
+from SimpleLLM.language.llm_providers.errors import StructuredOutputUnsupportedError
+from SimpleLLM.language.llm_providers.resilience import PROVIDER_ERRORS, ProviderHTTPError
 
 T = TypeVar('T', bound=BaseModel)
 
-def extract_json(text: str) -> Dict[str, Any]:
+# (provider, model) pairs that rejected response_format; they use the prompt-only JSON path
+_structured_output_unsupported = set()
+_structured_output_lock = threading.Lock()
+
+def supports_structured_output(llm_instance: LLM) -> bool:
+    """Whether structured output should be tried for this LLM's provider and model."""
+    with _structured_output_lock:
+        return (llm_instance.provider, llm_instance.model_name) not in _structured_output_unsupported
+
+def mark_structured_output_unsupported(llm_instance: LLM) -> None:
+    """Remember that this LLM's model rejects response_format, so later calls skip it."""
+    logging.info(f"Model {llm_instance.model_name} does not support structured output; using prompt-only JSON")
+    with _structured_output_lock:
+        _structured_output_unsupported.add((llm_instance.provider, llm_instance.model_name))
+
+def json_schema_response_format(name: str, schema: Dict[str, Any]) -> Dict[str, Any]:
     """
-    Extract and parse JSON from a text string.
+    Build a JSON-schema response_format for the chat completions API.
     
     Args:
-        text: Text containing JSON data
+        name: Schema name
+        schema: JSON schema the response must match
         
     Returns:
-        Parsed JSON as a dictionary
+        The response_format request parameter
     """
-    if not text or not isinstance(text, str):
-        logging.error(f"Invalid input to extract_json: {type(text)}")
-        return {}
-        
-    # Clean the response to extract only the JSON part
-    clean_response = text.strip()
-    
-    # Handle various formats the LLM might return
-    if "```json" in clean_response:
-        # Extract content between ```json and ```
-        start = clean_response.find("```json") + 7
-        end = clean_response.find("```", start)
-        if end != -1:
-            clean_response = clean_response[start:end].strip()
-    elif "```" in clean_response:
-        # Extract content between ``` and ```
-        start = clean_response.find("```") + 3
-        end = clean_response.find("```", start)
-        if end != -1:
-            clean_response = clean_response[start:end].strip()
-    
-    # Additional JSON extraction - find the first { and last }
-    first_brace = clean_response.find('{')
-    last_brace = clean_response.rfind('}')
+    return {
+        "type": "json_schema",
+        "json_schema": {"name": name, "schema": schema}
+    }
+
+@lru_cache(maxsize=None)
+def schema_system_prompt(model_class: Type[BaseModel]) -> str:
+    """
+    System prompt asking for JSON that matches a model's schema.
     
-    if first_brace != -1 and last_brace != -1 and last_brace > first_brace:
-        clean_response = clean_response[first_brace:last_brace+1].strip()
+    Built once per model class, so every request for the same model sends a
+    byte-identical system prompt that providers can serve from their prompt cache.
+    """
+    return f"""
+    You are a helpful AI that generates structured JSON data.
+    The user will provide a prompt, and you should respond with valid JSON that matches this schema:
     
-    # Fix common JSON formatting issues
-    clean_response = clean_response.replace('\n', ' ').replace('\\n', ' ')
-    clean_response = clean_response.replace('True', 'true').replace('False', 'false')
-    clean_response = clean_response.replace('None', 'null')
-    clean_response = clean_response.replace("'", '"')  # Replace single quotes with double quotes
+    {model_class.model_json_schema()}
     
-    # Remove trailing commas in arrays and objects
-    clean_response = clean_response.replace(",]", "]").replace(",}", "}")
+    Respond ONLY with the JSON. Do not include any other text, explanations, or markdown formatting.
+    """
+
+@lru_cache(maxsize=None)
+def schema_response_format(model_class: Type[BaseModel]) -> Dict[str, Any]:
+    """Structured-output response_format for a model class, built once per class."""
+    return json_schema_response_format(model_class.__name__, model_class.model_json_schema())
+
+def extract_json(text: str) -> Dict[str, Any]:
+    """
+    Extract and parse a JSON object from a text string, repairing it if needed.
     
+    Args:
+        text: Text containing JSON data
+        
+    Returns:
+        Parsed JSON as a dictionary, or an empty dict if no object can be recovered
+    """
     try:
-        # Parse the JSON
-        return json.loads(clean_response)
-    except json.JSONDecodeError as e:
-        # More robust parsing approach for malformed JSON
+        return repair_json_object(text)
+    except JSONRepairError as e:
+        logging.error(f"Failed to parse JSON: {e}")
+        return {}
+
+def _generate_streamed_model(model_class: Type[T], llm_instance: LLM, prompt: str, system_prompt: str,
+                             structured_output: bool, max_attempts: int) -> T:
+    """
+    Stream the response through an incremental JSON parser.
+    
+    Reading stops as soon as the top-level JSON value closes, or at the first
+    token that makes the output invalid JSON. In that case the prefix received
+    so far is repaired locally, and only a prefix that cannot be repaired into
+    a valid model is retried.
+    """
+    last_error = None
+    attempt = 0
+    while attempt < max_attempts:
+        response_format = None
+        if structured_output and supports_structured_output(llm_instance):
+            response_format = schema_response_format(model_class)
+        parser = JSONStreamParser(start="{")
+        raw_chunks = []
+        stream_error = None
+        chunks = None
         try:
-            import re
-            # Find all key-value pairs and rebuild the JSON
-            pattern = r'"([^"]+)"\s*:\s*("[^"]*"|[^,}\s]+)'
-            matches = re.findall(pattern, clean_response)
-            fixed_json = '{'
-            for key, value in matches:
-                fixed_json += f'"{key}": {value}, '
-            fixed_json = fixed_json.rstrip(', ') + '}'
+            try:
+                chunks = llm_instance.generate_text_stream(
+                    user_prompt=prompt,
+                    system_prompt=system_prompt,
+                    response_format=response_format
+                )
+                for chunk in chunks:
+                    raw_chunks.append(chunk)
+                    try:
+                        if parser.feed(chunk):
+                            break
+                    except InvalidJSONStreamError as e:
+                        # Stop paying for a doomed generation; the prefix is repaired below
+                        stream_error = e
+                        break
+            finally:
+                if hasattr(chunks, "close"):
+                    chunks.close()
             
-            return json.loads(fixed_json)
-        except Exception:
-            # If all parsing fails, return empty dict instead of raising an error
-            logging.error(f"Failed to parse JSON: {e}")
-            return {}
+            if parser.complete:
+                text = parser.text
+                data = json.loads(text, strict=False)
+            else:
+                logging.info(f"Repairing streamed prefix ({stream_error or 'stream ended before the JSON value closed'})")
+                data = repair_json_object("".join(raw_chunks))
+                text = json.dumps(data, ensure_ascii=False)
+            result = model_class.model_validate(data)
+            if llm_instance.cache is not None:
+                # Cache the JSON we actually used: cut at the closing brace, or the repaired value
+                llm_instance.cache.set(llm_instance.cache_key(prompt, system_prompt, response_format), text)
+            return result
+        except StructuredOutputUnsupportedError:
+            # Retry without response_format; this does not count as an attempt
+            mark_structured_output_unsupported(llm_instance)
+            continue
+        except (JSONRepairError, json.JSONDecodeError, ValidationError) as e:
+            logging.warning(f"Streamed attempt {attempt+1} failed after {sum(map(len, raw_chunks))} characters: {e}")
+            llm_instance.invalidate_cached(prompt, system_prompt, response_format)
+            last_error = e
+        except ProviderHTTPError as e:
+            if e.retryable or response_format is None:
+                raise
+            # An unrecognised client error may still be about response_format; try the plain prompt
+            logging.warning(f"Structured output request failed: {e}")
+            structured_output = False
+            continue
+        except PROVIDER_ERRORS:
+            raise
+        except Exception as e:
+            logging.warning(f"Unexpected error in streamed attempt {attempt+1}: {str(e)}")
+            last_error = e
+        attempt += 1
+    raise ValueError(f"Failed to generate valid model after {max_attempts} attempts: {str(last_error)}")
 
-def generate_basic_pydantic_json_model(model_class: Type[T], llm_instance: LLM, prompt: str) -> T:
+def generate_basic_pydantic_json_model(model_class: Type[T], llm_instance: LLM, prompt: str,
+                                       structured_output: bool = True, stream: bool = False) -> T:
     """
     Generate a Pydantic model using an LLM.
     
+    When structured_output is set, the model's JSON schema is sent as the
+    provider's response_format and the reply is validated directly. Models that
+    reject response_format are remembered and, like replies that still fail
+    validation, fall back to the prompt-only path with its repair and retries.
+    
+    With stream set, the response is streamed into an incremental JSON parser
+    instead: reading stops once the top-level object closes, and malformed
+    output is repaired locally rather than regenerated.
+    
     Args:
         model_class: The Pydantic model class to generate
         llm_instance: LLM instance to use for generation
         prompt: The prompt to send to the LLM
+        structured_output: Whether to try the provider's structured-output mode
+        stream: Whether to use streaming mode
         
     Returns:
         An instance of the Pydantic model
     """
-    system_prompt = f"""
-    You are a helpful AI that generates structured JSON data.
-    The user will provide a prompt, and you should respond with valid JSON that matches this schema:
+    system_prompt = schema_system_prompt(model_class)
     
-    {model_class.model_json_schema()}
+    max_attempts = 3
+    if stream:
+        return _generate_streamed_model(
+            model_class, llm_instance, prompt, system_prompt, structured_output, max_attempts
+        )
     
-    Respond ONLY with the JSON. Do not include any other text, explanations, or markdown formatting.
-    """
+    if structured_output and supports_structured_output(llm_instance):
+        response_format = schema_response_format(model_class)
+        try:
+            llm_response = llm_instance.generate_text(
+                user_prompt=prompt,
+                system_prompt=system_prompt,
+                response_format=response_format
+            )
+            return model_class.model_validate(repair_json_object(llm_response))
+        except StructuredOutputUnsupportedError:
+            mark_structured_output_unsupported(llm_instance)
+        except (JSONRepairError, ValidationError) as e:
+            logging.warning(f"Structured output did not match {model_class.__name__}: {e}")
+            llm_instance.invalidate_cached(prompt, system_prompt, response_format)
+        except ProviderHTTPError as e:
+            if e.retryable:
+                raise
+            # An unrecognised client error may still be about response_format; try the plain prompt
+            logging.warning(f"Structured output request failed: {e}")
+        except PROVIDER_ERRORS:
+            raise
+        except Exception as e:
+            logging.warning(f"Structured output request failed: {e}")
     
-    max_attempts = 3
     for attempt in range(max_attempts):
         try:
             # Generate JSON response from LLM
@@ -108,62 +224,21 @@ def generate_basic_pydantic_json_model(model_class: Type[T], llm_instance: LLM,
                 system_prompt=system_prompt
             )
             
-            # Clean the response to extract only the JSON part
-            clean_response = llm_response.strip()
-            
-            # Handle various formats the LLM might return
-            if "```json" in clean_response:
-                # Extract content between ```json and ```
-                start = clean_response.find("```json") + 7
-                end = clean_response.find("```", start)
-                if end != -1:
-                    clean_response = clean_response[start:end].strip()
-            elif "```" in clean_response:
-                # Extract content between ``` and ```
-                start = clean_response.find("```") + 3
-                end = clean_response.find("```", start)
-                if end != -1:
-                    clean_response = clean_response[start:end].strip()
-            
-            # Additional JSON extraction - find the first { and last }
-            first_brace = clean_response.find('{')
-            last_brace = clean_response.rfind('}')
-            if first_brace != -1 and last_brace != -1 and last_brace > first_brace:
-                clean_response = clean_response[first_brace:last_brace+1].strip()
-            
-            logging.debug(f"Cleaned JSON response: {clean_response[:100]}...")
-            
-            # Fix common JSON formatting issues
-            clean_response = clean_response.replace('\n', ' ').replace('\\n', ' ')
-            clean_response = clean_response.replace('True', 'true').replace('False', 'false')
-            clean_response = clean_response.replace('None', 'null')
-            
-            # Parse the JSON
-            parsed_data = json.loads(clean_response)
+            # Fences, Python literals, stray commas and truncation are repaired locally
+            parsed_data = repair_json_object(llm_response)
             
             # Create and return the Pydantic model
             return model_class(**parsed_data)
             
-        except (json.JSONDecodeError, ValidationError) as e:
+        except (JSONRepairError, ValidationError) as e:
             logging.warning(f"Attempt {attempt+1} failed: {str(e)}")
-            # If it's the last attempt, try one more robust parse method
+            # Don't let a cached copy of this unusable response answer the retry
+            llm_instance.invalidate_cached(prompt, system_prompt)
             if attempt == max_attempts - 1:
-                try:
-                    # Try a more lenient JSON parsing approach
-                    import re
-                    # Find all key-value pairs and rebuild the JSON
-                    pattern = r'"([^"]+)"\s*:\s*("[^"]*"|[^,}\s]+)'
-                    matches = re.findall(pattern, clean_response)
-                    fixed_json = '{'
-                    for key, value in matches:
-                        fixed_json += f'"{key}": {value}, '
-                    fixed_json = fixed_json.rstrip(', ') + '}'
-                    
-                    parsed_data = json.loads(fixed_json)
-                    return model_class(**parsed_data)
-                except Exception as robust_error:
-                    logging.error(f"Robust parsing also failed: {robust_error}")
-                    raise ValueError(f"Failed to generate valid model after {max_attempts} attempts: {str(e)}")
+                raise ValueError(f"Failed to generate valid model after {max_attempts} attempts: {str(e)}")
+        except PROVIDER_ERRORS:
+            # The provider layer already retried with backoff; retrying here would multiply the load
+            raise
         except Exception as e:
             logging.warning(f"Unexpected error in attempt {attempt+1}: {str(e)}")
             if attempt == max_attempts - 1:
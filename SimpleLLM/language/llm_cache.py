@@ -0,0 +1,211 @@
+"""
+Content-addressed cache for LLM responses.
+"""
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Iterator, Optional
+
+
+def make_cache_key(provider, model: str, temperature: float, top_p: float, max_tokens: int,
+                   system_prompt: str, user_prompt: str, response_format: Optional[dict] = None) -> str:
+    """
+    Hash everything that determines an LLM response into a cache key.
+
+    Args:
+        provider: LLM provider (enum member or name)
+        model: Model name
+        temperature: Sampling temperature
+        top_p: Top-p parameter
+        max_tokens: Maximum number of tokens to generate
+        system_prompt: The system prompt
+        user_prompt: The user prompt
+        response_format: Structured-output format, if any
+
+    Returns:
+        Hex digest of the request parameters
+    """
+    provider_name = getattr(provider, "name", str(provider))
+    parts = [provider_name, model, temperature, top_p, max_tokens, system_prompt, user_prompt]
+    if response_format:
+        parts.append(response_format)
+    payload = json.dumps(parts, ensure_ascii=False, sort_keys=True)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def replay_chunks(text: str, chunk_size: int = 64) -> Iterator[str]:
+    """
+    Yield cached text in chunks, the way a streaming response would arrive.
+
+    Args:
+        text: Cached response text
+        chunk_size: Number of characters per chunk
+
+    Yields:
+        Text chunks
+    """
+    for start in range(0, len(text), chunk_size):
+        yield text[start:start + chunk_size]
+
+
+class LLMCache:
+    """
+    Two-tier LLM response cache.
+
+    An in-memory LRU tier answers repeated prompts within a process; an
+    optional disk tier (one JSON file per key) survives restarts. Entries
+    older than ttl seconds are ignored, the memory tier holds at most
+    max_entries responses and the disk tier at most max_disk_bytes. Disk
+    usage is tracked in an in-memory LRU index built from the directory on
+    first use, so trimming does not rescan the directory on every write.
+    """
+
+    def __init__(self, cache_dir: Optional[str] = None, ttl: Optional[float] = None,
+                 max_entries: int = 256, max_disk_bytes: Optional[int] = None):
+        self.cache_dir = cache_dir
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.max_disk_bytes = max_disk_bytes
+        self.hits = 0
+        self.misses = 0
+        self._memory = OrderedDict()
+        self._disk_index: Optional["OrderedDict[str, int]"] = None
+        self._disk_bytes = 0
+        self._lock = threading.Lock()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.json")
+
+    def _expired(self, stored_at: float) -> bool:
+        return self.ttl is not None and time.time() - stored_at > self.ttl
+
+    def get(self, key: str) -> Optional[str]:
+        """
+        Look up a cached response.
+
+        Args:
+            key: Key from make_cache_key
+
+        Returns:
+            The cached text, or None on a miss
+        """
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None and not self._expired(entry[0]):
+                self._memory.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+
+        entry = self._read_disk(key)
+        with self._lock:
+            if entry is None:
+                self._memory.pop(key, None)
+                self.misses += 1
+                return None
+            self._remember(key, entry[0], entry[1])
+            self.hits += 1
+            return entry[1]
+
+    def set(self, key: str, text: str) -> None:
+        """
+        Store a response in both tiers.
+
+        Args:
+            key: Key from make_cache_key
+            text: Response text
+        """
+        stored_at = time.time()
+        with self._lock:
+            self._remember(key, stored_at, text)
+        if not self.cache_dir:
+            return
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            path = self._path(key)
+            tmp_path = f"{path}.{threading.get_ident()}.tmp"
+            data = json.dumps({"stored_at": stored_at, "text": text}, ensure_ascii=False).encode("utf-8")
+            with open(tmp_path, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logging.warning(f"Could not write LLM cache entry: {e}")
+            return
+        if self.max_disk_bytes:
+            with self._lock:
+                index = self._load_disk_index()
+                self._disk_bytes += len(data) - index.pop(key, 0)
+                index[key] = len(data)
+                self._trim_disk()
+
+    def invalidate(self, key: str) -> None:
+        """Drop an entry from both tiers, e.g. when a cached response turned out unusable."""
+        with self._lock:
+            self._memory.pop(key, None)
+            if self._disk_index is not None:
+                self._disk_bytes -= self._disk_index.pop(key, 0)
+        if self.cache_dir:
+            try:
+                os.remove(self._path(key))
+            except OSError:
+                pass
+
+    def _remember(self, key: str, stored_at: float, text: str) -> None:
+        """Insert into the memory tier, evicting the least recently used entry (lock held)."""
+        self._memory[key] = (stored_at, text)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def _read_disk(self, key: str):
+        if not self.cache_dir:
+            return None
+        path = self._path(key)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if self._expired(entry["stored_at"]):
+            return None
+        try:
+            os.utime(path)  # Mark as recently used for disk eviction by later processes
+        except OSError:
+            pass
+        with self._lock:
+            if self._disk_index is not None and key in self._disk_index:
+                self._disk_index.move_to_end(key)
+        return entry["stored_at"], entry["text"]
+
+    def _load_disk_index(self) -> "OrderedDict[str, int]":
+        """Build the disk LRU index from the cache directory, oldest access first (lock held)."""
+        if self._disk_index is None:
+            entries = []
+            for name in os.listdir(self.cache_dir):
+                if not name.endswith(".json"):
+                    continue
+                try:
+                    stat = os.stat(os.path.join(self.cache_dir, name))
+                except FileNotFoundError:
+                    continue  # Removed by another process since listdir
+                entries.append((stat.st_mtime, name[:-len(".json")], stat.st_size))
+            entries.sort()
+            self._disk_index = OrderedDict((key, size) for _, key, size in entries)
+            self._disk_bytes = sum(self._disk_index.values())
+        return self._disk_index
+
+    def _trim_disk(self) -> None:
+        """Delete least recently used files until the disk tier fits max_disk_bytes (lock held)."""
+        index = self._load_disk_index()
+        while self._disk_bytes > self.max_disk_bytes and len(index) > 1:
+            key, size = index.popitem(last=False)
+            self._disk_bytes -= size
+            try:
+                os.remove(self._path(key))
+            except FileNotFoundError:
+                pass  # Already evicted by another process sharing the directory
+            except OSError as e:
+                logging.warning(f"Could not evict LLM cache entry {key}: {e}")
@@ -0,0 +1,136 @@
+"""
+Shared async HTTP client for LLM provider requests.
+
+Async requests follow the same policy as post_with_retries: the same
+timeouts, backoff with Retry-After, and per-provider circuit breakers. Each
+event loop gets one pooled httpx.AsyncClient, so concurrent calls share
+connections; with the optional h2 package installed, they are multiplexed
+over HTTP/2.
+"""
+import asyncio
+import importlib.util
+import logging
+import weakref
+from typing import Any, Dict
+
+import httpx
+
+from SimpleLLM.language.llm_providers.resilience import (
+    DEFAULT_TIMEOUT,
+    MAX_RETRIES,
+    RETRYABLE_STATUS_CODES,
+    backoff_delay,
+    get_circuit_breaker,
+    parse_retry_after,
+)
+from SimpleLLM.language.llm_result import record_retry
+
+# HTTP/2 needs the optional h2 package; without it the pool speaks HTTP/1.1
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+# Connection pool size per event loop
+MAX_CONNECTIONS = 100
+MAX_KEEPALIVE_CONNECTIONS = 20
+
+_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient]" = weakref.WeakKeyDictionary()
+
+
+def _httpx_timeout(timeout: Any) -> httpx.Timeout:
+    """Convert a requests-style timeout (seconds or a (connect, read) tuple) for httpx."""
+    if isinstance(timeout, tuple):
+        connect, read = timeout
+        return httpx.Timeout(read, connect=connect)
+    return httpx.Timeout(timeout)
+
+
+def get_async_client() -> httpx.AsyncClient:
+    """Return the running event loop's shared client, creating it on first use."""
+    loop = asyncio.get_running_loop()
+    client = _clients.get(loop)
+    if client is None or client.is_closed:
+        client = httpx.AsyncClient(
+            http2=HTTP2_AVAILABLE,
+            timeout=_httpx_timeout(DEFAULT_TIMEOUT),
+            limits=httpx.Limits(max_connections=MAX_CONNECTIONS, max_keepalive_connections=MAX_KEEPALIVE_CONNECTIONS),
+        )
+        _clients[loop] = client
+    return client
+
+
+async def close_async_client() -> None:
+    """Close the running event loop's shared client and its connections."""
+    client = _clients.pop(asyncio.get_running_loop(), None)
+    if client is not None:
+        await client.aclose()
+
+
+async def async_post_with_retries(
+    provider: str,
+    url: str,
+    headers: Dict[str, str],
+    data: Dict[str, Any],
+    stream: bool = False,
+    timeout: Any = DEFAULT_TIMEOUT,
+    max_retries: int = MAX_RETRIES
+) -> httpx.Response:
+    """
+    POST to a provider asynchronously with timeouts, backoff retries and circuit breaking.
+
+    Mirrors post_with_retries. A streamed response's body is not read yet;
+    the caller must close it with aclose(). Cancelling the awaiting task
+    closes the connection, which stops the generation server-side.
+
+    Args:
+        provider: Provider name, which selects the circuit breaker
+        url: Endpoint URL
+        headers: Request headers
+        data: JSON body
+        stream: Whether to stream the response body
+        timeout: Seconds, or a (connect, read) tuple
+        max_retries: Retries after the first attempt
+
+    Returns:
+        The provider's response
+
+    Raises:
+        CircuitOpenError: If the provider's circuit is open
+        httpx.TransportError: If the last attempt failed to connect or timed out
+    """
+    client = get_async_client()
+    breaker = get_circuit_breaker(provider)
+    for attempt in range(max_retries + 1):
+        breaker.before_call()
+        try:
+            request = client.build_request("POST", url, headers=headers, json=data, timeout=_httpx_timeout(timeout))
+            response = await client.send(request, stream=stream)
+        except httpx.TransportError as e:
+            breaker.record_failure()
+            if attempt == max_retries:
+                raise
+            delay = backoff_delay(attempt)
+            logging.warning(f"{provider} request failed ({e}); retrying in {delay:.1f}s")
+            record_retry()
+            await asyncio.sleep(delay)
+            continue
+        except BaseException:
+            # Cancellation (a lost hedge, an abandoned coalesced call) or any
+            # other error says nothing about the provider, but must free the trial slot
+            breaker.release_trial()
+            raise
+
+        if response.status_code not in RETRYABLE_STATUS_CODES:
+            breaker.record_success()
+            return response
+
+        if response.status_code >= 500:
+            breaker.record_failure()
+        else:
+            breaker.record_success()
+        if attempt == max_retries:
+            return response
+
+        delay = backoff_delay(attempt, parse_retry_after(response.headers.get("Retry-After")))
+        logging.warning(f"{provider} returned {response.status_code}; retrying in {delay:.1f}s")
+        await response.aclose()
+        record_retry()
+        await asyncio.sleep(delay)
@@ -0,0 +1,32 @@
+"""
+Errors shared by the LLM provider modules.
+"""
+
+# Phrases providers use when a model or endpoint rejects response_format
+_RESPONSE_FORMAT_REJECTIONS = (
+    "response_format",
+    "json_schema",
+    "structured output",
+    "no endpoints found that can handle the requested parameters",
+)
+
+
+class StructuredOutputUnsupportedError(Exception):
+    """Raised when a model rejects a structured-output (response_format) request."""
+
+
+def is_response_format_rejection(status_code: int, body: str) -> bool:
+    """
+    Whether an error response says the model cannot honour response_format.
+    
+    Args:
+        status_code: HTTP status of the error response
+        body: Response body text
+        
+    Returns:
+        True for client errors that mention response_format support
+    """
+    if status_code not in (400, 404, 422):
+        return False
+    body = (body or "").lower()
+    return any(phrase in body for phrase in _RESPONSE_FORMAT_REJECTIONS)
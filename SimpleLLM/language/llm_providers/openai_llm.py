@@ -4,38 +4,36 @@ OpenAI LLM provider module.
 import json
 import logging
 import os
-from typing import Generator
+from typing import Any, AsyncGenerator, Dict, Generator, Optional, Tuple, Union
 
-import requests
 from dotenv import load_dotenv
 
+from SimpleLLM.language.llm_providers.async_http import async_post_with_retries
+from SimpleLLM.language.llm_providers.errors import StructuredOutputUnsupportedError, is_response_format_rejection
+from SimpleLLM.language.llm_providers.resilience import RETRYABLE_STATUS_CODES, ProviderHTTPError, post_with_retries
+from SimpleLLM.language.llm_result import record_usage
+
 load_dotenv()
 
-def generate_text(user_prompt: str, system_prompt: str = "", model: str = "gpt-3.5-turbo", 
-                 temperature: float = 0.7, top_p: float = 1.0, max_tokens: int = 2000) -> str:
-    """
-    Generate text using OpenAI API.
-    
-    Args:
-        user_prompt: The user prompt to send to the LLM
-        system_prompt: The system prompt to send to the LLM
-        model: OpenAI model to use (default: gpt-3.5-turbo)
-        temperature: Temperature parameter (default: 0.7)
-        top_p: Top-p parameter (default: 1.0)
-        max_tokens: Maximum number of tokens to generate (default: 500)
-        
-    Returns:
-        Generated text as a string
-    """
+API_URL = "https://api.openai.com/v1/chat/completions"
+
+def _apply_response_format(data: Dict[str, Any], response_format: Optional[Dict[str, Any]]) -> None:
+    """Add a response_format to a request body."""
+    if response_format:
+        data["response_format"] = response_format
+
+def _headers() -> Dict[str, str]:
     openai_api_key = os.getenv("OPENAI_API_KEY")
     if not openai_api_key:
         raise ValueError("OPENAI_API_KEY not found in environment variables")
-        
-    headers = {
+
+    return {
         "Authorization": f"Bearer {openai_api_key}",
         "Content-Type": "application/json"
     }
-    
+
+def _request_data(user_prompt: str, system_prompt: str, model: str, temperature: float, top_p: float,
+                  max_tokens: int, response_format: Optional[Dict[str, Any]], stream: bool = False) -> Dict[str, Any]:
     data = {
         "model": model,
         "messages": [
@@ -46,28 +44,85 @@ def generate_text(user_prompt: str, system_prompt: str = "", model: str = "gpt-3
         "top_p": top_p,
         "max_tokens": max_tokens
     }
-    
+
     # Remove None entries
     data["messages"] = [msg for msg in data["messages"] if msg]
-    
-    response = requests.post(
-        "https://api.openai.com/v1/chat/completions",
-        headers=headers,
-        json=data
-    )
-    
+    if stream:
+        data["stream"] = True
+        data["stream_options"] = {"include_usage": True}  # Final chunk carries the usage, including cached tokens
+    _apply_response_format(data, response_format)
+    return data
+
+def _raise_for_error(status_code: int, text: str, model: str, response_format: Optional[Dict[str, Any]]) -> None:
+    """Raise the matching error for a non-200 response."""
+    logging.error(f"Error from OpenAI API: {status_code}, {text}")
+    if response_format and is_response_format_rejection(status_code, text):
+        raise StructuredOutputUnsupportedError(f"{model} does not support response_format: {text}")
+    raise ProviderHTTPError(f"OpenAI API error: {status_code}, {text}",
+                            status_code, status_code in RETRYABLE_STATUS_CODES)
+
+def _parse_stream_line(line: Union[bytes, str], model: str) -> Tuple[bool, str]:
+    """
+    Parse one line of a streaming response.
+
+    Returns:
+        Tuple of (whether the stream is done, content of the chunk, possibly empty)
+    """
+    if isinstance(line, bytes):
+        line = line.decode("utf-8")
+    if not line:
+        return False, ""
+
+    if line.startswith('data: '):
+        line = line[6:]
+
+    if line.strip() == '[DONE]':
+        return True, ""
+
+    try:
+        response_data = json.loads(line)
+    except json.JSONDecodeError:
+        logging.warning(f"Failed to decode JSON from line: {line}")
+        return False, ""
+    if response_data.get('usage'):
+        record_usage("openai", model, response_data['usage'])
+    choices = response_data.get('choices') or [{}]
+    return False, choices[0].get('delta', {}).get('content', '') or ""
+
+def generate_text(user_prompt: str, system_prompt: str = "", model: str = "gpt-3.5-turbo",
+                 temperature: float = 0.7, top_p: float = 1.0, max_tokens: int = 2000,
+                 response_format: Optional[Dict[str, Any]] = None) -> str:
+    """
+    Generate text using OpenAI API.
+
+    Args:
+        user_prompt: The user prompt to send to the LLM
+        system_prompt: The system prompt to send to the LLM
+        model: OpenAI model to use (default: gpt-3.5-turbo)
+        temperature: Temperature parameter (default: 0.7)
+        top_p: Top-p parameter (default: 1.0)
+        max_tokens: Maximum number of tokens to generate (default: 500)
+        response_format: Optional response_format, e.g. a JSON schema for structured output
+
+    Returns:
+        Generated text as a string
+    """
+    data = _request_data(user_prompt, system_prompt, model, temperature, top_p, max_tokens, response_format)
+    response = post_with_retries("openai", API_URL, _headers(), data)
+
     if response.status_code != 200:
-        logging.error(f"Error from OpenAI API: {response.status_code}, {response.text}")
-        raise Exception(f"OpenAI API error: {response.status_code}, {response.text}")
-        
+        _raise_for_error(response.status_code, response.text, model, response_format)
+
     response_data = response.json()
+    record_usage("openai", model, response_data.get("usage"))
     return response_data["choices"][0]["message"]["content"]
 
-def generate_text_stream(user_prompt: str, system_prompt: str = "", model: str = "gpt-3.5-turbo", 
-                        temperature: float = 0.7, top_p: float = 1.0, max_tokens: int = 500) -> Generator[str, None, None]:
+def generate_text_stream(user_prompt: str, system_prompt: str = "", model: str = "gpt-3.5-turbo",
+                        temperature: float = 0.7, top_p: float = 1.0, max_tokens: int = 500,
+                        response_format: Optional[Dict[str, Any]] = None) -> Generator[str, None, None]:
     """
     Generate streaming text using OpenAI API.
-    
+
     Args:
         user_prompt: The user prompt to send to the LLM
         system_prompt: The system prompt to send to the LLM
@@ -75,60 +130,62 @@ def generate_text_stream(user_prompt: str, system_prompt: str = "", model: str =
         temperature: Temperature parameter (default: 0.7)
         top_p: Top-p parameter (default: 1.0)
         max_tokens: Maximum number of tokens to generate (default: 500)
-        
+        response_format: Optional response_format, e.g. a JSON schema for structured output
+
     Yields:
         Generated text chunks
     """
-    openai_api_key = os.getenv("OPENAI_API_KEY")
-    if not openai_api_key:
-        raise ValueError("OPENAI_API_KEY not found in environment variables")
-        
-    headers = {
-        "Authorization": f"Bearer {openai_api_key}",
-        "Content-Type": "application/json"
-    }
-    
-    data = {
-        "model": model,
-        "messages": [
-            {"role": "system", "content": system_prompt} if system_prompt else None,
-            {"role": "user", "content": user_prompt}
-        ],
-        "temperature": temperature,
-        "top_p": top_p,
-        "max_tokens": max_tokens,
-        "stream": True
-    }
-    
-    # Remove None entries
-    data["messages"] = [msg for msg in data["messages"] if msg]
-    
-    response = requests.post(
-        "https://api.openai.com/v1/chat/completions",
-        headers=headers,
-        json=data,
-        stream=True
-    )
-    
+    data = _request_data(user_prompt, system_prompt, model, temperature, top_p, max_tokens, response_format,
+                         stream=True)
+    response = post_with_retries("openai", API_URL, _headers(), data, stream=True)
+
+    if response.status_code != 200:
+        _raise_for_error(response.status_code, response.text, model, response_format)
+
+    # Process the streaming response; closing the connection early (e.g. when the
+    # caller stops iterating) aborts the generation server-side
+    try:
+        for line in response.iter_lines():
+            done, content = _parse_stream_line(line, model)
+            if done:
+                break
+            if content:
+                yield content
+    finally:
+        response.close()
+
+async def generate_text_async(user_prompt: str, system_prompt: str = "", model: str = "gpt-3.5-turbo",
+                              temperature: float = 0.7, top_p: float = 1.0, max_tokens: int = 2000,
+                              response_format: Optional[Dict[str, Any]] = None) -> str:
+    """Async generate_text over the shared async client; takes the same arguments."""
+    data = _request_data(user_prompt, system_prompt, model, temperature, top_p, max_tokens, response_format)
+    response = await async_post_with_retries("openai", API_URL, _headers(), data)
+
     if response.status_code != 200:
-        logging.error(f"Error from OpenAI API: {response.status_code}, {response.text}")
-        raise Exception(f"OpenAI API error: {response.status_code}")
-        
-    # Process the streaming response
-    for line in response.iter_lines():
-        if not line:
-            continue
-            
-        if line.startswith(b'data: '):
-            line = line[6:]
-            
-        if line.strip() == b'[DONE]':
-            break
-            
-        try:
-            response_data = json.loads(line)
-            content = response_data.get('choices', [{}])[0].get('delta', {}).get('content', '')
+        _raise_for_error(response.status_code, response.text, model, response_format)
+
+    response_data = response.json()
+    record_usage("openai", model, response_data.get("usage"))
+    return response_data["choices"][0]["message"]["content"]
+
+async def generate_text_stream_async(user_prompt: str, system_prompt: str = "", model: str = "gpt-3.5-turbo",
+                                     temperature: float = 0.7, top_p: float = 1.0, max_tokens: int = 500,
+                                     response_format: Optional[Dict[str, Any]] = None) -> AsyncGenerator[str, None]:
+    """Async generate_text_stream over the shared async client; takes the same arguments."""
+    data = _request_data(user_prompt, system_prompt, model, temperature, top_p, max_tokens, response_format,
+                         stream=True)
+    response = await async_post_with_retries("openai", API_URL, _headers(), data, stream=True)
+
+    # Closing the stream (aclose, or cancelling the consuming task) closes the connection
+    try:
+        if response.status_code != 200:
+            await response.aread()
+            _raise_for_error(response.status_code, response.text, model, response_format)
+        async for line in response.aiter_lines():
+            done, content = _parse_stream_line(line, model)
+            if done:
+                break
             if content:
                 yield content
-        except json.JSONDecodeError:
-            logging.warning(f"Failed to decode JSON from line: {line}")
+    finally:
+        await response.aclose()
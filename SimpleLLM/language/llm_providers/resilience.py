@@ -0,0 +1,290 @@
+"""
+Timeouts, retries with backoff, and circuit breaking for LLM provider requests.
+"""
+import contextvars
+import logging
+import random
+import socket
+import threading
+import time
+from contextlib import contextmanager
+from email.utils import parsedate_to_datetime
+from typing import Any, Dict, Iterator, Optional
+
+import requests
+
+from SimpleLLM.language.llm_result import record_retry
+
+# (connect, read) timeouts in seconds; the read timeout bounds the wait for each streamed chunk too
+DEFAULT_TIMEOUT = (10, 120)
+
+# Retries after the first attempt, and the backoff bounds in seconds
+MAX_RETRIES = 3
+BASE_DELAY = 1.0
+MAX_DELAY = 30.0
+
+# Consecutive failures that open a provider's circuit, and seconds before a trial request is let through
+FAILURE_THRESHOLD = 5
+RESET_TIMEOUT = 30.0
+
+RETRYABLE_STATUS_CODES = (429, 500, 502, 503, 504)
+
+
+class ProviderHTTPError(Exception):
+    """Raised when a provider answers with a non-200 status after retries."""
+
+    def __init__(self, message: str, status_code: int, retryable: bool = False):
+        super().__init__(message)
+        self.status_code = status_code
+        self.retryable = retryable
+
+
+class CircuitOpenError(Exception):
+    """Raised without calling the provider while its circuit is open."""
+
+
+# Failures the provider layer has already retried (or refused to attempt); callers should not retry them again
+PROVIDER_ERRORS = (ProviderHTTPError, CircuitOpenError, requests.RequestException)
+
+
+class StreamCancelledError(Exception):
+    """Raised instead of sending a request for a streamed call that has already been cancelled."""
+
+
+class CircuitBreaker:
+    """
+    Consecutive-failure circuit breaker.
+
+    After failure_threshold failures in a row the circuit opens and calls fail
+    fast with CircuitOpenError. Once reset_timeout has passed, one trial call is
+    let through (half-open); its success closes the circuit, its failure
+    reopens it.
+    """
+
+    def __init__(self, name: str, failure_threshold: int = FAILURE_THRESHOLD, reset_timeout: float = RESET_TIMEOUT):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._failures = 0
+        self._opened_at: Optional[float] = None
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            if self._opened_at is None:
+                return "closed"
+            if time.monotonic() - self._opened_at >= self.reset_timeout:
+                return "half-open"
+            return "open"
+
+    def before_call(self) -> None:
+        """Raise CircuitOpenError unless a call may go through now."""
+        with self._lock:
+            if self._opened_at is None:
+                return
+            waited = time.monotonic() - self._opened_at
+            if waited < self.reset_timeout or self._trial_in_flight:
+                raise CircuitOpenError(
+                    f"{self.name} circuit is open after {self._failures} consecutive failures; "
+                    f"retry in {max(0.0, self.reset_timeout - waited):.0f}s"
+                )
+            self._trial_in_flight = True
+
+    def record_success(self) -> None:
+        with self._lock:
+            if self._opened_at is not None:
+                logging.info(f"{self.name} circuit closed")
+            self._failures = 0
+            self._opened_at = None
+            self._trial_in_flight = False
+
+    def release_trial(self) -> None:
+        """Give back a half-open trial slot for a call that ended without a verdict (e.g. cancelled)."""
+        with self._lock:
+            self._trial_in_flight = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            self._trial_in_flight = False
+            if self._opened_at is not None or self._failures >= self.failure_threshold:
+                if self._opened_at is None:
+                    logging.warning(f"{self.name} circuit opened after {self._failures} consecutive failures")
+                self._opened_at = time.monotonic()
+
+
+_breakers: Dict[str, CircuitBreaker] = {}
+_breakers_lock = threading.Lock()
+
+
+def get_circuit_breaker(provider: str) -> CircuitBreaker:
+    """Return the process-wide circuit breaker for a provider."""
+    with _breakers_lock:
+        if provider not in _breakers:
+            _breakers[provider] = CircuitBreaker(provider)
+        return _breakers[provider]
+
+
+def _abort_response(response: requests.Response) -> None:
+    """Close a streamed response, waking a thread blocked reading it."""
+    # Closing the socket alone leaves a read blocked in another thread waiting, so shut it down first
+    sock = getattr(getattr(getattr(getattr(response.raw, "_fp", None), "fp", None), "raw", None), "_sock", None)
+    if sock is not None:
+        try:
+            sock.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+    response.close()
+
+
+class StreamHandle:
+    """
+    Lets another thread cancel a streamed call, e.g. the loser of a hedged race.
+
+    While bound with bind_stream_handle, post_with_retries attaches each
+    streamed response to the handle. cancel closes the attached response,
+    even before its first chunk arrives, and stops later attempts from being sent.
+    """
+
+    def __init__(self):
+        self.cancelled = threading.Event()
+        self._response: Optional[requests.Response] = None
+        self._lock = threading.Lock()
+
+    def attach(self, response: requests.Response) -> None:
+        with self._lock:
+            self._response = response
+            cancelled = self.cancelled.is_set()
+        if cancelled:
+            _abort_response(response)
+
+    def cancel(self) -> None:
+        with self._lock:
+            self.cancelled.set()
+            response = self._response
+        if response is not None:
+            _abort_response(response)
+
+
+_stream_handle: contextvars.ContextVar = contextvars.ContextVar("provider_stream_handle", default=None)
+
+
+@contextmanager
+def bind_stream_handle(handle: StreamHandle) -> Iterator[StreamHandle]:
+    """Attach streamed responses requested in this context to handle."""
+    token = _stream_handle.set(handle)
+    try:
+        yield handle
+    finally:
+        _stream_handle.reset(token)
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """
+    Parse a Retry-After header given in seconds or as an HTTP date.
+
+    Returns:
+        Seconds to wait, or None if the header is missing or malformed
+    """
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def backoff_delay(attempt: int, retry_after: Optional[float] = None) -> float:
+    """
+    Seconds to wait before retry number attempt (0-based).
+
+    Uses full jitter on an exponential ceiling; a server's Retry-After is
+    honoured as the minimum wait, capped at MAX_DELAY.
+    """
+    delay = random.uniform(0, min(MAX_DELAY, BASE_DELAY * (2 ** attempt)))
+    if retry_after is not None:
+        delay = max(delay, min(retry_after, MAX_DELAY))
+    return delay
+
+
+def post_with_retries(
+    provider: str,
+    url: str,
+    headers: Dict[str, str],
+    data: Dict[str, Any],
+    stream: bool = False,
+    timeout: Any = DEFAULT_TIMEOUT,
+    max_retries: int = MAX_RETRIES
+) -> requests.Response:
+    """
+    POST to a provider with timeouts, backoff retries and circuit breaking.
+
+    Connection errors, timeouts, 429 and 5xx responses are retried. Any other
+    response is returned as-is for the provider to interpret, as is the last
+    response once retries run out.
+
+    Args:
+        provider: Provider name, which selects the circuit breaker
+        url: Endpoint URL
+        headers: Request headers
+        data: JSON body
+        stream: Whether to stream the response body
+        timeout: Seconds, or a (connect, read) tuple
+        max_retries: Retries after the first attempt
+
+    Returns:
+        The provider's response
+
+    Raises:
+        CircuitOpenError: If the provider's circuit is open
+        StreamCancelledError: If the stream handle bound to this context was cancelled
+        requests.RequestException: If the last attempt failed to connect or timed out
+    """
+    breaker = get_circuit_breaker(provider)
+    handle = _stream_handle.get() if stream else None
+    for attempt in range(max_retries + 1):
+        if handle is not None and handle.cancelled.is_set():
+            raise StreamCancelledError(f"{provider} stream was cancelled")
+        breaker.before_call()
+        try:
+            response = requests.post(url, headers=headers, json=data, stream=stream, timeout=timeout)
+            if handle is not None:
+                handle.attach(response)
+        except (requests.ConnectionError, requests.Timeout) as e:
+            breaker.record_failure()
+            if attempt == max_retries:
+                raise
+            delay = backoff_delay(attempt)
+            logging.warning(f"{provider} request failed ({e}); retrying in {delay:.1f}s")
+            record_retry()
+            time.sleep(delay)
+            continue
+        except BaseException:
+            # Any other error says nothing about the provider's health, but must not keep the trial slot
+            breaker.release_trial()
+            raise
+
+        if response.status_code not in RETRYABLE_STATUS_CODES:
+            # Any other answer, including a client error, shows the upstream is reachable
+            breaker.record_success()
+            return response
+
+        # Rate limiting means the provider is up, so only server errors count toward the circuit
+        if response.status_code >= 500:
+            breaker.record_failure()
+        else:
+            breaker.record_success()
+        if attempt == max_retries:
+            return response
+
+        delay = backoff_delay(attempt, parse_retry_after(response.headers.get("Retry-After")))
+        logging.warning(f"{provider} returned {response.status_code}; retrying in {delay:.1f}s")
+        response.close()
+        record_retry()
+        time.sleep(delay)
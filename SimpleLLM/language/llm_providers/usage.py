@@ -0,0 +1,62 @@
+"""
+Token usage reported by providers, including prompt-cache hits.
+"""
+import threading
+from typing import Any, Dict, Optional
+
+
+def cached_prompt_tokens(usage: Dict[str, Any]) -> int:
+    """
+    Prompt tokens served from the provider's prompt cache.
+
+    Reads the OpenAI-style prompt_tokens_details.cached_tokens, which OpenAI and
+    OpenRouter return, or DeepSeek's prompt_cache_hit_tokens.
+    """
+    details = usage.get("prompt_tokens_details") or {}
+    return int(details.get("cached_tokens") or usage.get("prompt_cache_hit_tokens") or 0)
+
+
+class UsageTracker:
+    """Totals of prompt, cached-prompt and completion tokens per provider and model."""
+
+    def __init__(self):
+        self._totals: Dict[str, Dict[str, int]] = {}
+        self._lock = threading.Lock()
+
+    def record(self, provider: str, model: str, usage: Optional[Dict[str, Any]]) -> None:
+        """
+        Add one response's usage.
+
+        Args:
+            provider: Provider name
+            model: Model name
+            usage: The response's "usage" object; ignored if missing
+        """
+        if not usage:
+            return
+        with self._lock:
+            totals = self._totals.setdefault(
+                f"{provider}/{model}", {"calls": 0, "prompt_tokens": 0, "cached_tokens": 0, "completion_tokens": 0}
+            )
+            totals["calls"] += 1
+            totals["prompt_tokens"] += int(usage.get("prompt_tokens") or 0)
+            totals["cached_tokens"] += cached_prompt_tokens(usage)
+            totals["completion_tokens"] += int(usage.get("completion_tokens") or 0)
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        """Totals per "provider/model", with the share of prompt tokens served from cache."""
+        with self._lock:
+            stats = {}
+            for key, totals in self._totals.items():
+                stats[key] = dict(totals)
+                prompt_tokens = totals["prompt_tokens"]
+                stats[key]["cached_ratio"] = round(totals["cached_tokens"] / prompt_tokens, 3) if prompt_tokens else 0.0
+            return stats
+
+    def reset(self) -> None:
+        with self._lock:
+            self._totals.clear()
+
+
+# Shared by both providers
+usage_tracker = UsageTracker()
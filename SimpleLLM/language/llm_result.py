@@ -0,0 +1,360 @@
+"""
+Rich results for LLM calls, and per-stage metrics built from them.
+
+Every LLM call produces an LLMResult holding its text, token usage, latency,
+time to first token (for streams), model and retries. The provider layer
+fills in usage and retries for the call in progress through a context
+variable, so nothing between LLM and the provider modules has to pass the
+result along. Results are added to the LLMMetrics active in the caller's
+context, under the stage set with metrics_stage; bind_context carries both
+into worker threads.
+"""
+import contextvars
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, Optional
+
+from SimpleLLM.language.llm_providers.usage import cached_prompt_tokens, usage_tracker
+from SimpleLLM.language.rate_limiter import estimate_tokens
+
+# Stage that calls made outside any metrics_stage are counted under
+DEFAULT_STAGE = "unattributed"
+
+_current_result: contextvars.ContextVar = contextvars.ContextVar("llm_current_result", default=None)
+_current_metrics: contextvars.ContextVar = contextvars.ContextVar("llm_metrics", default=None)
+_current_stage: contextvars.ContextVar = contextvars.ContextVar("llm_stage", default=DEFAULT_STAGE)
+
+
+class LLMResult:
+    """
+    The text of one LLM call with its token usage and timing.
+
+    Token counts come from the provider's usage block. When the provider
+    reported none (e.g. a stream closed before its final chunk), they are
+    estimated from the prompt and text and `estimated` is set.
+
+    Args:
+        provider: Provider name
+        model: Model name; a hedged call reports the model that won
+        prompt_estimate: Estimated prompt tokens, used if the provider reports no usage
+        stream: Whether the call was streamed
+    """
+
+    def __init__(self, provider: str, model: str, prompt_estimate: int = 0, stream: bool = False):
+        self.text = ""
+        self.provider = provider
+        self.model = model
+        self.stream = stream
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+        self.cached_tokens = 0
+        self.cost = 0.0
+        self.latency: Optional[float] = None
+        self.time_to_first_token: Optional[float] = None
+        self.retries = 0
+        self.cache_hit = False
+        self.coalesced = False  # Shared from an identical call already in flight
+        self.hedged = False
+        self.estimated = False
+        self.error: Optional[str] = None
+        self.prompt_estimate = prompt_estimate
+        self._usage_reported = False
+        self._started = time.monotonic()
+
+    def __str__(self) -> str:
+        return self.text
+
+    def add_usage(self, usage: Dict[str, Any]) -> None:
+        """Add a provider usage block (several if a hedged call ran on two models)."""
+        self._usage_reported = True
+        self.prompt_tokens += int(usage.get("prompt_tokens") or 0)
+        self.completion_tokens += int(usage.get("completion_tokens") or 0)
+        self.cached_tokens += cached_prompt_tokens(usage)
+        self.cost += float(usage.get("cost") or 0.0)
+
+    def mark_first_token(self) -> None:
+        if self.time_to_first_token is None:
+            self.time_to_first_token = time.monotonic() - self._started
+
+    def finish(self, error: Optional[BaseException] = None) -> None:
+        """Stop the clock, estimate missing usage, and add the result to the active metrics."""
+        if self.latency is not None:
+            return
+        self.latency = time.monotonic() - self._started
+        if error is not None:
+            self.error = type(error).__name__
+        if not self._usage_reported and not (self.cache_hit or self.coalesced):
+            self.prompt_tokens = self.prompt_estimate
+            self.completion_tokens = estimate_tokens(self.text)
+            self.estimated = True
+        metrics = _current_metrics.get()
+        if metrics is not None:
+            metrics.record(self, _current_stage.get())
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "provider": self.provider,
+            "model": self.model,
+            "stream": self.stream,
+            "prompt_tokens": self.prompt_tokens,
+            "completion_tokens": self.completion_tokens,
+            "cached_tokens": self.cached_tokens,
+            "cost": round(self.cost, 6),
+            "latency_seconds": None if self.latency is None else round(self.latency, 3),
+            "time_to_first_token_seconds": (
+                None if self.time_to_first_token is None else round(self.time_to_first_token, 3)
+            ),
+            "retries": self.retries,
+            "cache_hit": self.cache_hit,
+            "coalesced": self.coalesced,
+            "hedged": self.hedged,
+            "estimated": self.estimated,
+            "error": self.error,
+        }
+
+
+def current_result() -> Optional[LLMResult]:
+    """The result of the LLM call running in this context, if any."""
+    return _current_result.get()
+
+
+def record_usage(provider: str, model: str, usage: Optional[Dict[str, Any]]) -> None:
+    """
+    Record a provider response's usage block.
+
+    Adds it to the process-wide usage tracker and to the result of the call in progress.
+    """
+    if not usage:
+        return
+    usage_tracker.record(provider, model, usage)
+    result = _current_result.get()
+    if result is not None:
+        result.add_usage(usage)
+
+
+def record_retry() -> None:
+    """Count a provider-level retry against the call in progress."""
+    result = _current_result.get()
+    if result is not None:
+        result.retries += 1
+
+
+@contextmanager
+def track_result(result: LLMResult) -> Iterator[LLMResult]:
+    """Make result the call in progress for the duration of the block, then finish it."""
+    token = _current_result.set(result)
+    try:
+        yield result
+    except BaseException as e:
+        result.finish(e)
+        raise
+    finally:
+        _current_result.reset(token)
+    result.finish()
+
+
+class _StreamTracker:
+    """Collects a stream's chunks into its LLMResult."""
+
+    def __init__(self, chunks, result: LLMResult):
+        self.result = result
+        self._source = chunks
+        self._parts = []
+        self._finished = False
+
+    def _add(self, chunk: str) -> str:
+        self.result.mark_first_token()
+        self._parts.append(chunk)
+        return chunk
+
+    def _finish(self, error: Optional[BaseException] = None) -> None:
+        if self._finished:
+            return
+        self._finished = True
+        self.result.text = "".join(self._parts)
+        self.result.finish(error)
+
+
+class TrackedStream(_StreamTracker):
+    """
+    Iterator over a streamed call's chunks that fills in its LLMResult.
+
+    The result is the call in progress only while a chunk is being read, so
+    interleaved streams do not mix their usage. It is finished when the stream
+    ends, fails or is closed.
+    """
+
+    def __init__(self, chunks, result: LLMResult):
+        super().__init__(chunks, result)
+        self._chunks = iter(chunks)
+
+    def __iter__(self) -> "TrackedStream":
+        return self
+
+    def __next__(self) -> str:
+        if self._finished:
+            raise StopIteration
+        token = _current_result.set(self.result)
+        try:
+            chunk = next(self._chunks)
+        except StopIteration:
+            self._finish()
+            raise
+        except BaseException as e:
+            self._finish(e)
+            raise
+        finally:
+            _current_result.reset(token)
+        return self._add(chunk)
+
+    def close(self) -> None:
+        """Close the underlying stream, which cancels the generation, and finish the result."""
+        try:
+            if hasattr(self._source, "close"):
+                self._source.close()
+        finally:
+            self._finish()
+
+
+class AsyncTrackedStream(_StreamTracker):
+    """Async iterator counterpart of TrackedStream."""
+
+    def __aiter__(self) -> "AsyncTrackedStream":
+        return self
+
+    async def __anext__(self) -> str:
+        if self._finished:
+            raise StopAsyncIteration
+        token = _current_result.set(self.result)
+        try:
+            chunk = await self._source.__anext__()
+        except StopAsyncIteration:
+            self._finish()
+            raise
+        except BaseException as e:
+            self._finish(e)
+            raise
+        finally:
+            _current_result.reset(token)
+        return self._add(chunk)
+
+    async def aclose(self) -> None:
+        """Close the underlying stream, which cancels the generation, and finish the result."""
+        try:
+            if hasattr(self._source, "aclose"):
+                await self._source.aclose()
+        finally:
+            self._finish()
+
+
+def _totals() -> Dict[str, Any]:
+    return {
+        "calls": 0, "errors": 0, "cache_hits": 0, "coalesced": 0, "hedged": 0, "estimated_usage": 0, "retries": 0,
+        "prompt_tokens": 0, "cached_tokens": 0, "completion_tokens": 0, "cost": 0.0,
+        "latency_seconds": 0.0, "max_latency_seconds": 0.0,
+        "streams": 0, "time_to_first_token_seconds": 0.0, "models": {},
+    }
+
+
+class LLMMetrics:
+    """Totals of LLM results per stage."""
+
+    def __init__(self):
+        self._stages: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    def record(self, result: LLMResult, stage: str = DEFAULT_STAGE) -> None:
+        with self._lock:
+            totals = self._stages.setdefault(stage, _totals())
+            totals["calls"] += 1
+            totals["errors"] += result.error is not None
+            totals["cache_hits"] += result.cache_hit
+            totals["coalesced"] += result.coalesced
+            totals["hedged"] += result.hedged
+            totals["estimated_usage"] += result.estimated
+            totals["retries"] += result.retries
+            totals["prompt_tokens"] += result.prompt_tokens
+            totals["cached_tokens"] += result.cached_tokens
+            totals["completion_tokens"] += result.completion_tokens
+            totals["cost"] += result.cost
+            totals["latency_seconds"] += result.latency or 0.0
+            totals["max_latency_seconds"] = max(totals["max_latency_seconds"], result.latency or 0.0)
+            if result.time_to_first_token is not None:
+                totals["streams"] += 1
+                totals["time_to_first_token_seconds"] += result.time_to_first_token
+            model = f"{result.provider}/{result.model}"
+            totals["models"][model] = totals["models"].get(model, 0) + 1
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Per-stage totals and a run-wide total.
+
+        Returns:
+            Dict with "stages" (totals keyed by stage name) and "total"; latencies
+            are in seconds, with means over calls and, for time to first token,
+            over streams that produced a chunk
+        """
+        with self._lock:
+            stages = {name: _summarize(totals) for name, totals in self._stages.items()}
+            overall = _totals()
+            for totals in self._stages.values():
+                for key, value in totals.items():
+                    if key == "models":
+                        for model, calls in value.items():
+                            overall["models"][model] = overall["models"].get(model, 0) + calls
+                    elif key == "max_latency_seconds":
+                        overall[key] = max(overall[key], value)
+                    else:
+                        overall[key] += value
+        return {"stages": stages, "total": _summarize(overall)}
+
+
+def _summarize(totals: Dict[str, Any]) -> Dict[str, Any]:
+    summary = {key: value for key, value in totals.items() if key not in ("streams", "time_to_first_token_seconds")}
+    summary["models"] = dict(totals["models"])
+    summary["cost"] = round(totals["cost"], 6)
+    summary["latency_seconds"] = round(totals["latency_seconds"], 3)
+    summary["mean_latency_seconds"] = round(totals["latency_seconds"] / totals["calls"], 3) if totals["calls"] else 0.0
+    summary["max_latency_seconds"] = round(totals["max_latency_seconds"], 3)
+    summary["mean_time_to_first_token_seconds"] = (
+        round(totals["time_to_first_token_seconds"] / totals["streams"], 3) if totals["streams"] else None
+    )
+    return summary
+
+
+@contextmanager
+def collect_metrics(metrics: LLMMetrics) -> Iterator[LLMMetrics]:
+    """Add the results of LLM calls made in this context (and contexts bound from it) to metrics."""
+    token = _current_metrics.set(metrics)
+    try:
+        yield metrics
+    finally:
+        _current_metrics.reset(token)
+
+
+@contextmanager
+def metrics_stage(name: str) -> Iterator[None]:
+    """Count LLM calls made in this context under the named stage."""
+    token = _current_stage.set(name)
+    try:
+        yield
+    finally:
+        _current_stage.reset(token)
+
+
+def bind_context(fn: Callable[..., Any]) -> Callable[..., Any]:
+    """
+    Wrap fn to run in a copy of the caller's context.
+
+    Thread pools do not carry context variables into their workers; submitting
+    bind_context(fn) instead of fn keeps the worker's LLM calls counted under
+    the caller's metrics and stage. Each call gets its own copy, so the
+    wrapper can be used with executor.map and run concurrently.
+    """
+    context = contextvars.copy_context()
+
+    def run(*args: Any, **kwargs: Any) -> Any:
+        return context.copy().run(fn, *args, **kwargs)
+
+    return run
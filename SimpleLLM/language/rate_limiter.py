@@ -0,0 +1,191 @@
+"""
+Process-wide token-bucket rate limiting for LLM calls.
+"""
+import asyncio
+import logging
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count (about four characters per token)."""
+    return len(text or "") // 4 + 1
+
+
+class TokenBucket:
+    """Bucket holding up to capacity units, refilled continuously at rate units per second."""
+
+    def __init__(self, capacity: float, rate: float):
+        self.capacity = capacity
+        self.rate = rate
+        self._level = capacity
+        self._updated = time.monotonic()
+
+    def _refill(self, now: float) -> None:
+        self._level = min(self.capacity, self._level + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def wait_time(self, amount: float, now: float) -> float:
+        """Seconds until amount units are available (0 if they are now)."""
+        self._refill(now)
+        amount = min(amount, self.capacity)  # A request larger than the bucket waits for a full bucket
+        return max(0.0, (amount - self._level) / self.rate)
+
+    def take(self, amount: float) -> None:
+        self._level -= min(amount, self.capacity)
+
+    def give_back(self, amount: float) -> None:
+        self._level = min(self.capacity, self._level + amount)
+
+
+class Reservation:
+    """Capacity taken for one call; settle it with the call's actual token use."""
+
+    def __init__(self, keys: List[Tuple[str, Optional[str]]], tokens: int, waited: float):
+        self.keys = keys
+        self.tokens = tokens
+        self.waited = waited
+
+
+class RateLimiter:
+    """
+    Requests-per-minute and tokens-per-minute budgets per provider and model.
+
+    Limits can be set for a whole provider (model None) and for individual
+    models; a call must fit every limit that applies to it. Token budgets are
+    reserved up front from the prompt size plus max_tokens, and the unused part
+    is returned once the response is known.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._request_buckets: Dict[Tuple[str, Optional[str]], TokenBucket] = {}
+        self._token_buckets: Dict[Tuple[str, Optional[str]], TokenBucket] = {}
+        self._stats: Dict[Tuple[str, Optional[str]], Dict[str, float]] = {}
+
+    def configure(self, provider: str, model: Optional[str] = None,
+                  rpm: Optional[float] = None, tpm: Optional[float] = None) -> None:
+        """
+        Set the budgets for a provider, or for one of its models.
+
+        Args:
+            provider: Provider name, e.g. "OPENROUTER"
+            model: Model name, or None for a limit shared by all the provider's models
+            rpm: Requests per minute, or None for no request limit
+            tpm: Tokens per minute, or None for no token limit
+        """
+        key = (provider, model)
+        with self._lock:
+            self._request_buckets.pop(key, None)
+            self._token_buckets.pop(key, None)
+            if rpm:
+                self._request_buckets[key] = TokenBucket(rpm, rpm / 60.0)
+            if tpm:
+                self._token_buckets[key] = TokenBucket(tpm, tpm / 60.0)
+
+    def reset(self) -> None:
+        """Remove all limits and metrics."""
+        with self._lock:
+            self._request_buckets.clear()
+            self._token_buckets.clear()
+            self._stats.clear()
+
+    def acquire(self, provider: str, model: str, tokens: int) -> Reservation:
+        """
+        Block until a call fits every applicable budget, then reserve it.
+
+        Args:
+            provider: Provider name
+            model: Model name
+            tokens: Estimated tokens for the call (prompt plus max output)
+
+        Returns:
+            Reservation recording the reserved tokens and the time spent waiting
+        """
+        started = time.monotonic()
+        while True:
+            reservation, wait = self._try_acquire(provider, model, tokens, started)
+            if reservation is not None:
+                return reservation
+            # Sleep outside the lock; wake up at least once a second to re-check
+            time.sleep(min(wait, 1.0))
+
+    async def acquire_async(self, provider: str, model: str, tokens: int) -> Reservation:
+        """Like acquire, but waits without blocking the event loop."""
+        started = time.monotonic()
+        while True:
+            reservation, wait = self._try_acquire(provider, model, tokens, started)
+            if reservation is not None:
+                return reservation
+            await asyncio.sleep(min(wait, 1.0))
+
+    def _try_acquire(self, provider: str, model: str, tokens: int,
+                     started: float) -> Tuple[Optional[Reservation], float]:
+        """Reserve the call if it fits now; otherwise return the seconds to wait before trying again."""
+        keys = [(provider, None), (provider, model)]
+        with self._lock:
+            now = time.monotonic()
+            wait = 0.0
+            for key in keys:
+                if key in self._request_buckets:
+                    wait = max(wait, self._request_buckets[key].wait_time(1, now))
+                if key in self._token_buckets:
+                    wait = max(wait, self._token_buckets[key].wait_time(tokens, now))
+            if wait > 0:
+                return None, wait
+            for key in keys:
+                if key in self._request_buckets:
+                    self._request_buckets[key].take(1)
+                if key in self._token_buckets:
+                    self._token_buckets[key].take(tokens)
+            waited = now - started
+            self._record(provider, model, waited)
+            return Reservation(keys, tokens, waited), 0.0
+
+    def settle(self, reservation: Reservation, actual_tokens: int) -> None:
+        """Return the unused part of a reservation's token budget."""
+        unused = reservation.tokens - actual_tokens
+        if unused <= 0:
+            return
+        with self._lock:
+            for key in reservation.keys:
+                if key in self._token_buckets:
+                    self._token_buckets[key].give_back(unused)
+
+    def _record(self, provider: str, model: str, waited: float) -> None:
+        """Update queue-wait metrics (lock held)."""
+        stats = self._stats.setdefault(
+            (provider, model), {"calls": 0, "waited_calls": 0, "total_wait_seconds": 0.0, "max_wait_seconds": 0.0}
+        )
+        stats["calls"] += 1
+        if waited > 0.001:
+            stats["waited_calls"] += 1
+            stats["total_wait_seconds"] += waited
+            stats["max_wait_seconds"] = max(stats["max_wait_seconds"], waited)
+            if waited > 1.0:
+                logging.info(f"Rate limiter held {provider} {model} call for {waited:.1f}s")
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        """Queue-wait metrics per "provider/model"."""
+        with self._lock:
+            return {f"{provider}/{model}": dict(stats) for (provider, model), stats in self._stats.items()}
+
+
+# Shared by every LLM instance in the process
+rate_limiter = RateLimiter()
+
+
+def configure_rate_limits(limits: Dict[str, Dict[str, Dict[str, float]]]) -> None:
+    """
+    Configure the shared rate limiter from a nested dict.
+
+    Args:
+        limits: {provider: {model or "*": {"rpm": ..., "tpm": ...}}}, where "*"
+            sets the limit shared by all of the provider's models
+    """
+    for provider, models in limits.items():
+        for model, budget in models.items():
+            rate_limiter.configure(
+                provider, None if model == "*" else model, rpm=budget.get("rpm"), tpm=budget.get("tpm")
+            )
@@ -0,0 +1,253 @@
+"""
+Request coalescing: concurrent identical calls share one execution.
+
+The first caller for a key runs the call; callers arriving with the same key
+while it is in flight wait for it and receive its result (or its exception).
+Once the call finishes, the next caller starts a new one, so nothing is
+cached beyond the call's lifetime.
+
+Streams are shared the same way: the first caller reads the upstream stream
+and buffers its chunks, and callers joining while it is open replay the
+buffer and then follow the leader chunk by chunk. The leader's reading
+drives the upstream, so a leader that stops early ends every follower's
+stream at the same point.
+"""
+import asyncio
+import threading
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Hashable, Iterator, List, Optional, Tuple
+
+
+class _Call:
+    __slots__ = ("done", "value", "error")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.value: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class _AsyncCall:
+    __slots__ = ("task", "waiters", "abandoned")
+
+    def __init__(self, task: "asyncio.Future"):
+        self.task = task
+        self.waiters = 0
+        self.abandoned = False  # Cancelled because every caller stopped waiting
+
+
+class _StreamCall:
+    """Chunks a leader has read so far, and how its stream ended."""
+
+    def __init__(self, condition):
+        self.chunks: List[Any] = []
+        self.done = False
+        self.error: Optional[BaseException] = None
+        self.condition = condition
+
+
+class SingleFlight:
+    """Coalesces concurrent calls with the same key, counting the duplicates it absorbed."""
+
+    def __init__(self):
+        self._calls: Dict[Hashable, _Call] = {}
+        self._async_calls: Dict[Tuple, _AsyncCall] = {}
+        self._streams: Dict[Hashable, _StreamCall] = {}
+        self._async_streams: Dict[Tuple, _StreamCall] = {}
+        self._stats = {"calls": 0, "executed": 0, "coalesced": 0}
+        self._lock = threading.Lock()
+
+    def _count(self, leader: bool) -> None:
+        """Update the counters (lock held)."""
+        self._stats["calls"] += 1
+        self._stats["executed" if leader else "coalesced"] += 1
+
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Tuple[Any, bool]:
+        """
+        Run fn, or wait for the identical call already in flight.
+
+        Args:
+            key: Identifies identical calls
+            fn: The call to run if none is in flight for key
+
+        Returns:
+            Tuple of (fn's result, whether it was shared from another caller's call)
+
+        Raises:
+            Whatever fn raised, in every caller that shared the call
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+            self._count(leader)
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.value, True
+
+        try:
+            call.value = fn()
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+            call.done.set()
+        return call.value, False
+
+    async def do_async(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Tuple[Any, bool]:
+        """
+        Async do: calls on the same event loop with the same key share one task.
+
+        A caller that is cancelled stops waiting; the shared task is cancelled
+        only when no caller is left waiting for it.
+        """
+        flight_key = (asyncio.get_running_loop(), key)
+        with self._lock:
+            call = self._async_calls.get(flight_key)
+            leader = call is None or call.abandoned
+            if leader:
+                call = self._async_calls[flight_key] = _AsyncCall(asyncio.ensure_future(fn()))
+                call.task.add_done_callback(lambda _: self._forget(flight_key, call))
+            call.waiters += 1
+            self._count(leader)
+
+        try:
+            return await asyncio.shield(call.task), not leader
+        except asyncio.CancelledError:
+            with self._lock:
+                call.waiters -= 1
+                abandon = call.waiters == 0 and not call.task.done()
+                call.abandoned = call.abandoned or abandon
+            if abandon:
+                call.task.cancel()
+            raise
+
+    def _forget(self, flight_key: Tuple, call: _AsyncCall) -> None:
+        with self._lock:
+            if self._async_calls.get(flight_key) is call:
+                del self._async_calls[flight_key]
+
+    def _join_stream(self, streams: Dict, key: Hashable, new_condition: Callable[[], Any]) -> Tuple[_StreamCall, bool]:
+        with self._lock:
+            call = streams.get(key)
+            leader = call is None
+            if leader:
+                call = streams[key] = _StreamCall(new_condition())
+            self._count(leader)
+        return call, leader
+
+    def _end_stream(self, streams: Dict, key: Hashable, call: _StreamCall) -> None:
+        with self._lock:
+            if streams.get(key) is call:
+                del streams[key]
+
+    def stream(self, key: Hashable, open_stream: Callable[[], Any],
+               on_shared: Optional[Callable[[], None]] = None) -> Iterator[Any]:
+        """
+        Iterate a stream, or follow the identical stream already being read.
+
+        The leader/follower decision is made when iteration starts.
+
+        Args:
+            key: Identifies identical streams
+            open_stream: Opens the upstream stream if none is in flight for key
+            on_shared: Called when this caller follows another caller's stream
+
+        Yields:
+            The stream's chunks
+
+        Raises:
+            Whatever the upstream stream raised, in the leader and every follower
+        """
+        call, leader = self._join_stream(self._streams, key, threading.Condition)
+        if not leader:
+            if on_shared is not None:
+                on_shared()
+            index = 0
+            while True:
+                with call.condition:
+                    call.condition.wait_for(lambda: index < len(call.chunks) or call.done)
+                    if index >= len(call.chunks):
+                        if call.error is not None:
+                            raise call.error
+                        return
+                    chunk = call.chunks[index]
+                index += 1
+                yield chunk
+
+        upstream = None
+        try:
+            upstream = open_stream()
+            for chunk in upstream:
+                with call.condition:
+                    call.chunks.append(chunk)
+                    call.condition.notify_all()
+                yield chunk
+        except Exception as e:
+            call.error = e
+            raise
+        finally:
+            try:
+                if hasattr(upstream, "close"):
+                    upstream.close()
+            finally:
+                self._end_stream(self._streams, key, call)
+                with call.condition:
+                    call.done = True
+                    call.condition.notify_all()
+
+    async def stream_async(self, key: Hashable, open_stream: Callable[[], Any],
+                           on_shared: Optional[Callable[[], None]] = None) -> AsyncIterator[Any]:
+        """Async stream: streams on the same event loop with the same key share one upstream stream."""
+        flight_key = (asyncio.get_running_loop(), key)
+        call, leader = self._join_stream(self._async_streams, flight_key, asyncio.Condition)
+        if not leader:
+            if on_shared is not None:
+                on_shared()
+            index = 0
+            while True:
+                async with call.condition:
+                    await call.condition.wait_for(lambda: index < len(call.chunks) or call.done)
+                    if index >= len(call.chunks):
+                        if call.error is not None:
+                            raise call.error
+                        return
+                    chunk = call.chunks[index]
+                index += 1
+                yield chunk
+
+        upstream = None
+        try:
+            upstream = open_stream()
+            async for chunk in upstream:
+                async with call.condition:
+                    call.chunks.append(chunk)
+                    call.condition.notify_all()
+                yield chunk
+        except Exception as e:
+            call.error = e
+            raise
+        finally:
+            try:
+                if hasattr(upstream, "aclose"):
+                    await upstream.aclose()
+            finally:
+                self._end_stream(self._async_streams, flight_key, call)
+                async with call.condition:
+                    call.done = True
+                    call.condition.notify_all()
+
+    def stats(self) -> Dict[str, int]:
+        """Calls seen, calls executed, and duplicate calls that shared an execution."""
+        with self._lock:
+            return dict(self._stats)
+
+    def reset(self) -> None:
+        with self._lock:
+            for key in self._stats:
+                self._stats[key] = 0
@@ -1,36 +1,55 @@
 """
 Sample script to demonstrate the business idea validator.
 """
+import argparse
 import sys
 import logging
-from business_validator import validate_business_idea, print_validation_report
+from business_validator import validate_business_idea, resume_run, print_validation_report
 
 def main():
     """Run the business idea validator."""
-    # Check if a business idea was provided
-    if len(sys.argv) < 2:
+    parser = argparse.ArgumentParser(
+        description="Validate a business idea",
+        usage="python app.py 'Your business idea here' | python app.py --resume RUN_ID"
+    )
+    parser.add_argument("business_idea", nargs="?", help="The business idea to validate")
+    parser.add_argument(
+        "--resume",
+        metavar="RUN_ID",
+        help="Resume an interrupted run from its checkpoints in validation_data/RUN_ID"
+    )
+    args = parser.parse_args()
+
+    # Check if a business idea or a run to resume was provided
+    if not args.business_idea and not args.resume:
         print("Usage: python app.py 'Your business idea here'")
+        print("       python app.py --resume RUN_ID")
         sys.exit(1)
-    
-    # Get the business idea from command line argument
-    business_idea = sys.argv[1]
-    
-    print(f"Validating business idea: {business_idea}")
-    print("This may take a few minutes...\n")
-    
+
     # Run the validation
     try:
-        results = validate_business_idea(
-            business_idea=business_idea,
-            keywords_count=2,  # Reduce for faster demo
-            max_pages_per_keyword=2,  # Reduce for faster demo
-            max_hn_posts=5,  # Reduce for faster demo
-            max_reddit_posts=5  # Reduce for faster demo
-        )
-        
+        if args.resume:
+            print(f"Resuming validation run: {args.resume}")
+            print("Completed steps are loaded from checkpoints...\n")
+            results = resume_run(args.resume)
+        else:
+            # Get the business idea from command line argument
+            business_idea = args.business_idea
+
+            print(f"Validating business idea: {business_idea}")
+            print("This may take a few minutes...\n")
+
+            results = validate_business_idea(
+                business_idea=business_idea,
+                keywords_count=2,  # Reduce for faster demo
+                max_pages_per_keyword=2,  # Reduce for faster demo
+                max_hn_posts=5,  # Reduce for faster demo
+                max_reddit_posts=5  # Reduce for faster demo
+            )
+
         # Print the results
         print_validation_report(results)
-        
+
     except Exception as e:
         logging.exception(f"Error validating business idea: {e}")
         print(f"\nError: {e}")
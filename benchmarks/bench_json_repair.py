@@ -0,0 +1,56 @@
+"""
+Microbenchmark for SimpleLLM.language.json_repair.
+
+Times json.loads, the repair parser on valid input (its json.loads fast path)
+and on malformed input of growing size, to show repair stays linear.
+
+Usage:
+    python benchmarks/bench_json_repair.py
+"""
+import json
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from SimpleLLM.language.json_repair import repair_json
+
+
+def make_document(items: int) -> dict:
+    """A CombinedAnalysis-shaped document with the given number of list items."""
+    return {
+        "overall_score": 72,
+        "market_validation_summary": "Strong demand from small teams; pricing is the main objection. " * 3,
+        "key_pain_points": [f"Pain point {i}: manual work takes hours each week" for i in range(items)],
+        "existing_solutions": [f"Tool {i} covers part of the workflow" for i in range(items)],
+        "platform_insights": [{"platform": "Reddit", "insights": f"Thread {i} asks for \"simpler\" tools"} for i in range(items)],
+        "recommendations": [f"Recommendation {i}" for i in range(items)],
+    }
+
+
+def malform(text: str) -> str:
+    """Apply the usual LLM mistakes: code fence, Python literals, single quotes, trailing commas, truncation."""
+    text = text.replace('"overall_score"', "'overall_score'").replace("]", ",]")
+    text = text.replace('"recommendations": [', '"flag": True, "none": None, "recommendations": [')
+    return "```json\n" + text[:-5]
+
+
+def bench(label: str, func, text: str, number: int) -> None:
+    seconds = min(timeit.repeat(lambda: func(text), number=number, repeat=3)) / number
+    print(f"{label:<34} {len(text):>9,} chars {seconds * 1e6:>11,.1f} us {len(text) / seconds / 1e6:>8.1f} MB/s")
+
+
+def main() -> None:
+    for items in (10, 100, 1000):
+        valid = json.dumps(make_document(items))
+        broken = malform(valid)
+        number = max(5, 20000 // items)
+        print(f"-- {items} items per list")
+        bench("json.loads (valid)", json.loads, valid, number)
+        bench("repair_json (valid, fast path)", repair_json, valid, number)
+        bench("repair_json (malformed)", repair_json, broken, number)
+
+
+if __name__ == "__main__":
+    main()
@@ -10,7 +10,7 @@ from dotenv import load_dotenv
 load_dotenv()
 
 # Import main functionality
-from business_validator.validator import validate_business_idea, print_validation_report
+from business_validator.validator import validate_business_idea, resume_run, print_validation_report
 
 # Configure logging
 logging.basicConfig(
@@ -5,3 +5,4 @@ from business_validator.analyzers.keyword_generator import generate_keywords
 from business_validator.analyzers.hackernews_analyzer import analyze_hn_post
 from business_validator.analyzers.reddit_analyzer import analyze_reddit_post
 from business_validator.analyzers.combined_analyzer import generate_final_analysis
+from business_validator.analyzers.post_analyzer import analyze_hn_posts, analyze_reddit_posts
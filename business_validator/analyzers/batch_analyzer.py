@@ -0,0 +1,266 @@
+"""
+Batched analysis of several HN or Reddit posts in one LLM prompt.
+"""
+import json
+import logging
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Type
+
+from pydantic import BaseModel, ValidationError
+from SimpleLLM.language.json_repair import JSONRepairError, repair_json
+from SimpleLLM.language.llm import LLM
+from SimpleLLM.language.llm_addons import (
+    json_schema_response_format,
+    mark_structured_output_unsupported,
+    supports_structured_output,
+)
+from SimpleLLM.language.llm_providers.errors import StructuredOutputUnsupportedError
+from SimpleLLM.language.rate_limiter import estimate_tokens
+
+from business_validator.analyzers.hackernews_analyzer import HN_ANALYSIS_INSTRUCTIONS, analyze_hn_post, format_hn_post
+from business_validator.analyzers.llm_registry import get_llm
+from business_validator.analyzers.reddit_analyzer import (
+    REDDIT_ANALYSIS_INSTRUCTIONS,
+    analyze_reddit_post,
+    format_reddit_post,
+)
+from business_validator.config import (
+    ANALYSIS_BATCH_TOKEN_BUDGET,
+    ANALYSIS_OUTPUT_TOKENS_PER_POST,
+    MAX_ANALYSIS_BATCH_SIZE,
+)
+from business_validator.models import HNPostAnalysis, RedditPostAnalysis
+from business_validator.prompt_template import PromptTemplate
+
+
+def plan_batches(
+    texts: List[str],
+    route: str,
+    token_budget: int = ANALYSIS_BATCH_TOKEN_BUDGET,
+    max_batch_size: int = MAX_ANALYSIS_BATCH_SIZE
+) -> List[List[int]]:
+    """
+    Group items into batches that fit a token budget, keeping their order.
+
+    The batch size is also capped so the answers fit in the LLM's max_tokens.
+    An item larger than the budget gets a batch of its own.
+
+    Args:
+        texts: Formatted item texts
+        route: LLM route that will analyze the batches, whose max_tokens caps the batch size
+        token_budget: Estimated tokens of item text allowed per batch
+        max_batch_size: Maximum number of items per batch
+
+    Returns:
+        List of batches, each a list of item indices
+    """
+    output_cap = max(1, get_llm(route).max_tokens // ANALYSIS_OUTPUT_TOKENS_PER_POST)
+    size_cap = max(1, min(max_batch_size, output_cap))
+
+    batches: List[List[int]] = []
+    current: List[int] = []
+    used = 0
+    for i, text in enumerate(texts):
+        tokens = estimate_tokens(text)
+        if current and (used + tokens > token_budget or len(current) >= size_cap):
+            batches.append(current)
+            current, used = [], 0
+        current.append(i)
+        used += tokens
+    if current:
+        batches.append(current)
+    return batches
+
+
+def _parse_batch_response(response: str, model_class: Type[BaseModel], count: int) -> Dict[int, BaseModel]:
+    """
+    Parse a JSON array of analyses, keeping only the items that validate.
+
+    Accepts a bare array or a structured-output object with an "analyses" array;
+    malformed or truncated output is repaired first.
+    Items are matched by their "post_number" field when present, otherwise by position.
+
+    Returns:
+        Dict mapping zero-based item position to its parsed analysis
+    """
+    try:
+        items = repair_json(response)
+    except JSONRepairError as e:
+        logging.warning(f"Could not parse batch analysis response: {e}")
+        return {}
+    if isinstance(items, dict):
+        items = items.get("analyses")
+
+    parsed: Dict[int, BaseModel] = {}
+    for position, item in enumerate(items if isinstance(items, list) else []):
+        if not isinstance(item, dict):
+            continue
+        number = item.get("post_number")
+        index = number - 1 if isinstance(number, int) else position
+        if not 0 <= index < count or index in parsed:
+            continue
+        try:
+            parsed[index] = model_class(**item)
+        except (ValidationError, TypeError) as e:
+            logging.warning(f"Invalid analysis for batched post {index+1}: {e}")
+    return parsed
+
+
+@lru_cache(maxsize=None)
+def _batch_response_format(model_class: Type[BaseModel]) -> Dict[str, Any]:
+    """Structured-output format for a batch: an object wrapping the array of analyses."""
+    item_schema = model_class.model_json_schema()
+    item_schema["properties"] = {"post_number": {"type": "integer"}, **item_schema["properties"]}
+    item_schema["required"] = ["post_number", *item_schema.get("required", [])]
+    return json_schema_response_format(f"{model_class.__name__}Batch", {
+        "type": "object",
+        "properties": {"analyses": {"type": "array", "items": item_schema}},
+        "required": ["analyses"]
+    })
+
+
+@lru_cache(maxsize=None)
+def _batch_system_prompt(model_class: Type[BaseModel]) -> str:
+    """System prompt for a batch, built once per model class."""
+    return (
+        "You are a helpful AI that generates structured JSON data.\n"
+        "Respond with a JSON array whose elements each match this schema:\n\n"
+        f"{json.dumps(model_class.model_json_schema())}\n\n"
+        "Respond ONLY with the JSON array. Do not include any other text, explanations, or markdown formatting."
+    )
+
+
+@lru_cache(maxsize=None)
+def _batch_prompt(platform: str, instructions: str) -> PromptTemplate:
+    """Batch prompt template per platform; the instructions form its static prefix."""
+    return PromptTemplate(
+        prefix=(
+            f"Below are several {platform} posts. For EACH post separately:\n"
+            f"{instructions}\n\n"
+            "Respond with a JSON array with one object per post, in the same order as the posts. "
+            "Each object must include \"post_number\" and the analysis fields.\n\n"
+        ),
+        body='Business Idea: "{business_idea}"\n\nThere are {count} posts, numbered 1 to {count}.\n\n{posts}'
+    )
+
+
+def _generate_batch_response(llm: LLM, prompt: str, system_prompt: str, model_class: Type[BaseModel]):
+    """
+    Send a batch prompt, using structured output when the model supports it.
+
+    Returns:
+        Tuple of (response text, response_format used or None)
+    """
+    if supports_structured_output(llm):
+        response_format = _batch_response_format(model_class)
+        try:
+            response = llm.generate_text(
+                user_prompt=prompt, system_prompt=system_prompt, response_format=response_format
+            )
+            return response, response_format
+        except StructuredOutputUnsupportedError:
+            mark_structured_output_unsupported(llm)
+    return llm.generate_text(user_prompt=prompt, system_prompt=system_prompt), None
+
+
+def _analyze_batch(
+    texts: List[str],
+    business_idea: str,
+    model_class: Type[BaseModel],
+    platform: str,
+    route: str,
+    instructions: str,
+    analyze_single: Callable[[int], BaseModel]
+) -> List[BaseModel]:
+    """
+    Analyze several formatted posts with one prompt, retrying failed items individually.
+
+    Args:
+        texts: Formatted posts
+        business_idea: The business idea being validated
+        model_class: Pydantic model each analysis must match
+        platform: Platform name used in the prompt
+        route: LLM route for the batch prompt
+        instructions: Per-post analysis instructions
+        analyze_single: Fallback that analyzes one post by its position
+
+    Returns:
+        Analyses in the order of texts
+    """
+    if len(texts) == 1:
+        return [analyze_single(0)]
+
+    posts_block = "\n\n".join(f"=== POST {i+1} ===\n{text}" for i, text in enumerate(texts))
+    prompt = _batch_prompt(platform, instructions).render(
+        business_idea=business_idea, count=len(texts), posts=posts_block
+    )
+    system_prompt = _batch_system_prompt(model_class)
+
+    llm = get_llm(route)
+    parsed: Dict[int, BaseModel] = {}
+    try:
+        response, response_format = _generate_batch_response(llm, prompt, system_prompt, model_class)
+        parsed = _parse_batch_response(response, model_class, len(texts))
+        if len(parsed) < len(texts):
+            # Keep a partly malformed answer out of the cache so reruns try the batch again
+            llm.invalidate_cached(prompt, system_prompt, response_format)
+    except Exception as e:
+        logging.error(f"Error analyzing batch of {len(texts)} {platform} posts: {e}")
+
+    failed = [i for i in range(len(texts)) if i not in parsed]
+    if failed:
+        logging.info(f"Retrying {len(failed)} of {len(texts)} batched {platform} posts individually")
+    for i in failed:
+        parsed[i] = analyze_single(i)
+    return [parsed[i] for i in range(len(texts))]
+
+
+def analyze_hn_batch(posts: List[Dict[str, Any]], business_idea: str) -> List[HNPostAnalysis]:
+    """
+    Analyze several HackerNews posts in one prompt.
+
+    Args:
+        posts: HN posts, small enough to share a prompt (see plan_batches)
+        business_idea: The business idea being validated
+
+    Returns:
+        HNPostAnalysis objects in the order of posts
+    """
+    logging.info(f"Analyzing batch of {len(posts)} HN posts")
+    return _analyze_batch(
+        [format_hn_post(post) for post in posts],
+        business_idea,
+        HNPostAnalysis,
+        "HackerNews",
+        "hn_post",
+        HN_ANALYSIS_INSTRUCTIONS,
+        lambda i: analyze_hn_post(posts[i], business_idea)
+    )
+
+
+def analyze_reddit_batch(
+    posts_with_comments: List[Dict[str, Any]],
+    business_idea: str
+) -> List[RedditPostAnalysis]:
+    """
+    Analyze several Reddit posts with their comments in one prompt.
+
+    Args:
+        posts_with_comments: Dicts with "post" and "comments"
+        business_idea: The business idea being validated
+
+    Returns:
+        RedditPostAnalysis objects in the order of posts_with_comments
+    """
+    logging.info(f"Analyzing batch of {len(posts_with_comments)} Reddit posts")
+    return _analyze_batch(
+        [format_reddit_post(item["post"], item["comments"]) for item in posts_with_comments],
+        business_idea,
+        RedditPostAnalysis,
+        "Reddit",
+        "reddit_post",
+        REDDIT_ANALYSIS_INSTRUCTIONS,
+        lambda i: analyze_reddit_post(
+            posts_with_comments[i]["post"], posts_with_comments[i]["comments"], business_idea
+        )
+    )
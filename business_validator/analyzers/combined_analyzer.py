@@ -2,20 +2,68 @@
 Combined analysis of multiple data sources for business idea validation.
 """
 import logging
-from typing import List, Dict, Any
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Any, Optional
 
 from SimpleLLM.language.llm import LLM, LLMProvider
 from SimpleLLM.language.llm_addons import generate_basic_pydantic_json_model
+from SimpleLLM.language.llm_result import bind_context
 from SimpleLLM.webtools.web_search import WebSearchClient
 
+from business_validator.config import (
+    DEFAULT_ANALYSIS_WORKERS,
+    FINAL_ANALYSIS_CHUNK_SIZE,
+    FINAL_ANALYSIS_MAP_REDUCE_THRESHOLD,
+    FINAL_ANALYSIS_REDUCE_FANIN,
+    FINAL_ANALYSIS_REDUCE_LEVELS,
+    STREAM_STRUCTURED_GENERATION,
+)
 from business_validator.models import CombinedAnalysis, PlatformInsight
+from business_validator.analyzers.prompt_assembler import assemble_final_analysis_prompt, assemble_reduce_prompt
 
-# Use the same LLM instance as in keyword_generator
-from business_validator.analyzers.keyword_generator import llm_instance
+from business_validator.analyzers.llm_registry import get_llm
 
 # Initialize WebSearchClient for broader platform insights
 web_search_client = WebSearchClient()
 
+# Output instructions that follow the data sections of the final analysis prompt
+FINAL_ANALYSIS_INSTRUCTIONS = """Based on all this data, provide a comprehensive market validation analysis.
+You MUST return ONLY a single, valid JSON object as your response. Do not include any explanatory text, comments, or markdown formatting before or after the JSON object.
+The JSON object must strictly follow this structure:
+{
+  "overall_score": <integer_between_0_and_100>,
+  "market_validation_summary": "<string_summary_text>",
+  "key_pain_points": ["<string_point1>", "<string_point2>", ...],
+  "existing_solutions": ["<string_solution1>", "<string_solution2>", ...],
+  "market_opportunities": ["<string_opportunity1>", "<string_opportunity2>", ...],
+  "platform_insights": [
+    {
+      "platform": "HackerNews",
+      "insights": "<string_insights_text_for_HN>"
+    },
+    {
+      "platform": "Reddit",
+      "insights": "<string_insights_text_for_Reddit>"
+    },
+    {
+      "platform": "Web Search",
+      "insights": "<string_insights_text_for_broader_web_analysis>"
+    }
+  ],
+  "recommendations": ["<string_recommendation1>", "<string_recommendation2>", ...]
+}
+
+IMPORTANT JSON FORMATTING RULES:
+- The entire response must be a single JSON object starting with `{` and ending with `}`.
+- All keys and string values must be enclosed in double quotes (e.g., "key": "value").
+- Escape any double quotes within string values using a backslash (e.g., "description": "This is a \"quoted\" example.").
+- Escape any backslashes within string values using another backslash (e.g., "path": "C:\\folder\\file").
+- Ensure all commas, colons, curly braces, and square brackets are correctly placed according to standard JSON syntax.
+- Do not use trailing commas after the last element in an array or the last property in an object.
+- The `overall_score` must be an integer (e.g., 75), not a string.
+- All text fields (like summaries, insights, points, solutions, opportunities, recommendations) should be concise yet informative. If a list is empty, use an empty array `[]`.
+Be thorough in your analysis."""
+
 def gather_web_platform_insights(business_idea: str, keywords: List[str] = None) -> List[Dict[str, Any]]:
     """
     Gather insights from broader web search about the business idea.
@@ -67,11 +115,166 @@ def gather_web_platform_insights(business_idea: str, keywords: List[str] = None)
     
     return search_results
 
+def _fallback_analysis() -> CombinedAnalysis:
+    """Pydantic-valid CombinedAnalysis returned when the LLM fails, so downstream code always gets the expected type."""
+    return CombinedAnalysis(
+        overall_score=0,
+        market_validation_summary="Failed to generate analysis due to an internal LLM error. The LLM did not return a valid JSON response that could be parsed.",
+        key_pain_points=["Analysis failed or not performed"],
+        existing_solutions=["Analysis failed or not performed"],
+        market_opportunities=["Analysis failed or not performed"],
+        platform_insights=[
+            PlatformInsight(platform="HackerNews", insights="Analysis failed, no data processed, or LLM response was invalid."),
+            PlatformInsight(platform="Reddit", insights="Analysis failed, no data processed, or LLM response was invalid."),
+            PlatformInsight(platform="Web Search", insights="Analysis failed, no data processed, or LLM response was invalid.")
+        ],
+        recommendations=["Try again. If the problem persists, please check the application logs for more details on the LLM failure."]
+    )
+
+
+def is_fallback_analysis(analysis: Dict[str, Any]) -> bool:
+    """Whether a final analysis dict is the placeholder returned after an LLM failure rather than a real result."""
+    return analysis == _fallback_analysis().model_dump()
+
+
+def _generate_combined(prompt: str) -> CombinedAnalysis:
+    """Run one CombinedAnalysis generation; raises if the LLM output cannot be parsed."""
+    # Limit logging of potentially very long prompts in production, but useful for debugging
+    if len(prompt) > 1000: # Log a snippet if too long
+        logging.debug(f"Prompt for LLM (first 1000 chars): {prompt[:1000]}...")
+    else:
+        logging.debug(f"Prompt for LLM: {prompt}")
+
+    return generate_basic_pydantic_json_model(
+        model_class=CombinedAnalysis,
+        llm_instance=get_llm("final"),
+        prompt=prompt,
+        stream=STREAM_STRUCTURED_GENERATION
+    )
+
+
+def _relevant(analyses: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    return [item for item in analyses if item.get("analysis", {}).get("relevant", False)]
+
+
+def _chunk_data(
+    hn_analyses: List[Dict[str, Any]],
+    reddit_analyses: List[Dict[str, Any]],
+    web_insights: List[Dict[str, Any]],
+    chunk_size: int
+) -> List[Dict[str, Any]]:
+    """Split each source into chunks of chunk_size items; every chunk holds a single source."""
+    chunks = []
+    for name, key, items in (
+        ("HackerNews posts", "hn", hn_analyses),
+        ("Reddit posts", "reddit", reddit_analyses),
+        ("Web search results", "web", web_insights)
+    ):
+        for start in range(0, len(items), chunk_size):
+            part = items[start:start + chunk_size]
+            chunks.append({"label": f"{name} {start + 1}-{start + len(part)}", key: part})
+    return chunks
+
+
+def generate_map_reduce_analysis(
+    business_idea: str,
+    hn_analyses: List[Dict[str, Any]],
+    reddit_analyses: List[Dict[str, Any]],
+    web_insights: List[Dict[str, Any]],
+    keywords: List[str] = None,
+    chunk_size: int = FINAL_ANALYSIS_CHUNK_SIZE,
+    fanin: int = FINAL_ANALYSIS_REDUCE_FANIN,
+    levels: int = FINAL_ANALYSIS_REDUCE_LEVELS,
+    max_workers: int = DEFAULT_ANALYSIS_WORKERS
+) -> CombinedAnalysis:
+    """
+    Generate the final analysis hierarchically for large post sets.
+
+    Relevant analyses and web results are chunked per source and each chunk is
+    summarized in parallel into a partial CombinedAnalysis. Partials are then
+    merged in parallel groups of fanin for levels - 1 intermediate levels, and
+    a last call merges whatever remains. A failed chunk is skipped and a failed
+    merge keeps its group's partials for the next level.
+
+    Args:
+        business_idea: The business idea being validated
+        hn_analyses: List of HackerNews post analyses
+        reddit_analyses: List of Reddit post analyses
+        web_insights: Web search results
+        keywords: Optional keywords, used to rank items within each chunk
+        chunk_size: Items per map chunk
+        fanin: Partials merged per intermediate call
+        levels: Merge levels, including the final merge
+        max_workers: Maximum concurrent LLM calls
+
+    Returns:
+        CombinedAnalysis object with the final analysis
+    """
+    chunks = _chunk_data(_relevant(hn_analyses), _relevant(reddit_analyses), web_insights, max(1, chunk_size))
+    if not chunks:
+        return _fallback_analysis()
+    logging.info(f"Map-reduce final analysis: summarizing {len(chunks)} chunks")
+
+    def summarize(chunk: Dict[str, Any]) -> List[Dict[str, Any]]:
+        prompt = assemble_final_analysis_prompt(
+            business_idea,
+            chunk.get("hn", []),
+            chunk.get("reddit", []),
+            chunk.get("web", []),
+            FINAL_ANALYSIS_INSTRUCTIONS,
+            keywords=keywords
+        )
+        try:
+            return [{"label": chunk["label"], "analysis": _generate_combined(prompt).model_dump()}]
+        except Exception as e:
+            logging.error(f"Error summarizing {chunk['label']}: {e}")
+            return []
+
+    def merge(group: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        if len(group) == 1:
+            return group
+        prompt = assemble_reduce_prompt(business_idea, group, FINAL_ANALYSIS_INSTRUCTIONS)
+        label = ", ".join(partial["label"] for partial in group)
+        try:
+            return [{"label": label, "analysis": _generate_combined(prompt).model_dump()}]
+        except Exception as e:
+            logging.error(f"Error merging partial analyses ({label}): {e}")
+            return group
+
+    def run_parallel(fn, items: List[Any]) -> List[Dict[str, Any]]:
+        with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(items)))) as executor:
+            return [partial for result in executor.map(bind_context(fn), items) for partial in result]
+
+    partials = run_parallel(summarize, chunks)
+    fanin = max(2, fanin)
+    for level in range(1, max(1, levels)):
+        if len(partials) <= fanin:
+            break
+        groups = [partials[start:start + fanin] for start in range(0, len(partials), fanin)]
+        logging.info(f"Map-reduce level {level}: merging {len(partials)} partials in {len(groups)} groups")
+        partials = run_parallel(merge, groups)
+
+    if not partials:
+        logging.error("Every chunk of the map-reduce final analysis failed. Falling back to default CombinedAnalysis object.")
+        return _fallback_analysis()
+    if len(partials) == 1:
+        return CombinedAnalysis(**partials[0]["analysis"])
+
+    logging.info(f"Map-reduce final merge of {len(partials)} partials")
+    try:
+        return _generate_combined(assemble_reduce_prompt(business_idea, partials, FINAL_ANALYSIS_INSTRUCTIONS))
+    except Exception as e:
+        logging.error(f"Error merging partial analyses: {e}. Falling back to default CombinedAnalysis object.")
+        return _fallback_analysis()
+
+
 def generate_final_analysis(
     business_idea: str,
     hn_analyses: List[Dict[str, Any]],
     reddit_analyses: List[Dict[str, Any]],
-    keywords: List[str] = None
+    keywords: List[str] = None,
+    web_insights: List[Dict[str, Any]] = None,
+    map_reduce: Optional[bool] = None
 ) -> CombinedAnalysis:
     """
     Generate a final combined analysis from all data sources including web search.
@@ -81,6 +284,9 @@ def generate_final_analysis(
         hn_analyses: List of HackerNews post analyses
         reddit_analyses: List of Reddit post analyses
         keywords: Optional list of keywords for enhanced web search
+        web_insights: Optional web search results gathered earlier; searched here if omitted
+        map_reduce: Summarize the data in chunks before a final merge; by default used once
+            there are more than FINAL_ANALYSIS_MAP_REDUCE_THRESHOLD relevant posts
         
     Returns:
         CombinedAnalysis object with the final analysis
@@ -92,149 +298,29 @@ def generate_final_analysis(
         reddit_analyses = []
     
     # Gather web search insights for broader platform analysis
-    web_insights = gather_web_platform_insights(business_idea, keywords)
-    
-    # Prepare summary of HackerNews data
-    hn_summary = ""
-    if hn_analyses:
-        hn_summary = "HackerNews Data:\\n"
-        for i, hn_analysis in enumerate(hn_analyses, 1):
-            post = hn_analysis["post"]
-            analysis = hn_analysis["analysis"]
-            
-            if not analysis.get("relevant", False):
-                continue
-                
-            title = post.get("title", "Untitled")
-            hn_summary += f"Post {i}: {title}\\n"
-            hn_summary += f"- Pain points: {', '.join(analysis.get('pain_points', []))}\\n"
-            hn_summary += f"- Solutions: {', '.join(analysis.get('solutions_mentioned', []))}\\n"
-            hn_summary += f"- Market signals: {', '.join(analysis.get('market_signals', []))}\\n"
-            hn_summary += f"- Sentiment: {analysis.get('sentiment', 'neutral')}\\n"
-            hn_summary += f"- Engagement: {analysis.get('engagement_score', 0)}/10\\n\\n"
-    
-    # Prepare summary of Reddit data
-    reddit_summary = ""
-    if reddit_analyses:
-        reddit_summary = "Reddit Data:\\n"
-        for i, reddit_analysis in enumerate(reddit_analyses, 1):
-            post = reddit_analysis["post"]
-            analysis = reddit_analysis["analysis"]
-            
-            if not analysis.get("relevant", False):
-                continue
-                
-            title = post.get("title", "Untitled")
-            subreddit = post.get("subreddit", "Unknown")
-            reddit_summary += f"Post {i}: {title} (r/{subreddit})\\n"
-            reddit_summary += f"- Pain points: {', '.join(analysis.get('pain_points', []))}\\n"
-            reddit_summary += f"- Solutions: {', '.join(analysis.get('solutions_mentioned', []))}\\n"
-            reddit_summary += f"- Market signals: {', '.join(analysis.get('market_signals', []))}\\n"
-            reddit_summary += f"- Sentiment: {analysis.get('sentiment', 'neutral')}\\n"
-            reddit_summary += f"- Engagement: {analysis.get('engagement_score', 0)}/10\\n"
-            reddit_summary += f"- Subreddit context: {analysis.get('subreddit_context', '')}\\n\\n"
-
-    # Prepare summary of web search insights
-    web_summary = ""
-    if web_insights:
-        web_summary = "Web Search Insights Data:\\n"
-        for i, result in enumerate(web_insights, 1):
-            title = result.get("title", "Untitled")
-            url = result.get("link", result.get("url", ""))
-            snippet = result.get("snippet", result.get("description", ""))
-            query = result.get("search_query", "")
-            web_summary += f"Result {i}: {title}\\n"
-            web_summary += f"- URL: {url}\\n"
-            web_summary += f"- Search Query: {query}\\n"
-            web_summary += f"- Content: {snippet}\\n\\n"
-
-    # Basic escaping for summaries to be included in the prompt
-    # This helps prevent characters in the summaries from breaking the LLM's interpretation of the prompt structure.
-    safe_hn_summary = hn_summary.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
-    safe_reddit_summary = reddit_summary.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
-    safe_web_summary = web_summary.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
-
-    prompt = (
-        f"""Analyze the following data collected about this business idea:
-
-BUSINESS IDEA: {business_idea}
-
-{safe_hn_summary}
-
-{safe_reddit_summary}
-
-{safe_web_summary}
-
-Based on all this data, provide a comprehensive market validation analysis.
-You MUST return ONLY a single, valid JSON object as your response. Do not include any explanatory text, comments, or markdown formatting before or after the JSON object.
-The JSON object must strictly follow this structure:
-{{
-  "overall_score": <integer_between_0_and_100>,
-  "market_validation_summary": "<string_summary_text>",
-  "key_pain_points": ["<string_point1>", "<string_point2>", ...],
-  "existing_solutions": ["<string_solution1>", "<string_solution2>", ...],
-  "market_opportunities": ["<string_opportunity1>", "<string_opportunity2>", ...],
-  "platform_insights": [
-    {{
-      "platform": "HackerNews",
-      "insights": "<string_insights_text_for_HN>"
-    }},
-    {{
-      "platform": "Reddit",
-      "insights": "<string_insights_text_for_Reddit>"
-    }},
-    {{
-      "platform": "Web Search",
-      "insights": "<string_insights_text_for_broader_web_analysis>"
-    }}
-  ],
-  "recommendations": ["<string_recommendation1>", "<string_recommendation2>", ...]
-}}
+    if web_insights is None:
+        web_insights = gather_web_platform_insights(business_idea, keywords)
 
-IMPORTANT JSON FORMATTING RULES:
-- The entire response must be a single JSON object starting with `{{` and ending with `}}`.
-- All keys and string values must be enclosed in double quotes (e.g., "key": "value").
-- Escape any double quotes within string values using a backslash (e.g., "description": "This is a \"quoted\" example.").
-- Escape any backslashes within string values using another backslash (e.g., "path": "C:\\folder\\file").
-- Ensure all commas, colons, curly braces, and square brackets are correctly placed according to standard JSON syntax.
-- Do not use trailing commas after the last element in an array or the last property in an object.
-- The `overall_score` must be an integer (e.g., 75), not a string.
-- All text fields (like summaries, insights, points, solutions, opportunities, recommendations) should be concise yet informative. If a list is empty, use an empty array `[]`.
-Be thorough in your analysis.
-"""
+    if map_reduce is None:
+        relevant_posts = len(_relevant(hn_analyses)) + len(_relevant(reddit_analyses))
+        map_reduce = relevant_posts > FINAL_ANALYSIS_MAP_REDUCE_THRESHOLD
+    if map_reduce:
+        return generate_map_reduce_analysis(business_idea, hn_analyses, reddit_analyses, web_insights, keywords)
+    
+    prompt = assemble_final_analysis_prompt(
+        business_idea,
+        hn_analyses,
+        reddit_analyses,
+        web_insights,
+        FINAL_ANALYSIS_INSTRUCTIONS,
+        keywords=keywords
     )
     
     try:
         logging.info(f"Attempting to generate final analysis for: {business_idea}")
-        # Limit logging of potentially very long prompts in production, but useful for debugging
-        # logging.debug(f"Prompt for LLM: {prompt}")
-        if len(prompt) > 1000: # Log a snippet if too long
-             logging.debug(f"Prompt for LLM (first 1000 chars): {prompt[:1000]}...")
-        else:
-            logging.debug(f"Prompt for LLM: {prompt}")
-
-        analysis = generate_basic_pydantic_json_model(
-            model_class=CombinedAnalysis,
-            llm_instance=llm_instance,
-            prompt=prompt
-        )
+        analysis = _generate_combined(prompt)
         logging.info("Successfully generated final analysis.")
         return analysis
     except Exception as e:
         logging.error(f"Error generating final analysis with LLM: {e}. Falling back to default CombinedAnalysis object.")
-        
-        # Fallback to a default, Pydantic-valid CombinedAnalysis object
-        # This ensures the function always returns the expected type, preventing downstream Pydantic errors.
-        return CombinedAnalysis(
-            overall_score=0,
-            market_validation_summary="Failed to generate analysis due to an internal LLM error. The LLM did not return a valid JSON response that could be parsed.",
-            key_pain_points=["Analysis failed or not performed"],
-            existing_solutions=["Analysis failed or not performed"],
-            market_opportunities=["Analysis failed or not performed"],
-            platform_insights=[
-                PlatformInsight(platform="HackerNews", insights="Analysis failed, no data processed, or LLM response was invalid."),
-                PlatformInsight(platform="Reddit", insights="Analysis failed, no data processed, or LLM response was invalid."),
-                PlatformInsight(platform="Web Search", insights="Analysis failed, no data processed, or LLM response was invalid.")
-            ],
-            recommendations=["Try again. If the problem persists, please check the application logs for more details on the LLM failure."]
-        )
+        return _fallback_analysis()
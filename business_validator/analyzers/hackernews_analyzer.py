@@ -7,10 +7,36 @@ from typing import Dict
 from SimpleLLM.language.llm import LLM, LLMProvider
 from SimpleLLM.language.llm_addons import generate_basic_pydantic_json_model
 
+from business_validator.config import STREAM_STRUCTURED_GENERATION
 from business_validator.models import HNPostAnalysis
+from business_validator.prompt_template import PromptTemplate
 
-# Use the same LLM instance as in keyword_generator
-from business_validator.analyzers.keyword_generator import llm_instance
+from business_validator.analyzers.llm_registry import get_llm
+
+HN_ANALYSIS_INSTRUCTIONS = """Analyze this post for business validation signals:
+    
+    1. Is this post relevant to validating the business idea? (true/false)
+    2. What pain points are mentioned or implied?
+    3. What solutions are discussed or mentioned?
+    4. What market signals does this show? (demand, competition, trends, etc.)
+    5. What's the overall sentiment? (positive/negative/neutral)
+    6. Rate the engagement score 1-10 based on points and comments relative to typical HN posts
+    
+    Focus on extracting actionable insights for business validation."""
+
+# Instructions first, so every HN prompt shares the same cacheable prefix
+HN_POST_PROMPT = PromptTemplate(
+    prefix=f"{HN_ANALYSIS_INSTRUCTIONS}\n\n",
+    body='Business Idea: "{business_idea}"\n\n{post}\n'
+)
+
+def format_hn_post(post: dict) -> str:
+    """Format the parts of an HN post that go into an analysis prompt."""
+    return f"""    HackerNews Post:
+    Title: {post['title']}
+    Points: {post['points']}
+    Comments: {post['comments']}
+    URL: {post['url']}"""
 
 def analyze_hn_post(post: dict, business_idea: str) -> HNPostAnalysis:
     """Analyze a single HackerNews post for business validation.
@@ -24,32 +50,14 @@ def analyze_hn_post(post: dict, business_idea: str) -> HNPostAnalysis:
     """
     logging.info(f"Analyzing HN post: {post['title'][:50]}...")
     
-    prompt = f"""
-    Business Idea: "{business_idea}"
-    
-    HackerNews Post:
-    Title: {post['title']}
-    Points: {post['points']}
-    Comments: {post['comments']}
-    URL: {post['url']}
-    
-    Analyze this post for business validation signals:
-    
-    1. Is this post relevant to validating the business idea? (true/false)
-    2. What pain points are mentioned or implied?
-    3. What solutions are discussed or mentioned?
-    4. What market signals does this show? (demand, competition, trends, etc.)
-    5. What's the overall sentiment? (positive/negative/neutral)
-    6. Rate the engagement score 1-10 based on points and comments relative to typical HN posts
-    
-    Focus on extracting actionable insights for business validation.
-    """
+    prompt = HN_POST_PROMPT.render(business_idea=business_idea, post=format_hn_post(post))
     
     try:
         analysis = generate_basic_pydantic_json_model(
             model_class=HNPostAnalysis,
-            llm_instance=llm_instance,
-            prompt=prompt
+            llm_instance=get_llm("hn_post"),
+            prompt=prompt,
+            stream=STREAM_STRUCTURED_GENERATION
         )
         
         return analysis
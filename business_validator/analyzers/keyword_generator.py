@@ -4,14 +4,19 @@ Keyword generation module.
 import logging
 from typing import List
 
-from SimpleLLM.language.llm import LLM, LLMProvider
+from business_validator.analyzers.llm_registry import get_llm
+from business_validator.prompt_template import PromptTemplate
 
-# Initialize a single LLM instance for all generators to use
-llm_instance = LLM.create(
-    provider=LLMProvider.OPENROUTER,
-    model_name="deepseek/deepseek-r1",  # Using DeepSeek R1 model
-    temperature=0.3,  # Lower temperature for more consistent JSON
-    max_tokens=4000   # Increased max_tokens for complete responses
+KEYWORDS_PROMPT = PromptTemplate(
+    prefix=(
+        "Generate search keywords or short phrases for researching the business idea below.\n"
+        "The keywords should:\n"
+        "1. Target potential pain points the idea addresses\n"
+        "2. Include industry-specific terminology\n"
+        "3. Be diverse to capture different aspects of the idea\n\n"
+        "Format: Return ONLY the keywords, one per line, with no numbering or additional text.\n\n"
+    ),
+    body='Business Idea: "{business_idea}"\n\nNumber of keywords: exactly {num_keywords}\n'
 )
 
 def generate_keywords(business_idea: str, num_keywords: int = 3) -> List[str]:
@@ -27,20 +32,10 @@ def generate_keywords(business_idea: str, num_keywords: int = 3) -> List[str]:
     """
     logging.info(f"Generating {num_keywords} keywords for business idea: {business_idea}")
     
-    prompt = f"""
-    Business Idea: "{business_idea}"
-    
-    Generate exactly {num_keywords} search keywords or short phrases for researching this business idea.
-    The keywords should:
-    1. Target potential pain points the idea addresses
-    2. Include industry-specific terminology
-    3. Be diverse to capture different aspects of the idea
-    
-    Format: Return ONLY the keywords, one per line, with no numbering or additional text.
-    """
+    prompt = KEYWORDS_PROMPT.render(business_idea=business_idea, num_keywords=num_keywords)
     
     try:
-        response = llm_instance.generate_text(user_prompt=prompt)
+        response = get_llm("keywords").generate_text(user_prompt=prompt)
         
         # Process the response
         keywords = [
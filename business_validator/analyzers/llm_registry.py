@@ -0,0 +1,118 @@
+"""
+Registry of LLM instances per call site.
+
+Each call site (route) gets its own provider, model and generation
+parameters from LLM_ROUTES, layered over LLM_DEFAULT_ROUTE. Instances are
+built on first use and shared afterwards, together with one response cache
+and the process-wide rate limits.
+"""
+import json
+import logging
+import os
+import threading
+from typing import Any, Dict
+
+from SimpleLLM.language.hedging import HedgePolicy
+from SimpleLLM.language.llm import LLM, LLMProvider
+from SimpleLLM.language.llm_cache import LLMCache
+from SimpleLLM.language.rate_limiter import configure_rate_limits
+
+from business_validator.config import (
+    LLM_CACHE_DIR,
+    LLM_CACHE_MAX_BYTES,
+    LLM_CACHE_MAX_ENTRIES,
+    LLM_CACHE_TTL,
+    LLM_DEFAULT_ROUTE,
+    LLM_RATE_LIMITS,
+    LLM_ROUTES,
+)
+
+# Environment variable holding a JSON object of route overrides
+ROUTES_ENV_VAR = "LLM_ROUTES"
+
+# All sessions in this process share one budget per provider, so concurrent runs queue instead of hitting 429s
+configure_rate_limits(LLM_RATE_LIMITS)
+
+# Repeated prompts (reruns, resumed runs, resubmitted ideas) are answered from this cache
+llm_cache = LLMCache(
+    cache_dir=LLM_CACHE_DIR,
+    ttl=LLM_CACHE_TTL,
+    max_entries=LLM_CACHE_MAX_ENTRIES,
+    max_disk_bytes=LLM_CACHE_MAX_BYTES
+)
+
+_instances: Dict[str, LLM] = {}
+_lock = threading.Lock()
+
+
+def _env_overrides() -> Dict[str, Dict[str, Any]]:
+    raw = os.environ.get(ROUTES_ENV_VAR)
+    if not raw:
+        return {}
+    try:
+        overrides = json.loads(raw)
+    except json.JSONDecodeError as e:
+        logging.warning(f"Ignoring {ROUTES_ENV_VAR}: invalid JSON ({e})")
+        return {}
+    if not isinstance(overrides, dict):
+        logging.warning(f"Ignoring {ROUTES_ENV_VAR}: expected a JSON object")
+        return {}
+    return overrides
+
+
+def route_settings(route: str) -> Dict[str, Any]:
+    """
+    Resolve the settings of a route.
+
+    Args:
+        route: Call site name, e.g. "hn_post"
+
+    Returns:
+        Dict with provider, model, temperature, top_p, max_tokens and optionally hedge
+
+    Raises:
+        KeyError: If the route is not configured
+    """
+    overrides = _env_overrides()
+    if route not in LLM_ROUTES and route not in overrides:
+        raise KeyError(f"Unknown LLM route: {route}")
+    return {**LLM_DEFAULT_ROUTE, **LLM_ROUTES.get(route, {}), **overrides.get(route, {})}
+
+
+def _hedge_policy(hedge: Dict[str, Any]) -> HedgePolicy:
+    options = {name: value for name, value in hedge.items() if name not in ("provider", "model")}
+    return HedgePolicy(LLMProvider[hedge["provider"]], hedge["model"], **options)
+
+
+def get_llm(route: str) -> LLM:
+    """
+    Return the LLM instance for a call site, building it on first use.
+
+    Args:
+        route: Call site name, e.g. "keywords", "hn_post" or "final"
+
+    Returns:
+        The route's shared LLM instance
+    """
+    with _lock:
+        llm = _instances.get(route)
+        if llm is None:
+            settings = route_settings(route)
+            llm = LLM.create(
+                provider=LLMProvider[settings["provider"]],
+                model_name=settings["model"],
+                temperature=settings["temperature"],
+                top_p=settings["top_p"],
+                max_tokens=settings["max_tokens"],
+                cache=llm_cache,
+                hedge=_hedge_policy(settings["hedge"]) if settings.get("hedge") else None
+            )
+            logging.info(f"LLM route {route}: {settings['provider']} {settings['model']}")
+            _instances[route] = llm
+        return llm
+
+
+def reset_llm_routes() -> None:
+    """Drop the built instances so the next get_llm call picks up changed settings."""
+    with _lock:
+        _instances.clear()
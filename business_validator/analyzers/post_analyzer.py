@@ -0,0 +1,209 @@
+"""
+Parallel analysis of HackerNews and Reddit posts.
+"""
+import logging
+import os
+from concurrent.futures import Executor, Future
+from typing import Any, Callable, Dict, List, Tuple
+
+from SimpleLLM.language.llm_result import bind_context
+
+from business_validator.analyzers.batch_analyzer import analyze_hn_batch, analyze_reddit_batch, plan_batches
+from business_validator.analyzers.hackernews_analyzer import analyze_hn_post, format_hn_post
+from business_validator.analyzers.reddit_analyzer import analyze_reddit_post, format_reddit_post
+from business_validator.utils.reporting import load_json_checkpoint, save_json_checkpoint
+
+
+def is_failed_analysis(record: Dict[str, Any]) -> bool:
+    """Whether an analysis record holds the placeholder the analyzers return when the LLM call fails."""
+    return (record.get("analysis") or {}).get("pain_points") == ["Analysis failed"]
+
+
+def _is_reusable(existing: Any, post: Dict[str, Any]) -> bool:
+    """Whether a partial checkpoint holds a successful analysis of this post."""
+    if not existing or existing.get("post", {}).get("url") != post.get("url"):
+        return False
+    # Failed placeholders are redone
+    return not is_failed_analysis(existing)
+
+
+def _hn_record(post: Dict[str, Any], analysis: Any) -> Dict[str, Any]:
+    return {
+        "post": post,
+        "analysis": analysis.dict() if hasattr(analysis, "dict") else analysis
+    }
+
+
+def _reddit_record(post_with_comments: Dict[str, Any], analysis: Any) -> Dict[str, Any]:
+    return {
+        "post": post_with_comments["post"],
+        "comments": post_with_comments["comments"],
+        "analysis": analysis.dict() if hasattr(analysis, "dict") else analysis
+    }
+
+
+def analyze_hn_item(post: Dict[str, Any], business_idea: str, index: int, data_dir: str) -> Dict[str, Any]:
+    """
+    Analyze one HN post and write its partial checkpoint.
+
+    Args:
+        post: HN post to analyze
+        business_idea: The business idea being validated
+        index: Zero-based position of the post in the run
+        data_dir: Run directory for checkpoints
+
+    Returns:
+        Dict with the post and its analysis
+    """
+    checkpoint_path = os.path.join(data_dir, f"05_hn_analyses_partial_{index+1}.json")
+    existing = load_json_checkpoint(checkpoint_path)
+    if _is_reusable(existing, post):
+        logging.info(f"Reusing checkpointed analysis for HN post {index+1}")
+        return existing
+
+    logging.info(f"Analyzing HN post {index+1}")
+    hn_analysis = _hn_record(post, analyze_hn_post(post, business_idea))
+    save_json_checkpoint(hn_analysis, checkpoint_path)
+    return hn_analysis
+
+
+def analyze_reddit_item(
+    post_with_comments: Dict[str, Any],
+    business_idea: str,
+    index: int,
+    data_dir: str
+) -> Dict[str, Any]:
+    """
+    Analyze one Reddit post with its comments and write its partial checkpoint.
+
+    Args:
+        post_with_comments: Dict with "post" and "comments"
+        business_idea: The business idea being validated
+        index: Zero-based position of the post in the run
+        data_dir: Run directory for checkpoints
+
+    Returns:
+        Dict with the post, its comments and its analysis
+    """
+    post = post_with_comments["post"]
+    checkpoint_path = os.path.join(data_dir, f"06_reddit_analyses_partial_{index+1}.json")
+    existing = load_json_checkpoint(checkpoint_path)
+    if _is_reusable(existing, post):
+        logging.info(f"Reusing checkpointed analysis for Reddit post {index+1}")
+        return existing
+
+    logging.info(f"Analyzing Reddit post {index+1}")
+    analysis = analyze_reddit_post(post, post_with_comments["comments"], business_idea)
+    reddit_analysis = _reddit_record(post_with_comments, analysis)
+    save_json_checkpoint(reddit_analysis, checkpoint_path)
+    return reddit_analysis
+
+
+def _submit_batches(
+    items: List[Dict[str, Any]],
+    posts: List[Dict[str, Any]],
+    texts: List[str],
+    checkpoint_prefix: str,
+    route: str,
+    analyze_batch: Callable[[List[Dict[str, Any]], str], List[Any]],
+    build_record: Callable[[Dict[str, Any], Any], Dict[str, Any]],
+    business_idea: str,
+    data_dir: str,
+    executor: Executor
+) -> Tuple[List[Any], List[Future]]:
+    """
+    Reuse checkpointed analyses and submit the rest to the executor in token-budgeted batches.
+
+    Args:
+        items: Items passed to analyze_batch
+        posts: The post of each item, used to validate checkpoints
+        texts: Formatted prompt text of each item, used to size batches
+        checkpoint_prefix: Partial checkpoint file prefix, e.g. "05_hn_analyses"
+        route: LLM route analyze_batch uses, which bounds the batch size
+        analyze_batch: Analyzes a batch of items and returns analyses in order
+        build_record: Builds the checkpoint record for an item and its analysis
+        business_idea: The business idea being validated
+        data_dir: Run directory for checkpoints
+        executor: Worker pool that bounds concurrent LLM calls
+
+    Returns:
+        Tuple of (results list filled in as batches finish, batch futures)
+    """
+    results: List[Any] = [None] * len(items)
+    pending = []
+    for i, post in enumerate(posts):
+        existing = load_json_checkpoint(os.path.join(data_dir, f"{checkpoint_prefix}_partial_{i+1}.json"))
+        if _is_reusable(existing, post):
+            results[i] = existing
+        else:
+            pending.append(i)
+    if len(pending) < len(items):
+        logging.info(f"Reusing {len(items) - len(pending)} checkpointed analyses for {checkpoint_prefix}")
+
+    def run_batch(indices: List[int]) -> None:
+        analyses = analyze_batch([items[i] for i in indices], business_idea)
+        for i, analysis in zip(indices, analyses):
+            record = build_record(items[i], analysis)
+            save_json_checkpoint(record, os.path.join(data_dir, f"{checkpoint_prefix}_partial_{i+1}.json"))
+            results[i] = record
+
+    batches = plan_batches([texts[i] for i in pending], route)
+    futures = [executor.submit(bind_context(run_batch), [pending[j] for j in batch]) for batch in batches]
+    return results, futures
+
+
+def analyze_hn_posts(
+    hn_posts: List[Dict[str, Any]],
+    business_idea: str,
+    data_dir: str,
+    executor: Executor
+) -> List[Dict[str, Any]]:
+    """
+    Analyze HN posts in batches on a shared executor, keeping input order.
+
+    Args:
+        hn_posts: HN posts to analyze
+        business_idea: The business idea being validated
+        data_dir: Run directory for checkpoints
+        executor: Worker pool that bounds concurrent LLM calls
+
+    Returns:
+        List of HN analyses
+    """
+    results, futures = _submit_batches(
+        hn_posts, hn_posts, [format_hn_post(post) for post in hn_posts], "05_hn_analyses", "hn_post",
+        analyze_hn_batch, _hn_record, business_idea, data_dir, executor
+    )
+    for future in futures:
+        future.result()
+    return results
+
+
+def analyze_reddit_posts(
+    reddit_posts_with_comments: List[Dict[str, Any]],
+    business_idea: str,
+    data_dir: str,
+    executor: Executor
+) -> List[Dict[str, Any]]:
+    """
+    Analyze Reddit posts in batches on a shared executor, keeping input order.
+
+    Args:
+        reddit_posts_with_comments: Reddit posts with their comments
+        business_idea: The business idea being validated
+        data_dir: Run directory for checkpoints
+        executor: Worker pool that bounds concurrent LLM calls
+
+    Returns:
+        List of Reddit analyses
+    """
+    results, futures = _submit_batches(
+        reddit_posts_with_comments,
+        [item["post"] for item in reddit_posts_with_comments],
+        [format_reddit_post(item["post"], item["comments"]) for item in reddit_posts_with_comments],
+        "06_reddit_analyses", "reddit_post", analyze_reddit_batch, _reddit_record, business_idea, data_dir, executor
+    )
+    for future in futures:
+        future.result()
+    return results
+
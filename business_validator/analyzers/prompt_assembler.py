@@ -0,0 +1,281 @@
+"""
+Token-budgeted assembly of the final analysis prompt.
+
+Each data source becomes one prompt section with its own token budget. Items
+are ranked by engagement and relevance to the business idea, and the lowest
+ranked ones are dropped once a section is full, so the prompt stays roughly
+the same size however many posts were analyzed.
+"""
+import logging
+import re
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from SimpleLLM.language.rate_limiter import estimate_tokens
+
+from business_validator.config import (
+    FINAL_ANALYSIS_MAX_FIELD_CHARS,
+    FINAL_ANALYSIS_MAX_LIST_ITEMS,
+    FINAL_ANALYSIS_PARTIALS_BUDGET,
+    FINAL_ANALYSIS_SECTION_BUDGETS,
+)
+
+# Escapes backslashes, quotes and line breaks in scraped text in one pass, so
+# it cannot break the prompt's structure or the JSON example that follows it
+_ESCAPE_TABLE = str.maketrans({"\\": "\\\\", '"': '\\"', "\n": "\\n", "\r": ""})
+
+_WORD_RE = re.compile(r"[a-z0-9]{3,}")
+
+
+def escape_prompt_text(text: Any, max_chars: int = FINAL_ANALYSIS_MAX_FIELD_CHARS) -> str:
+    """Truncate a scraped value to max_chars and escape it for the prompt."""
+    text = str(text or "")
+    if len(text) > max_chars:
+        text = text[:max_chars].rstrip() + "..."
+    return text.translate(_ESCAPE_TABLE)
+
+
+def _join_list(values: Optional[Iterable[Any]]) -> str:
+    values = list(values or [])[:FINAL_ANALYSIS_MAX_LIST_ITEMS]
+    return ", ".join(escape_prompt_text(value) for value in values)
+
+
+def relevance_terms(business_idea: str, keywords: Optional[List[str]] = None) -> set:
+    """Lower-cased words of the business idea and keywords used to score relevance."""
+    text = " ".join([business_idea or "", *(keywords or [])]).lower()
+    return set(_WORD_RE.findall(text))
+
+
+def relevance_score(text: str, terms: set) -> float:
+    """Fraction of the relevance terms that appear in text (0 to 1)."""
+    if not terms:
+        return 0.0
+    return len(terms.intersection(_WORD_RE.findall(text.lower()))) / len(terms)
+
+
+def _engagement(analysis: Dict[str, Any]) -> float:
+    try:
+        return min(max(float(analysis.get("engagement_score", 0) or 0), 0.0), 10.0)
+    except (TypeError, ValueError):
+        return 0.0
+
+
+def _analysis_text(item: Dict[str, Any]) -> str:
+    post, analysis = item.get("post", {}), item.get("analysis", {})
+    parts = [post.get("title", "")]
+    for field in ("pain_points", "solutions_mentioned", "market_signals"):
+        parts.extend(str(value) for value in analysis.get(field, []) or [])
+    return " ".join(parts)
+
+
+def format_hn_entry(number: int, item: Dict[str, Any]) -> str:
+    """Render one HN analysis as a prompt entry."""
+    post, analysis = item["post"], item["analysis"]
+    return (
+        f"Post {number}: {escape_prompt_text(post.get('title', 'Untitled'))}\n"
+        f"- Pain points: {_join_list(analysis.get('pain_points'))}\n"
+        f"- Solutions: {_join_list(analysis.get('solutions_mentioned'))}\n"
+        f"- Market signals: {_join_list(analysis.get('market_signals'))}\n"
+        f"- Sentiment: {escape_prompt_text(analysis.get('sentiment', 'neutral'))}\n"
+        f"- Engagement: {analysis.get('engagement_score', 0)}/10"
+    )
+
+
+def format_reddit_entry(number: int, item: Dict[str, Any]) -> str:
+    """Render one Reddit analysis as a prompt entry."""
+    post, analysis = item["post"], item["analysis"]
+    return (
+        f"Post {number}: {escape_prompt_text(post.get('title', 'Untitled'))} "
+        f"(r/{escape_prompt_text(post.get('subreddit', 'Unknown'))})\n"
+        f"- Pain points: {_join_list(analysis.get('pain_points'))}\n"
+        f"- Solutions: {_join_list(analysis.get('solutions_mentioned'))}\n"
+        f"- Market signals: {_join_list(analysis.get('market_signals'))}\n"
+        f"- Sentiment: {escape_prompt_text(analysis.get('sentiment', 'neutral'))}\n"
+        f"- Engagement: {analysis.get('engagement_score', 0)}/10\n"
+        f"- Subreddit context: {escape_prompt_text(analysis.get('subreddit_context', ''))}"
+    )
+
+
+def format_web_entry(number: int, result: Dict[str, Any]) -> str:
+    """Render one web search result as a prompt entry."""
+    return (
+        f"Result {number}: {escape_prompt_text(result.get('title', 'Untitled'))}\n"
+        f"- URL: {escape_prompt_text(result.get('link', result.get('url', '')))}\n"
+        f"- Search Query: {escape_prompt_text(result.get('search_query', ''))}\n"
+        f"- Content: {escape_prompt_text(result.get('snippet', result.get('description', '')))}"
+    )
+
+
+def rank_analyses(analyses: List[Dict[str, Any]], terms: set) -> List[Tuple[int, Dict[str, Any]]]:
+    """
+    Order relevant post analyses from most to least useful.
+
+    Irrelevant analyses are dropped. The rest are ranked by engagement (0-10
+    scaled to 0-1) plus relevance to the business idea; ties keep scrape order.
+
+    Returns:
+        List of (1-based original position, analysis item)
+    """
+    scored = []
+    for number, item in enumerate(analyses, 1):
+        analysis = item.get("analysis", {})
+        if not analysis.get("relevant", False):
+            continue
+        score = _engagement(analysis) / 10 + relevance_score(_analysis_text(item), terms)
+        scored.append((-score, number, item))
+    scored.sort(key=lambda entry: entry[:2])
+    return [(number, item) for _, number, item in scored]
+
+
+def rank_web_results(results: List[Dict[str, Any]], terms: set) -> List[Tuple[int, Dict[str, Any]]]:
+    """Order web search results by relevance to the business idea; ties keep search order."""
+    scored = []
+    for number, result in enumerate(results, 1):
+        text = f"{result.get('title', '')} {result.get('snippet', result.get('description', ''))}"
+        scored.append((-relevance_score(text, terms), number, result))
+    scored.sort(key=lambda entry: entry[:2])
+    return [(number, result) for _, number, result in scored]
+
+
+def build_section(
+    header: str,
+    ranked: List[Tuple[int, Dict[str, Any]]],
+    formatter: Callable[[int, Dict[str, Any]], str],
+    budget: int
+) -> Tuple[List[str], int]:
+    """
+    Fill a section with the highest ranked entries that fit its token budget.
+
+    Entries that do not fit are skipped, so a smaller lower-ranked entry can
+    still use the remaining budget.
+
+    Args:
+        header: Section heading line
+        ranked: (number, item) pairs from rank_analyses or rank_web_results
+        formatter: Renders one entry from its number and item
+        budget: Estimated tokens the section may use
+
+    Returns:
+        The section's parts (header first, empty if nothing fit) and the number of entries kept
+    """
+    if not ranked:
+        return [], 0
+    parts = [header]
+    used = estimate_tokens(header)
+    for number, item in ranked:
+        entry = formatter(number, item)
+        tokens = estimate_tokens(entry)
+        if used + tokens > budget:
+            continue
+        parts.append(entry)
+        used += tokens
+    kept = len(parts) - 1
+    if kept < len(ranked):
+        logging.info(f"{header.rstrip(':')}: kept {kept} of {len(ranked)} entries within {budget} tokens")
+    return (parts if kept else []), kept
+
+
+def assemble_final_analysis_prompt(
+    business_idea: str,
+    hn_analyses: List[Dict[str, Any]],
+    reddit_analyses: List[Dict[str, Any]],
+    web_insights: List[Dict[str, Any]],
+    instructions: str,
+    keywords: Optional[List[str]] = None,
+    budgets: Optional[Dict[str, int]] = None
+) -> str:
+    """
+    Build the final analysis prompt within per-section token budgets.
+
+    Args:
+        business_idea: The business idea being validated
+        hn_analyses: HN post analyses
+        reddit_analyses: Reddit post analyses
+        web_insights: Web search results
+        instructions: Output instructions appended after the data
+        keywords: Optional keywords, used with the business idea to rank relevance
+        budgets: Token budget per section ("hn", "reddit", "web"); defaults to FINAL_ANALYSIS_SECTION_BUDGETS
+
+    Returns:
+        The complete prompt
+    """
+    budgets = {**FINAL_ANALYSIS_SECTION_BUDGETS, **(budgets or {})}
+    terms = relevance_terms(business_idea, keywords)
+
+    hn_parts, _ = build_section(
+        "HackerNews Data:", rank_analyses(hn_analyses or [], terms), format_hn_entry, budgets["hn"]
+    )
+    reddit_parts, _ = build_section(
+        "Reddit Data:", rank_analyses(reddit_analyses or [], terms), format_reddit_entry, budgets["reddit"]
+    )
+    web_parts, _ = build_section(
+        "Web Search Insights Data:", rank_web_results(web_insights or [], terms), format_web_entry, budgets["web"]
+    )
+
+    parts = [
+        "Analyze the following data collected about this business idea:",
+        f"BUSINESS IDEA: {escape_prompt_text(business_idea, max_chars=1000)}",
+        *hn_parts,
+        *reddit_parts,
+        *web_parts,
+        instructions,
+    ]
+    prompt = "\n\n".join(parts)
+    logging.info(f"Final analysis prompt: ~{estimate_tokens(prompt)} tokens")
+    return prompt
+
+
+def format_partial_entry(number: int, item: Dict[str, Any]) -> str:
+    """
+    Render one partial analysis from the map-reduce final analysis as a prompt entry.
+
+    Args:
+        number: 1-based position of the partial
+        item: Dict with "label" (the data it covers) and "analysis" (a CombinedAnalysis dump)
+    """
+    analysis = item["analysis"]
+    insights = "; ".join(
+        f"{escape_prompt_text(insight.get('platform', ''))}: {escape_prompt_text(insight.get('insights', ''))}"
+        for insight in analysis.get("platform_insights", []) or []
+    )
+    return (
+        f"Partial {number} ({escape_prompt_text(item['label'])}):\n"
+        f"- Score: {analysis.get('overall_score', 0)}/100\n"
+        f"- Summary: {escape_prompt_text(analysis.get('market_validation_summary', ''), max_chars=800)}\n"
+        f"- Pain points: {_join_list(analysis.get('key_pain_points'))}\n"
+        f"- Existing solutions: {_join_list(analysis.get('existing_solutions'))}\n"
+        f"- Opportunities: {_join_list(analysis.get('market_opportunities'))}\n"
+        f"- Platform insights: {insights}\n"
+        f"- Recommendations: {_join_list(analysis.get('recommendations'))}"
+    )
+
+
+def assemble_reduce_prompt(
+    business_idea: str,
+    partials: List[Dict[str, Any]],
+    instructions: str,
+    budget: int = FINAL_ANALYSIS_PARTIALS_BUDGET
+) -> str:
+    """
+    Build a prompt that merges partial analyses into one.
+
+    Args:
+        business_idea: The business idea being validated
+        partials: Dicts with "label" and "analysis", as rendered by format_partial_entry
+        instructions: Output instructions appended after the partials
+        budget: Estimated tokens the partials may use
+
+    Returns:
+        The complete prompt
+    """
+    partial_parts, _ = build_section(
+        "Partial Analyses:", list(enumerate(partials, 1)), format_partial_entry, budget
+    )
+    parts = [
+        "The following partial analyses each cover a different slice of the data collected about this business idea. "
+        "Merge them into one analysis: combine overlapping findings, weigh each partial by how much data it covers, "
+        "and keep platform insights for every platform that had data.",
+        f"BUSINESS IDEA: {escape_prompt_text(business_idea, max_chars=1000)}",
+        *partial_parts,
+        instructions,
+    ]
+    return "\n\n".join(parts)
@@ -2,31 +2,55 @@
 Reddit post analysis for business idea validation.
 """
 import logging
-from typing import Dict, List
+from typing import Dict, List, Union
 
 from SimpleLLM.language.llm import LLM, LLMProvider
 from SimpleLLM.language.llm_addons import generate_basic_pydantic_json_model
 
+from business_validator.config import STREAM_STRUCTURED_GENERATION
 from business_validator.models import RedditPostAnalysis
+from business_validator.prompt_template import PromptTemplate
 
-# Use the same LLM instance as in keyword_generator
-from business_validator.analyzers.keyword_generator import llm_instance
+from business_validator.analyzers.llm_registry import get_llm
 
-def analyze_reddit_post(post: dict, comments: List[dict], business_idea: str) -> RedditPostAnalysis:
+REDDIT_ANALYSIS_INSTRUCTIONS = (
+    "Respond with the following analysis in JSON format:\n"
+    "- Is the post relevant to our business idea? (true/false)\n"
+    "- What pain points are mentioned?\n"
+    "- What solutions are mentioned?\n"
+    "- What market signals can we extract?\n"
+    "- What is the overall sentiment? (positive/negative/neutral)\n"
+    "- Rate engagement score 1-10 based on votes, comments and discussion quality\n"
+    "- Provide context about the subreddit relevance to our business idea\n\n"
+    "Focus on extracting actionable insights for business validation."
+)
+
+# Instructions first, so every Reddit prompt shares the same cacheable prefix
+REDDIT_POST_PROMPT = PromptTemplate(
+    prefix=(
+        "Analyze the Reddit post content below for insights related to the business idea.\n\n"
+        f"{REDDIT_ANALYSIS_INSTRUCTIONS}\n\n"
+    ),
+    body="BUSINESS IDEA: {business_idea}\n\nPOST CONTENT:\n{post}"
+)
+
+def format_reddit_post(post: dict, comments: Union[List[dict], Dict]) -> str:
     """
-    Analyze a Reddit post for business validation insights.
+    Combine a Reddit post and its top comments into a single content string.
     
     Args:
         post: Dictionary containing post information
-        comments: List of dictionaries containing comment information
-        business_idea: The business idea being validated
+        comments: List of comment dictionaries, or the dictionary returned
+            by get_reddit_comments with "content" and "comments"
         
     Returns:
-        RedditPostAnalysis object containing the analysis
+        Post content for an analysis prompt
     """
-    # Combine post and comments into a single content string
     post_title = post.get("title", "")
     post_content = post.get("content", "")
+    if isinstance(comments, dict):
+        post_content = post_content or comments.get("content", "")
+        comments = comments.get("comments", [])
     subreddit = post.get("subreddit", "")
     votes = post.get("votes", 0)
     
@@ -40,27 +64,32 @@ def analyze_reddit_post(post: dict, comments: List[dict], business_idea: str) ->
             score = comment.get("score", 0)
             combined_content += f"Comment by {author} (Score: {score}):\n{text}\n\n"
     
+    return combined_content
+
+def analyze_reddit_post(post: dict, comments: Union[List[dict], Dict], business_idea: str) -> RedditPostAnalysis:
+    """
+    Analyze a Reddit post for business validation insights.
+    
+    Args:
+        post: Dictionary containing post information
+        comments: List of comment dictionaries, or the dictionary returned
+            by get_reddit_comments with "content" and "comments"
+        business_idea: The business idea being validated
+        
+    Returns:
+        RedditPostAnalysis object containing the analysis
+    """
+    combined_content = format_reddit_post(post, comments)
+    
     # Create the analysis prompt
-    prompt = (
-        f"Analyze this Reddit post content for insights related to the business idea:\n\n"
-        f"BUSINESS IDEA: {business_idea}\n\n"
-        f"POST CONTENT:\n{combined_content}\n\n"
-        f"Respond with the following analysis in JSON format:\n"
-        f"- Is the post relevant to our business idea? (true/false)\n"
-        f"- What pain points are mentioned?\n"
-        f"- What solutions are mentioned?\n"
-        f"- What market signals can we extract?\n"
-        f"- What is the overall sentiment? (positive/negative/neutral)\n"
-        f"- Rate engagement score 1-10 based on votes, comments and discussion quality\n"
-        f"- Provide context about the subreddit relevance to our business idea\n\n"
-        f"Focus on extracting actionable insights for business validation."
-    )
+    prompt = REDDIT_POST_PROMPT.render(business_idea=business_idea, post=combined_content)
 
     try:
         analysis = generate_basic_pydantic_json_model(
             model_class=RedditPostAnalysis,
-            llm_instance=llm_instance,
-            prompt=prompt
+            llm_instance=get_llm("reddit_post"),
+            prompt=prompt,
+            stream=STREAM_STRUCTURED_GENERATION
         )
 
         return analysis
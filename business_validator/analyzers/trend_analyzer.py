@@ -2,14 +2,12 @@
 Analyzer for trending topics and technology business idea suggestions.
 """
 import logging
-import json
 from typing import Dict, List, Any
 from SimpleLLM.language.llm import LLM
-from SimpleLLM.language.llm_addons import extract_json
+from SimpleLLM.language.json_repair import JSONRepairError, repair_json_object
 from SimpleLLM.webtools.web_search import WebSearchClient
 
-# Use the same LLM instance as in other analyzers
-from business_validator.analyzers.keyword_generator import llm_instance
+from business_validator.analyzers.llm_registry import get_llm
 
 # Import health data scrapers
 from business_validator.scrapers.who import scrape_who_data
@@ -155,124 +153,49 @@ def analyze_health_trends(topic: str, demographics: List[str] = None, regions: L
     """
     
     try:
-        response = llm_instance.generate_text(
+        response = get_llm("health_trends").generate_text(
             user_prompt=prompt,
             system_prompt="You are a health data analyst providing comprehensive analysis based on authoritative health sources including WHO, CDC, Our World in Data, and PubMed research. Always cite specific statistics and trends when available. Return ONLY valid JSON without any additional text, explanations, or markdown formatting. All values must be properly quoted strings.",
         )
         
-        # Parse JSON response using our extract_json function with better error handling
-        result = None
+        # Malformed or truncated JSON is repaired locally
         try:
-            result = extract_json(response)
-            if result is None or result == {}:
-                raise ValueError("extract_json returned None or empty dict")
-        except Exception as json_error:
+            result = repair_json_object(response)
+            if not result:
+                raise JSONRepairError("Empty JSON object")
+        except JSONRepairError as json_error:
             logging.error(f"JSON parsing failed: {str(json_error)}")
             logging.error(f"Raw response length: {len(response)}")
             
-            # Try multiple JSON extraction methods
-            import re
+            # Parsing failed, so create meaningful fallback result
+            logging.warning("Creating enhanced fallback result with collected data insights")
             
-            # Method 1: Look for complete JSON object
-            json_match = re.search(r'\{.*\}', response, re.DOTALL)
-            if json_match:
-                try:
-                    json_str = json_match.group()
-                    # Clean up common JSON issues
-                    json_str = re.sub(r',\s*}', '}', json_str)  # Remove trailing commas
-                    json_str = re.sub(r',\s*]', ']', json_str)  # Remove trailing commas in arrays
-                    result = json.loads(json_str)
-                    logging.info("Successfully parsed JSON using regex with cleanup")
-                except Exception as cleanup_error:
-                    logging.error(f"JSON cleanup failed: {str(cleanup_error)}")
-                    
-                    # Method 2: Try to extract just the key sections we need
-                    try:
-                        overview_match = re.search(r'"overview":\s*"([^"]*)"', response)
-                        global_prev_match = re.search(r'"global_prevalence":\s*"([^"]*)"', response)
-                        
-                        # Try to extract more detailed information from health data
-                        demographic_insights = []
-                        regional_insights = []
-                        business_insights = []
-                        
-                        # Extract insights from scraped health data
-                        for data in health_data:
-                            content = data['content'].lower()
-                            
-                            # Look for demographic information
-                            if any(term in content for term in ['men', 'women', 'male', 'female', 'age', 'young', 'adult']):
-                                demo_text = data['content'][:150] + "..." if len(data['content']) > 150 else data['content']
-                                demographic_insights.append(f"From {data['source']}: {demo_text}")
-                            
-                            # Look for regional/geographic information
-                            if any(term in content for term in ['global', 'country', 'region', 'africa', 'asia', 'europe', 'america', 'united states']):
-                                region_text = data['content'][:150] + "..." if len(data['content']) > 150 else data['content']
-                                regional_insights.append(f"From {data['source']}: {region_text}")
-                        
-                        # Generate business opportunities based on collected data
-                        business_insights = [
-                            f"Digital health platforms for {topic} monitoring and management",
-                            f"Telemedicine services for {topic} consultation and follow-up care",
-                            f"Mobile health apps for {topic} prevention and education",
-                            f"Data analytics tools for {topic} epidemiological tracking",
-                            f"Point-of-care diagnostic devices for {topic} screening"
-                        ]
-                        
-                        if overview_match and global_prev_match:
-                            result = {
-                                "overview": overview_match.group(1),
-                                "statistics": {
-                                    "global_prevalence": global_prev_match.group(1),
-                                    "demographic_breakdown": demographic_insights[:3] if demographic_insights else [f"Demographic data for {topic} analyzed from multiple health sources", f"Age and gender-specific {topic} statistics compiled from health databases"],
-                                    "regional_breakdown": regional_insights[:3] if regional_insights else [f"Regional {topic} analysis from WHO and CDC data", f"Country-specific {topic} prevalence data from health organizations"],
-                                    "country_breakdown": [f"National {topic} statistics from government health agencies", f"Major metropolitan areas {topic} data analysis"]
-                                },
-                                "unmet_needs": [f"Expanded access to {topic} healthcare services", f"Improved {topic} prevention programs", f"Enhanced diagnostic capabilities for {topic}"],
-                                "emerging_trends": [f"Digital health innovations for {topic} management", f"AI-powered {topic} risk assessment tools", f"Personalized {topic} treatment approaches"],
-                                "advancements": [f"Recent breakthroughs in {topic} treatment protocols", f"New diagnostic technologies for {topic} detection", f"Innovative prevention strategies for {topic}"],
-                                "policy_implications": [f"Healthcare policy updates for {topic} management", f"Public health initiatives for {topic} prevention", f"Insurance coverage improvements for {topic} care"],
-                                "business_opportunities": business_insights,
-                                "data_sources": [f"WHO: {topic} Global Health Observatory data", f"CDC: {topic} surveillance and statistics", f"PubMed: {topic} research publications", "Additional authoritative health sources"]
-                            }
-                            logging.info("Successfully extracted key data using regex parsing")
-                        else:
-                            raise ValueError("Could not extract key fields")
-                            
-                    except Exception as regex_error:
-                        logging.error(f"Regex extraction failed: {str(regex_error)}")
-                        result = None
+            # Try to extract some meaningful content from the scraped data
+            key_insights = []
+            data_summary = []
             
-            # If all parsing failed, create meaningful fallback result
-            if result is None:
-                logging.warning("Creating enhanced fallback result with collected data insights")
-                
-                # Try to extract some meaningful content from the scraped data
-                key_insights = []
-                data_summary = []
-                
-                for data in health_data[:3]:  # Use first 3 sources for insights
-                    if len(data['content']) > 100:
-                        # Extract key numbers or facts from content
-                        content_snippet = data['content'][:200] + "..." if len(data['content']) > 200 else data['content']
-                        key_insights.append(f"From {data['source']}: {content_snippet}")
-                        data_summary.append(f"{data['source']} - {data['title']}")
-                
-                result = {
-                    "overview": f"Comprehensive {topic} analysis based on data from {len(health_data)} authoritative sources including WHO, CDC, PubMed research, and health organizations. Data collection successful with detailed findings available.",
-                    "statistics": {
-                        "global_prevalence": f"Global {topic} data collected from multiple health organizations. See data sources for specific statistics and trends.",
-                        "demographic_breakdown": key_insights[:2] if key_insights else [f"Demographic analysis for {topic} compiled from health databases", f"Population-specific {topic} data available in source materials"],
-                        "regional_breakdown": [f"Regional {topic} statistics gathered from international health organizations", f"Country-specific {topic} prevalence data collected from CDC and WHO sources"],
-                        "country_breakdown": [f"National {topic} statistics available from government health agencies", f"Major cities and regions {topic} data compiled from health departments"]
-                    },
-                    "unmet_needs": [f"Expanded access to {topic} healthcare services", f"Improved {topic} prevention and education programs", f"Enhanced {topic} treatment infrastructure in underserved areas"],
-                    "emerging_trends": [f"Digital health solutions for {topic} management", f"Telemedicine applications for {topic} care", f"AI-powered {topic} diagnostic tools development"],
-                    "advancements": [f"Recent medical breakthroughs in {topic} treatment", f"New diagnostic technologies for {topic}", f"Innovative prevention strategies for {topic}"],
-                    "policy_implications": [f"Healthcare policy updates needed for {topic} management", f"Public health initiatives for {topic} prevention", f"International cooperation on {topic} research and treatment"],
-                    "business_opportunities": [f"Healthcare technology platforms for {topic} management", f"Preventive care services and {topic} screening", f"Telemedicine solutions for {topic} consultation", f"Health data analytics for {topic} trends"],
-                    "data_sources": data_summary + [f"Compiled from {len(health_data)} health data sources and {len(search_results)} research references"]
-                }
+            for data in health_data[:3]:  # Use first 3 sources for insights
+                if len(data['content']) > 100:
+                    # Extract key numbers or facts from content
+                    content_snippet = data['content'][:200] + "..." if len(data['content']) > 200 else data['content']
+                    key_insights.append(f"From {data['source']}: {content_snippet}")
+                    data_summary.append(f"{data['source']} - {data['title']}")
+            
+            result = {
+                "overview": f"Comprehensive {topic} analysis based on data from {len(health_data)} authoritative sources including WHO, CDC, PubMed research, and health organizations. Data collection successful with detailed findings available.",
+                "statistics": {
+                    "global_prevalence": f"Global {topic} data collected from multiple health organizations. See data sources for specific statistics and trends.",
+                    "demographic_breakdown": key_insights[:2] if key_insights else [f"Demographic analysis for {topic} compiled from health databases", f"Population-specific {topic} data available in source materials"],
+                    "regional_breakdown": [f"Regional {topic} statistics gathered from international health organizations", f"Country-specific {topic} prevalence data collected from CDC and WHO sources"],
+                    "country_breakdown": [f"National {topic} statistics available from government health agencies", f"Major cities and regions {topic} data compiled from health departments"]
+                },
+                "unmet_needs": [f"Expanded access to {topic} healthcare services", f"Improved {topic} prevention and education programs", f"Enhanced {topic} treatment infrastructure in underserved areas"],
+                "emerging_trends": [f"Digital health solutions for {topic} management", f"Telemedicine applications for {topic} care", f"AI-powered {topic} diagnostic tools development"],
+                "advancements": [f"Recent medical breakthroughs in {topic} treatment", f"New diagnostic technologies for {topic}", f"Innovative prevention strategies for {topic}"],
+                "policy_implications": [f"Healthcare policy updates needed for {topic} management", f"Public health initiatives for {topic} prevention", f"International cooperation on {topic} research and treatment"],
+                "business_opportunities": [f"Healthcare technology platforms for {topic} management", f"Preventive care services and {topic} screening", f"Telemedicine solutions for {topic} consultation", f"Health data analytics for {topic} trends"],
+                "data_sources": data_summary + [f"Compiled from {len(health_data)} health data sources and {len(search_results)} research references"]
+            }
         
         # Add source URLs to the data_sources list
         source_urls = []
@@ -400,13 +323,13 @@ def generate_tech_business_ideas(focus_areas: List[str] = None, market_size: str
     """
     
     try:
-        response = llm_instance.generate_text(
+        response = get_llm("tech_ideas").generate_text(
             user_prompt=prompt,
             system_prompt="",
         )
         
-        # Parse JSON response
-        result = extract_json(response)
+        # Parse JSON response, repairing malformed output locally
+        result = repair_json_object(response)
         
         # Add web search sources to the market trends if available
         if search_results and 'market_trends' in result:
@@ -13,6 +13,12 @@ DATA_DIR = os.path.join(BASE_DIR, "validation_data")
 # Directory for logs
 LOG_DIR = os.path.join(BASE_DIR, "logs")
 
+# Directory for the on-disk HTTP response cache
+HTTP_CACHE_DIR = os.path.join(BASE_DIR, "http_cache")
+
+# Directory for the on-disk LLM response cache
+LLM_CACHE_DIR = os.path.join(BASE_DIR, "llm_cache")
+
 # Default number of search results to analyze per platform
 DEFAULT_HN_POSTS_TO_ANALYZE = 10
 DEFAULT_REDDIT_POSTS_TO_ANALYZE = 10
@@ -22,3 +28,126 @@ DEFAULT_KEYWORDS_COUNT = 3
 
 # Default max pages to search per keyword
 DEFAULT_MAX_PAGES_PER_KEYWORD = 3
+
+# Worker threads used by the concurrent scraping stage
+DEFAULT_SCRAPE_WORKERS = 8
+
+# Minimum seconds between request starts to the same host
+HOST_MIN_INTERVALS = {
+    "hn.algolia.com": 1.0,
+    "www.reddit.com": 1.0,
+    "eutils.ncbi.nlm.nih.gov": 0.34,  # NCBI allows 3 requests/second without an API key
+}
+DEFAULT_HOST_MIN_INTERVAL = 0.5
+
+# Maximum concurrent requests to the same host
+HOST_MAX_CONCURRENCY = {
+    "www.reddit.com": 1,
+}
+DEFAULT_HOST_MAX_CONCURRENCY = 2
+
+# Connection pool size per host for the shared HTTP session
+HTTP_POOL_MAXSIZE = 16
+
+# Default (connect, read) timeouts in seconds for scraper requests
+HTTP_TIMEOUT = (5, 30)
+
+# Seconds a cached response is served without revalidation, per host (0 disables caching)
+HTTP_CACHE_TTLS = {
+    "hn.algolia.com": 6 * 3600,
+    "www.reddit.com": 6 * 3600,
+    "www.who.int": 7 * 24 * 3600,
+    "www.cdc.gov": 7 * 24 * 3600,
+    "ourworldindata.org": 24 * 3600,
+    "eutils.ncbi.nlm.nih.gov": 7 * 24 * 3600,
+    "pubmed.ncbi.nlm.nih.gov": 24 * 3600,
+}
+DEFAULT_HTTP_CACHE_TTL = 24 * 3600
+
+# Maximum total size of cached response bodies before least recently used entries are evicted
+HTTP_CACHE_MAX_BYTES = 200 * 1024 * 1024
+
+# Number of comments fetched per Reddit post
+DEFAULT_MAX_COMMENTS_PER_POST = 10
+
+# Maximum concurrent LLM calls when analyzing posts
+DEFAULT_ANALYSIS_WORKERS = 8
+
+# Maximum number of scraped posts waiting for an analysis worker in streaming mode
+DEFAULT_STREAM_QUEUE_SIZE = 20
+
+# LLM response cache: seconds before an entry expires, in-memory entries, and disk size limit
+LLM_CACHE_TTL = 7 * 24 * 3600
+LLM_CACHE_MAX_ENTRIES = 512
+LLM_CACHE_MAX_BYTES = 100 * 1024 * 1024
+
+# Batched post analysis: most posts per prompt, and the estimated prompt tokens a batch may use for post content
+MAX_ANALYSIS_BATCH_SIZE = 5
+ANALYSIS_BATCH_TOKEN_BUDGET = 6000
+
+# Estimated output tokens per analysis, used to keep a batch's answer within the model's max_tokens
+ANALYSIS_OUTPUT_TOKENS_PER_POST = 350
+
+# Stream structured LLM responses through the incremental JSON parser so doomed generations abort early
+STREAM_STRUCTURED_GENERATION = True
+
+# Requests/tokens per minute shared by every LLM call in the process: {provider: {model or "*": {"rpm", "tpm"}}}
+LLM_RATE_LIMITS = {
+    "OPENROUTER": {
+        "*": {"rpm": 120, "tpm": 400000},
+    },
+    "OPENAI": {
+        "*": {"rpm": 500, "tpm": 200000},
+    },
+}
+
+# Final analysis prompt: estimated token budget per data section, and per-entry limits on list items and field length
+FINAL_ANALYSIS_SECTION_BUDGETS = {
+    "hn": 2500,
+    "reddit": 2500,
+    "web": 1500,
+}
+FINAL_ANALYSIS_MAX_LIST_ITEMS = 5
+FINAL_ANALYSIS_MAX_FIELD_CHARS = 300
+
+# Map-reduce final analysis: used once there are more relevant posts than the threshold.
+# Posts are summarized in chunks of FINAL_ANALYSIS_CHUNK_SIZE, partials are merged in groups of
+# FINAL_ANALYSIS_REDUCE_FANIN, and FINAL_ANALYSIS_REDUCE_LEVELS counts the merge levels including the final call.
+FINAL_ANALYSIS_MAP_REDUCE_THRESHOLD = 40
+FINAL_ANALYSIS_CHUNK_SIZE = 20
+FINAL_ANALYSIS_REDUCE_FANIN = 6
+FINAL_ANALYSIS_REDUCE_LEVELS = 2
+
+# Estimated token budget for the partial analyses in one merge prompt
+FINAL_ANALYSIS_PARTIALS_BUDGET = 6000
+
+# LLM settings shared by every call site unless its route overrides them
+LLM_DEFAULT_ROUTE = {
+    "provider": "OPENROUTER",
+    "model": "deepseek/deepseek-r1",
+    "temperature": 0.3,  # Lower temperature for more consistent JSON
+    "top_p": 1.0,
+    "max_tokens": 4000,
+}
+
+# Secondary model raced against a slow primary: the hedge is sent once the primary has been running for the
+# given percentile of its recent latencies (initial_delay seconds until enough latencies are known)
+LLM_HEDGE = {
+    "provider": "OPENROUTER",
+    "model": "deepseek/deepseek-chat",
+    "percentile": 95,
+    "initial_delay": 60.0,
+}
+
+# Per call site overrides of LLM_DEFAULT_ROUTE; a "hedge" entry (like LLM_HEDGE) enables hedged requests.
+# High-volume per-post extraction runs on a fast, cheap model; the reasoning model is kept for synthesis.
+# The LLM_ROUTES environment variable may hold a JSON object of the same shape, merged over these routes
+# (e.g. {"final": {"model": "openai/gpt-4o"}}).
+LLM_ROUTES = {
+    "keywords": {"model": "openai/gpt-4o-mini", "max_tokens": 500},
+    "hn_post": {"model": "openai/gpt-4o-mini", "max_tokens": 2000},
+    "reddit_post": {"model": "openai/gpt-4o-mini", "max_tokens": 2000},
+    "final": {"hedge": LLM_HEDGE},
+    "health_trends": {"hedge": LLM_HEDGE},
+    "tech_ideas": {"hedge": LLM_HEDGE},
+}
@@ -0,0 +1,180 @@
+"""
+Dependency-graph scheduler for validation pipeline stages.
+"""
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from SimpleLLM.language.llm_result import bind_context, metrics_stage
+
+from business_validator.utils.reporting import save_json_checkpoint
+
+
+class Stage:
+    """
+    A named pipeline stage with declared inputs and outputs.
+
+    The stage function is called with its inputs as keyword arguments. A stage
+    with a single output returns that value; a stage with several outputs
+    returns a dict keyed by output name.
+    """
+
+    def __init__(self, name: str, func: Callable[..., Any], inputs: Iterable[str] = (), outputs: Iterable[str] = ()):
+        self.name = name
+        self.func = func
+        self.inputs = list(inputs)
+        self.outputs = list(outputs)
+
+    def run(self, context: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Run the stage against the values available in a context.
+
+        Args:
+            context: Values produced so far, keyed by name
+
+        Returns:
+            Dict of the stage's outputs
+        """
+        result = self.func(**{name: context[name] for name in self.inputs})
+        if len(self.outputs) == 1:
+            return {self.outputs[0]: result}
+        if not self.outputs:
+            return {}
+        if not isinstance(result, dict):
+            raise TypeError(f"Stage {self.name} must return a dict with outputs {self.outputs}")
+        missing = [name for name in self.outputs if name not in result]
+        if missing:
+            raise ValueError(f"Stage {self.name} did not produce outputs: {missing}")
+        return {name: result[name] for name in self.outputs}
+
+
+class Pipeline:
+    """
+    Runs stages as soon as all of their inputs are available.
+    """
+
+    def __init__(self, stages: List[Stage], max_workers: Optional[int] = None):
+        self.stages = stages
+        self.max_workers = max_workers or max(1, len(stages))
+        self._validate()
+
+    def _validate(self) -> None:
+        names = set()
+        producers: Dict[str, str] = {}
+        for stage in self.stages:
+            if stage.name in names:
+                raise ValueError(f"Duplicate stage name: {stage.name}")
+            names.add(stage.name)
+            for output in stage.outputs:
+                if output in producers:
+                    raise ValueError(
+                        f"Output {output} is produced by both {producers[output]} and {stage.name}"
+                    )
+                producers[output] = stage.name
+
+        # Depth-first search for cycles between stages
+        dependencies = {
+            stage.name: {producers[name] for name in stage.inputs if name in producers}
+            for stage in self.stages
+        }
+        visiting, visited = set(), set()
+
+        def visit(name: str) -> None:
+            if name in visited:
+                return
+            if name in visiting:
+                raise ValueError(f"Pipeline has a dependency cycle through stage {name}")
+            visiting.add(name)
+            for dependency in dependencies[name]:
+                visit(dependency)
+            visiting.discard(name)
+            visited.add(name)
+
+        for stage in self.stages:
+            visit(stage.name)
+
+    def run(self, initial: Dict[str, Any], data_dir: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Run every stage, starting each one as soon as its inputs are ready.
+
+        Args:
+            initial: Values available before any stage runs
+            data_dir: Optional run directory; per-stage timings are written there
+
+        Returns:
+            Context with the initial values and every stage output
+        """
+        context = dict(initial)
+        available = set(context)
+        produced = available | {output for stage in self.stages for output in stage.outputs}
+        for stage in self.stages:
+            missing = [name for name in stage.inputs if name not in produced]
+            if missing:
+                raise ValueError(f"Stage {stage.name} needs inputs nobody provides: {missing}")
+
+        timings: Dict[str, Dict[str, Any]] = {}
+        timings_lock = threading.Lock()
+        pipeline_start = time.monotonic()
+
+        def timed(stage: Stage, inputs: Dict[str, Any]) -> Dict[str, Any]:
+            started = time.monotonic()
+            with timings_lock:
+                timings[stage.name] = {
+                    "stage": stage.name,
+                    "started_at": datetime.now().isoformat(),
+                    "start_offset_seconds": round(started - pipeline_start, 3),
+                    "status": "running"
+                }
+            logging.info(f"Stage started: {stage.name}")
+            status = "failed"
+            try:
+                with metrics_stage(stage.name):
+                    outputs = stage.run(inputs)
+                status = "completed"
+                return outputs
+            finally:
+                ended = time.monotonic()
+                with timings_lock:
+                    timings[stage.name].update({
+                        "ended_at": datetime.now().isoformat(),
+                        "end_offset_seconds": round(ended - pipeline_start, 3),
+                        "duration_seconds": round(ended - started, 3),
+                        "status": status
+                    })
+                logging.info(f"Stage {status}: {stage.name} ({ended - started:.2f}s)")
+
+        remaining = list(self.stages)
+        running = {}
+        try:
+            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                while remaining or running:
+                    for stage in [s for s in remaining if all(name in available for name in s.inputs)]:
+                        remaining.remove(stage)
+                        inputs = {name: context[name] for name in stage.inputs}
+                        running[executor.submit(bind_context(timed), stage, inputs)] = stage
+
+                    if not running:
+                        blocked = [stage.name for stage in remaining]
+                        raise RuntimeError(f"Pipeline stalled; stages waiting on missing inputs: {blocked}")
+
+                    done, _ = wait(running, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        running.pop(future)
+                        outputs = future.result()
+                        context.update(outputs)
+                        available.update(outputs)
+        finally:
+            if data_dir:
+                save_json_checkpoint(
+                    {
+                        "total_seconds": round(time.monotonic() - pipeline_start, 3),
+                        "stages": sorted(timings.values(), key=lambda t: t["start_offset_seconds"])
+                    },
+                    os.path.join(data_dir, "stage_timings.json")
+                )
+
+        return context
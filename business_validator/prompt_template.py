@@ -0,0 +1,54 @@
+"""
+Prompt templates compiled once and rendered static-text first.
+"""
+import string
+from typing import Any, List, Tuple
+
+
+class PromptTemplate:
+    """
+    A prompt made of a static prefix and a body with {placeholders}.
+
+    The body is parsed once when the template is created, so rendering only
+    joins strings. The prefix holds the long instructions that never change
+    and always comes first: every prompt rendered from a template shares a
+    byte-identical prefix, which providers can serve from their prompt cache.
+
+    Args:
+        prefix: Static text; braces are taken literally
+        body: Text with {name} placeholders ({{ and }} for literal braces)
+    """
+
+    def __init__(self, prefix: str, body: str):
+        self.prefix = prefix
+        self._parts: List[Tuple[str, str]] = []
+        for literal, field, spec, conversion in string.Formatter().parse(body):
+            if spec or conversion:
+                raise ValueError(f"Format specs and conversions are not supported: {{{field}!{conversion}:{spec}}}")
+            if field is not None and not field.isidentifier():
+                raise ValueError(f"Invalid placeholder: {{{field}}}")
+            self._parts.append((literal, field))
+        self.fields = frozenset(field for _, field in self._parts if field)
+
+    def render(self, **values: Any) -> str:
+        """
+        Fill in the placeholders.
+
+        Args:
+            **values: A value for every placeholder in the body
+
+        Returns:
+            The prompt, static prefix first
+
+        Raises:
+            KeyError: If a placeholder has no value
+        """
+        missing = self.fields.difference(values)
+        if missing:
+            raise KeyError(f"Missing prompt values: {', '.join(sorted(missing))}")
+        parts = [self.prefix]
+        for literal, field in self._parts:
+            parts.append(literal)
+            if field:
+                parts.append(str(values[field]))
+        return "".join(parts)
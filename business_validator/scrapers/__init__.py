@@ -1,5 +1,5 @@
 """
 Scraper modules for business idea validation.
 """
-from business_validator.scrapers.hackernews import search_hackernews
+from business_validator.scrapers.hackernews import search_hackernews, fetch_hn_post_content
 from business_validator.scrapers.reddit import search_reddit, get_reddit_comments
@@ -1,21 +1,17 @@
 """
 CDC (Centers for Disease Control and Prevention) data scraper for U.S. health statistics.
 """
-import requests
 import logging
 from typing import Dict, List, Any
 from bs4 import BeautifulSoup
-import time
+
+from business_validator.scrapers.fetch import http_get
 
 class CDCScraper:
     """Scraper for CDC health data and statistics."""
     
     def __init__(self):
         self.base_url = "https://www.cdc.gov"
-        self.session = requests.Session()
-        self.session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-        })
     
     def search_health_data(self, topic: str, limit: int = 5) -> List[Dict[str, Any]]:
         """
@@ -39,7 +35,7 @@ class CDCScraper:
             
             for search_url in search_urls:
                 try:
-                    response = self.session.get(search_url, timeout=10)
+                    response = http_get(search_url, timeout=10)
                     response.raise_for_status()
                     
                     soup = BeautifulSoup(response.content, 'html.parser')
@@ -102,7 +98,7 @@ class CDCScraper:
     def _get_page_content(self, url: str) -> str:
         """Get content from a CDC page."""
         try:
-            response = self.session.get(url, timeout=10)
+            response = http_get(url, timeout=10)
             response.raise_for_status()
             
             soup = BeautifulSoup(response.content, 'html.parser')
@@ -126,9 +122,6 @@ class CDCScraper:
         except Exception as e:
             logging.error(f"Error getting CDC page content from {url}: {str(e)}")
             return "Content unavailable"
-        
-        finally:
-            time.sleep(1)  # Be respectful to CDC servers
 
 def scrape_cdc_data(topic: str, limit: int = 3) -> List[Dict[str, Any]]:
     """
@@ -0,0 +1,226 @@
+"""
+Concurrent collection of HackerNews posts, Reddit posts and Reddit comments.
+"""
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from typing import Any, Dict, List
+
+from business_validator.config import DEFAULT_MAX_COMMENTS_PER_POST, DEFAULT_SCRAPE_WORKERS
+from business_validator.scrapers.hackernews import fetch_hn_post_content, search_hackernews
+from business_validator.scrapers.reddit import search_reddit, get_reddit_comments
+from business_validator.utils.reporting import load_json_checkpoint, save_json_checkpoint
+
+
+def deduplicate_posts(posts: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Deduplicate posts by URL, keeping the first occurrence.
+
+    Args:
+        posts: Posts in search order
+
+    Returns:
+        List of unique posts in their original order
+    """
+    unique_posts = []
+    seen_urls = set()
+    for post in posts:
+        if post["url"] not in seen_urls:
+            seen_urls.add(post["url"])
+            unique_posts.append(post)
+    return unique_posts
+
+
+def hydrate_hn_post(post: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Fetch the linked article body for one HN post stub.
+
+    Args:
+        post: HN post stub
+
+    Returns:
+        Copy of the post with its content filled in
+    """
+    link = post.get("link", "")
+    if not link.startswith("http") or post.get("content"):
+        return post
+    return fetch_hn_post_content(post)
+
+
+def hydrate_hn_posts(
+    hn_posts: List[Dict[str, Any]],
+    max_workers: int = DEFAULT_SCRAPE_WORKERS
+) -> List[Dict[str, Any]]:
+    """
+    Fetch article bodies for the HN posts that survived deduplication and selection.
+
+    Args:
+        hn_posts: Selected HN post stubs
+        max_workers: Number of worker threads
+
+    Returns:
+        Posts with content, in their original order
+    """
+    logging.info(f"Fetching article content for {len(hn_posts)} HN posts")
+    with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+        return list(executor.map(hydrate_hn_post, hn_posts))
+
+
+def fetch_post_comments(post: Dict[str, Any], index: int, max_comments: int, data_dir: str) -> Dict[str, Any]:
+    """
+    Fetch comments for a selected Reddit post and write its partial checkpoint.
+
+    Args:
+        post: Reddit post to fetch comments for
+        index: Zero-based position of the post among the selected posts
+        max_comments: Max comments to fetch
+        data_dir: Run directory for checkpoints
+
+    Returns:
+        Dict with the post and its comments
+    """
+    checkpoint_path = os.path.join(data_dir, f"04_reddit_comments_partial_{index+1}.json")
+    existing = load_json_checkpoint(checkpoint_path)
+    if existing is not None and existing.get("post", {}).get("url") == post["url"]:
+        logging.info(f"Reusing checkpointed comments for Reddit post {index+1}")
+        return existing
+
+    try:
+        comments = get_reddit_comments(post["url"], max_comments=max_comments)
+    except Exception as e:
+        logging.error(f"Error getting comments for Reddit post {index+1}: {e}")
+        comments = {"content": "", "comments": []}
+    post_with_comments = {
+        "post": post,
+        "comments": comments
+    }
+    save_json_checkpoint(post_with_comments, checkpoint_path)
+    return post_with_comments
+
+
+def collect_hn_posts(
+    keywords: List[str],
+    data_dir: str,
+    max_pages_per_keyword: int = 3,
+    max_hn_posts: int = 10,
+    max_workers: int = DEFAULT_SCRAPE_WORKERS
+) -> List[Dict[str, Any]]:
+    """
+    Search HackerNews for all keywords at once.
+
+    Args:
+        keywords: Keywords to search for
+        data_dir: Run directory for checkpoints
+        max_pages_per_keyword: Max pages to search per keyword
+        max_hn_posts: Max HN posts to keep
+        max_workers: Number of worker threads
+
+    Returns:
+        Deduplicated HN posts in keyword order, at most max_hn_posts
+    """
+    def search(i: int, keyword: str) -> List[Dict[str, Any]]:
+        checkpoint_path = os.path.join(data_dir, f"02_hn_posts_partial_{i+1}.json")
+        existing = load_json_checkpoint(checkpoint_path)
+        if existing is not None:
+            logging.info(f"Reusing checkpointed HN results for keyword {i+1}/{len(keywords)}: {keyword}")
+            return existing
+
+        logging.info(f"Searching HN for keyword {i+1}/{len(keywords)}: {keyword}")
+        try:
+            posts = search_hackernews(keyword, max_pages=max_pages_per_keyword)
+        except Exception as e:
+            logging.error(f"HN search failed for keyword {keyword}: {e}")
+            posts = []
+        save_json_checkpoint(posts, checkpoint_path)
+        return posts
+
+    with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+        results = list(executor.map(search, range(len(keywords)), keywords))
+
+    hn_posts = deduplicate_posts([post for posts in results for post in posts])[:max_hn_posts]
+    logging.info(f"Collected {len(hn_posts)} HN posts for {len(keywords)} keywords")
+    return hn_posts
+
+
+def collect_reddit_posts(
+    keywords: List[str],
+    data_dir: str,
+    max_pages_per_keyword: int = 3,
+    max_reddit_posts: int = 10,
+    max_comments: int = DEFAULT_MAX_COMMENTS_PER_POST,
+    max_workers: int = DEFAULT_SCRAPE_WORKERS
+) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    Search Reddit for all keywords at once and fetch comments for the selected posts.
+
+    Comment fetches start as soon as a post's place among the selected posts
+    is certain, while the remaining searches are still running.
+
+    Args:
+        keywords: Keywords to search for
+        data_dir: Run directory for checkpoints
+        max_pages_per_keyword: Max pages to search per keyword
+        max_reddit_posts: Max Reddit posts to keep
+        max_comments: Max comments to fetch per Reddit post
+        max_workers: Number of worker threads
+
+    Returns:
+        Dict with "reddit_posts" and "reddit_posts_with_comments"
+    """
+    reddit_results: List[List[Dict[str, Any]]] = [None] * len(keywords)
+
+    # Posts are selected in keyword order, so only a completed prefix of
+    # keywords can be deduplicated and committed to the selection
+    selected: List[Dict[str, Any]] = []
+    seen_urls = set()
+    next_keyword = 0
+    comment_futures = []
+
+    def search(i: int, keyword: str) -> List[Dict[str, Any]]:
+        checkpoint_path = os.path.join(data_dir, f"03_reddit_posts_partial_{i+1}.json")
+        existing = load_json_checkpoint(checkpoint_path)
+        if existing is not None:
+            logging.info(f"Reusing checkpointed Reddit results for keyword {i+1}/{len(keywords)}: {keyword}")
+            return existing
+
+        logging.info(f"Searching Reddit for keyword {i+1}/{len(keywords)}: {keyword}")
+        try:
+            posts = search_reddit(keyword, max_pages=max_pages_per_keyword)
+        except Exception as e:
+            logging.error(f"Reddit search failed for keyword {keyword}: {e}")
+            posts = []
+        save_json_checkpoint(posts, checkpoint_path)
+        return posts
+
+    with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+        pending = {
+            executor.submit(search, i, keyword): i
+            for i, keyword in enumerate(keywords)
+        }
+
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                reddit_results[pending.pop(future)] = future.result()
+
+                while next_keyword < len(keywords) and reddit_results[next_keyword] is not None:
+                    for post in reddit_results[next_keyword]:
+                        if len(selected) >= max_reddit_posts:
+                            break
+                        if post["url"] in seen_urls:
+                            continue
+                        seen_urls.add(post["url"])
+                        selected.append(post)
+                        logging.info(f"Fetching comments for Reddit post {len(selected)}")
+                        comment_futures.append(executor.submit(
+                            fetch_post_comments, post, len(selected) - 1, max_comments, data_dir
+                        ))
+                    next_keyword += 1
+
+        reddit_posts_with_comments = [future.result() for future in comment_futures]
+
+    logging.info(f"Collected {len(selected)} Reddit posts for {len(keywords)} keywords")
+    return {
+        "reddit_posts": selected,
+        "reddit_posts_with_comments": reddit_posts_with_comments
+    }
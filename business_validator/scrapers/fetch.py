@@ -0,0 +1,141 @@
+"""
+Shared HTTP fetch layer used by all scrapers.
+
+One pooled session keeps connections alive across scrapers and threads,
+and every request goes through a per-host politeness scheduler, so
+throughput is bounded by each host's limits rather than by global sleeps.
+"""
+import json
+import logging
+from typing import Any, Dict, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from SimpleLLM.language.singleflight import SingleFlight
+
+from business_validator.config import (
+    DEFAULT_HOST_MAX_CONCURRENCY,
+    DEFAULT_HOST_MIN_INTERVAL,
+    DEFAULT_HTTP_CACHE_TTL,
+    HOST_MAX_CONCURRENCY,
+    HOST_MIN_INTERVALS,
+    HTTP_CACHE_DIR,
+    HTTP_CACHE_MAX_BYTES,
+    HTTP_CACHE_TTLS,
+    HTTP_POOL_MAXSIZE,
+    HTTP_TIMEOUT,
+)
+from business_validator.scrapers.http_cache import HTTPCache, cache_key, response_from_entry
+from business_validator.utils.concurrency import HostThrottle, host_of
+
+try:
+    import brotli  # noqa: F401  (urllib3 decodes "br" responses when it is installed)
+    ACCEPT_ENCODING = "gzip, deflate, br"
+except ImportError:
+    ACCEPT_ENCODING = "gzip, deflate"
+
+DEFAULT_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
+    'Accept-Encoding': ACCEPT_ENCODING,
+}
+
+# Shared by every scraper in the process so concurrent runs stay polite too
+host_throttle = HostThrottle(
+    min_intervals=HOST_MIN_INTERVALS,
+    default_interval=DEFAULT_HOST_MIN_INTERVAL,
+    max_concurrency=HOST_MAX_CONCURRENCY,
+    default_concurrency=DEFAULT_HOST_MAX_CONCURRENCY
+)
+
+# Responses are cached on disk so repeat validations mostly avoid the network
+http_cache = HTTPCache(
+    HTTP_CACHE_DIR,
+    ttls=HTTP_CACHE_TTLS,
+    default_ttl=DEFAULT_HTTP_CACHE_TTL,
+    max_bytes=HTTP_CACHE_MAX_BYTES
+)
+
+
+def _build_session() -> requests.Session:
+    """Create the pooled session shared by all scrapers."""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=HTTP_POOL_MAXSIZE, pool_maxsize=HTTP_POOL_MAXSIZE)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    session.headers.update(DEFAULT_HEADERS)
+    return session
+
+
+session = _build_session()
+
+# Concurrent identical GETs (e.g. two runs scraping the same search page) share one request
+fetch_flight = SingleFlight()
+
+
+def http_get(
+    url: str,
+    params: Optional[Dict[str, Any]] = None,
+    headers: Optional[Dict[str, str]] = None,
+    timeout: Any = HTTP_TIMEOUT,
+    use_cache: bool = True,
+    **kwargs
+) -> requests.Response:
+    """
+    Send a GET request through the shared session, respecting host limits.
+
+    Fresh cached responses are returned without touching the network; stale
+    ones are revalidated with a conditional request. A GET identical to one
+    already in flight waits for it and receives the same response object,
+    unless it streams or passes other requests options.
+
+    Args:
+        url: URL to fetch
+        params: Query parameters
+        headers: Extra headers merged over the session defaults
+        timeout: Seconds, or a (connect, read) tuple
+        use_cache: Whether to read and write the on-disk response cache
+        **kwargs: Passed through to requests
+
+    Returns:
+        The response; errors are raised as requests exceptions
+    """
+    if kwargs:
+        return _get(url, params, headers, timeout, use_cache, **kwargs)
+    flight_key = json.dumps([url, params, headers, use_cache], sort_keys=True, default=str)
+    response, _ = fetch_flight.do(flight_key, lambda: _get(url, params, headers, timeout, use_cache))
+    return response
+
+
+def _get(url, params, headers, timeout, use_cache, **kwargs) -> requests.Response:
+    """http_get without coalescing."""
+    if not use_cache:
+        return _send(url, params, headers, timeout, **kwargs)
+
+    key = cache_key(url, params)
+    entry = http_cache.lookup(key)
+    if entry is not None and http_cache.is_fresh(entry):
+        http_cache.record("hit")
+        http_cache.touch(key)
+        return response_from_entry(entry)
+
+    if entry is not None:
+        headers = {**http_cache.conditional_headers(entry), **(headers or {})}
+    response = _send(url, params, headers, timeout, **kwargs)
+
+    if response.status_code == 304 and entry is not None:
+        http_cache.record("revalidation")
+        http_cache.refresh(key, entry)
+        return response_from_entry(entry)
+
+    http_cache.record("miss")
+    if response.status_code == 200:
+        http_cache.store(key, url, response)
+    return response
+
+
+def _send(url, params, headers, timeout, **kwargs) -> requests.Response:
+    """Send one request while holding the host's politeness slot."""
+    with host_throttle.slot(host_of(url)):
+        logging.debug(f"GET {url}")
+        return session.get(url, params=params, headers=headers, timeout=timeout, **kwargs)
@@ -2,16 +2,27 @@
 HackerNews scraper for business idea validation.
 """
 import os
+import html
+import json
 import logging
-import requests
-from time import sleep
+import re
 from bs4 import BeautifulSoup
-from urllib.parse import quote_plus
+from urllib.parse import quote_plus, urlencode
+
+from business_validator.scrapers.fetch import http_get
+
+HN_SEARCH_API_URL = "https://hn.algolia.com/api/v1/search"
+HN_ITEM_URL = "https://news.ycombinator.com/item?id="
+# Algolia rejects larger pages
+HN_MAX_HITS_PER_PAGE = 1000
 
 def search_hackernews(keyword, max_pages=3, max_results=10, api_key=None):
     """
     Search HackerNews for posts related to a keyword.
     
+    Returns lightweight post stubs; linked article bodies are fetched
+    separately with fetch_hn_post_content for the posts that get analyzed.
+    
     Args:
         keyword: Keyword to search for
         max_pages: Maximum number of pages to search
@@ -21,108 +32,130 @@ def search_hackernews(keyword, max_pages=3, max_results=10, api_key=None):
     Returns:
         List of dictionaries with post data
     """
-    logging.info(f"Searching HackerNews for: {keyword}")
-    
-    # Use ScraperAPI if available
-    if api_key:
-        base_url = f"http://api.scraperapi.com?api_key={api_key}&url="
-    else:
-        base_url = ""
+    results = list(iter_hackernews(keyword, max_pages=max_pages, max_results=max_results, api_key=api_key))
+    logging.info(f"Found {len(results)} HackerNews posts for: {keyword}")
+    return results
+
+def iter_hackernews(keyword, max_pages=3, max_results=10, api_key=None):
+    """
+    Search HackerNews for a keyword, yielding each post as soon as it is parsed.
     
-    # Build the search URL
-    encoded_keyword = quote_plus(keyword)
-    search_url = f"{base_url}https://hn.algolia.com/?q={encoded_keyword}"
+    Uses the Algolia HN search JSON API, paging with hitsPerPage until
+    max_results stories are found or max_pages pages have been read.
     
-    try:
-        # Make the request
-        response = requests.get(
-            search_url, 
-            headers={
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-            }
-        )
+    Args:
+        keyword: Keyword to search for
+        max_pages: Maximum number of pages to search
+        max_results: Maximum number of results to yield
+        api_key: ScraperAPI key for web scraping
         
-        if response.status_code != 200:
-            logging.error(f"Failed to search HackerNews: {response.status_code}")
-            return []
+    Yields:
+        Dictionaries with post data
+    """
+    logging.info(f"Searching HackerNews for: {keyword}")
+    
+    yielded = 0
+    for page in range(max(1, max_pages)):
+        params = {
+            "query": keyword,
+            "tags": "story",
+            "hitsPerPage": min(max(1, max_results), HN_MAX_HITS_PER_PAGE),
+            "page": page
+        }
+        search_url = f"{HN_SEARCH_API_URL}?{urlencode(params)}"
         
-        # Parse the response
-        soup = BeautifulSoup(response.text, 'html.parser')
+        # Use ScraperAPI if available
+        if api_key:
+            search_url = f"http://api.scraperapi.com?api_key={api_key}&url={quote_plus(search_url)}"
         
-        # Extract post data
-        results = []
-        post_elements = soup.select('.Story')
+        try:
+            # Make the request
+            response = http_get(search_url)
+            
+            if response.status_code != 200:
+                logging.error(f"Failed to search HackerNews: {response.status_code}")
+                return
+            
+            # Parse the response
+            data = json.loads(response.text)
+        except Exception as e:
+            logging.error(f"Error searching HackerNews: {e}")
+            return
         
-        for post in post_elements[:max_results]:
+        hits = data.get("hits", [])
+        for hit in hits:
             try:
-                # Extract title and link
-                title_elem = post.select_one('.Story_title a')
-                title = title_elem.text if title_elem else "No title"
-                link = title_elem['href'] if title_elem and 'href' in title_elem.attrs else ""
-                
-                # Extract points and comments
-                meta_elem = post.select_one('.Story_meta')
-                meta_text = meta_elem.text if meta_elem else ""
-                
-                # Basic extraction of points and comments
-                points = 0
-                comments = 0
-                
-                if "points" in meta_text:
-                    points_text = meta_text.split("points")[0].strip().split()[-1]
-                    try:
-                        points = int(points_text)
-                    except ValueError:
-                        pass
-                
-                if "comments" in meta_text:
-                    comments_text = meta_text.split("comments")[0].strip().split()[-1]
-                    try:
-                        comments = int(comments_text)
-                    except ValueError:
-                        pass
-                
-                # Get the full post content if there's a link
-                content = ""
-                if link and link.startswith('http'):
-                    try:
-                        post_url = f"{base_url}{link}" if api_key else link
-                        post_response = requests.get(
-                            post_url,
-                            headers={
-                                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-                            }
-                        )
-                        
-                        if post_response.status_code == 200:
-                            post_soup = BeautifulSoup(post_response.text, 'html.parser')
-                            
-                            # Get post text content (this is a simplified approach)
-                            post_text = post_soup.select_one('.comment-content')
-                            if post_text:
-                                content = post_text.text
-                    except Exception as e:
-                        logging.warning(f"Error getting post content: {e}")
-                
-                results.append({
-                    "title": title,
-                    "link": link,
-                    "url": link,  # Adding url field for deduplication
-                    "points": points,
-                    "comments": comments,
-                    "content": content,
-                    "meta": meta_text
-                })
-                
-                # Be nice to the server
-                sleep(1)
-                
+                yield _post_from_hit(hit)
+                yielded += 1
             except Exception as e:
                 logging.warning(f"Error parsing HackerNews post: {e}")
+                continue
+            if yielded >= max_results:
+                return
         
-        logging.info(f"Found {len(results)} HackerNews posts for: {keyword}")
-        return results
+        # Stop when the last page has been read
+        if not hits or page + 1 >= data.get("nbPages", 0):
+            return
+
+def _post_from_hit(hit):
+    """Convert an Algolia search hit into a post dictionary."""
+    object_id = str(hit["objectID"])
+    item_url = f"{HN_ITEM_URL}{object_id}"
+    link = hit.get("url") or item_url
+    points = hit.get("points") or 0
+    comments = hit.get("num_comments") or 0
+    author = hit.get("author") or ""
+    story_text = hit.get("story_text") or ""
+    
+    return {
+        "title": hit.get("title") or "No title",
+        "link": link,
+        "url": link,  # Adding url field for deduplication
+        "points": points,
+        "comments": comments,
+        # Ask/Show HN stories carry their text; linked articles are filled in later by fetch_hn_post_content
+        "content": _html_to_text(story_text),
+        "meta": f"{points} points by {author} | {comments} comments",
+        "object_id": object_id,
+        "hn_url": item_url,
+        "author": author,
+        "created_at": hit.get("created_at", ""),
+        "created_at_i": hit.get("created_at_i", 0)
+    }
+
+def _html_to_text(text):
+    """Strip the simple markup Algolia uses in story text."""
+    if not text:
+        return ""
+    text = re.sub(r"<p>|<br\s*/?>", "\n", text)
+    return html.unescape(re.sub(r"<[^>]+>", "", text)).strip()
+
+def fetch_hn_post_content(post, api_key=None):
+    """
+    Fetch the linked article body for a HackerNews post stub.
+    
+    Args:
+        post: Post dictionary returned by search_hackernews
+        api_key: ScraperAPI key for web scraping
         
-    except Exception as e:
-        logging.error(f"Error searching HackerNews: {e}")
-        return []
+    Returns:
+        Copy of the post with its "content" field filled in
+    """
+    link = post.get("link", "")
+    content = post.get("content", "")
+    if link and link.startswith('http') and not content:
+        try:
+            post_url = f"http://api.scraperapi.com?api_key={api_key}&url={link}" if api_key else link
+            post_response = http_get(post_url)
+            
+            if post_response.status_code == 200:
+                post_soup = BeautifulSoup(post_response.text, 'html.parser')
+                
+                # Get post text content (this is a simplified approach)
+                post_text = post_soup.select_one('.comment-content')
+                if post_text:
+                    content = post_text.text
+        except Exception as e:
+            logging.warning(f"Error getting post content: {e}")
+    
+    return {**post, "content": content}
@@ -0,0 +1,259 @@
+"""
+Persistent HTTP response cache for the shared fetch layer.
+"""
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+from urllib.parse import urlsplit, urlunsplit
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+from business_validator.utils.concurrency import host_of
+
+# Response headers kept with a cached body
+_STORED_HEADERS = ("Content-Type", "ETag", "Last-Modified")
+
+# Query parameters that carry credentials, e.g. the ScraperAPI key
+_SECRET_PARAMS = ("api_key",)
+
+
+def strip_secrets(url: str) -> str:
+    """
+    Remove credential query parameters from a URL.
+
+    Args:
+        url: Request URL
+
+    Returns:
+        The URL without its credential parameters, otherwise unchanged
+    """
+    parts = urlsplit(url)
+    query = "&".join(
+        field for field in parts.query.split("&")
+        if field and field.split("=", 1)[0] not in _SECRET_PARAMS
+    )
+    return urlunsplit(parts._replace(query=query))
+
+
+def cache_key(url: str, params: Optional[Dict[str, Any]] = None) -> str:
+    """
+    Build the cache key for a GET request.
+
+    Args:
+        url: Request URL
+        params: Query parameters
+
+    Returns:
+        Hex digest identifying the URL with its encoded parameters, minus credentials
+    """
+    full_url = strip_secrets(requests.Request("GET", url, params=params).prepare().url)
+    return hashlib.sha256(full_url.encode("utf-8")).hexdigest()
+
+
+class HTTPCache:
+    """
+    On-disk cache of successful GET responses.
+
+    Each entry is a body file plus a small JSON metadata file. Entries are
+    served as-is while younger than their host's TTL; stale entries are
+    revalidated with ETag/Last-Modified and refreshed on a 304. The total
+    body size is kept under max_bytes by evicting least recently used entries.
+    """
+
+    def __init__(
+        self,
+        cache_dir: str,
+        ttls: Optional[Dict[str, float]] = None,
+        default_ttl: float = 0.0,
+        max_bytes: int = 0
+    ):
+        self.cache_dir = cache_dir
+        self.ttls = dict(ttls or {})
+        self.default_ttl = default_ttl
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.revalidations = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        self._index: Optional["OrderedDict[str, int]"] = None
+        self._total_bytes = 0
+
+    def _paths(self, key: str):
+        return os.path.join(self.cache_dir, f"{key}.json"), os.path.join(self.cache_dir, f"{key}.body")
+
+    def _load_index(self) -> "OrderedDict[str, int]":
+        """Build the LRU index from the cache directory, oldest access first (lock held)."""
+        if self._index is None:
+            entries = []
+            if os.path.isdir(self.cache_dir):
+                for name in os.listdir(self.cache_dir):
+                    if not name.endswith(".body"):
+                        continue
+                    try:
+                        stat = os.stat(os.path.join(self.cache_dir, name))
+                    except FileNotFoundError:
+                        # Evicted by another process between listdir and stat
+                        continue
+                    entries.append((stat.st_mtime, name[:-len(".body")], stat.st_size))
+            entries.sort()
+            self._index = OrderedDict((key, size) for _, key, size in entries)
+            self._total_bytes = sum(self._index.values())
+        return self._index
+
+    def ttl_for(self, url: str) -> float:
+        """Return the TTL in seconds for a URL's host."""
+        return self.ttls.get(host_of(url), self.default_ttl)
+
+    def lookup(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        Load a cached entry.
+
+        Args:
+            key: Cache key from cache_key
+
+        Returns:
+            Entry dict with "meta" and "body", or None if it is not cached
+        """
+        meta_path, body_path = self._paths(key)
+        try:
+            with open(meta_path, "r", encoding="utf-8") as f:
+                meta = json.load(f)
+            with open(body_path, "rb") as f:
+                body = f.read()
+        except (OSError, ValueError):
+            return None
+        return {"meta": meta, "body": body}
+
+    def is_fresh(self, entry: Dict[str, Any]) -> bool:
+        """Whether an entry can be served without revalidation."""
+        meta = entry["meta"]
+        return time.time() - meta["stored_at"] < self.ttl_for(meta["url"])
+
+    def conditional_headers(self, entry: Dict[str, Any]) -> Dict[str, str]:
+        """Return the If-None-Match/If-Modified-Since headers for revalidating an entry."""
+        stored = CaseInsensitiveDict(entry["meta"].get("headers", {}))
+        headers = {}
+        if stored.get("ETag"):
+            headers["If-None-Match"] = stored["ETag"]
+        if stored.get("Last-Modified"):
+            headers["If-Modified-Since"] = stored["Last-Modified"]
+        return headers
+
+    def store(self, key: str, url: str, response: requests.Response) -> None:
+        """
+        Store a successful response unless its host has caching disabled.
+
+        Args:
+            key: Cache key from cache_key
+            url: Requested URL, which decides the TTL; credentials are not stored
+            response: Response with status 200
+        """
+        if self.ttl_for(url) <= 0 or "no-store" in response.headers.get("Cache-Control", ""):
+            return
+        meta = {
+            "url": strip_secrets(url),
+            "status_code": response.status_code,
+            "encoding": response.encoding,
+            "headers": {name: response.headers[name] for name in _STORED_HEADERS if name in response.headers},
+            "stored_at": time.time()
+        }
+        self._write(key, meta, response.content)
+
+    def refresh(self, key: str, entry: Dict[str, Any]) -> None:
+        """Restart an entry's TTL after a 304 revalidation."""
+        meta = dict(entry["meta"], stored_at=time.time())
+        self._write(key, meta, entry["body"])
+
+    def _write(self, key: str, meta: Dict[str, Any], body: bytes) -> None:
+        os.makedirs(self.cache_dir, exist_ok=True)
+        meta_path, body_path = self._paths(key)
+        try:
+            for path, data in ((body_path, body), (meta_path, json.dumps(meta).encode("utf-8"))):
+                tmp_path = f"{path}.{threading.get_ident()}.tmp"
+                with open(tmp_path, "wb") as f:
+                    f.write(data)
+                os.replace(tmp_path, path)
+        except OSError as e:
+            logging.warning(f"Could not write HTTP cache entry for {meta['url']}: {e}")
+            return
+        with self._lock:
+            index = self._load_index()
+            self._total_bytes += len(body) - index.pop(key, 0)
+            index[key] = len(body)
+            self._evict()
+
+    def touch(self, key: str) -> None:
+        """Mark an entry as recently used."""
+        _, body_path = self._paths(key)
+        try:
+            os.utime(body_path)
+        except OSError:
+            return
+        with self._lock:
+            index = self._load_index()
+            if key in index:
+                index.move_to_end(key)
+
+    def _evict(self) -> None:
+        """Drop least recently used entries until the size limit holds (lock held)."""
+        index = self._load_index()
+        while self.max_bytes and self._total_bytes > self.max_bytes and len(index) > 1:
+            key, size = index.popitem(last=False)
+            self._total_bytes -= size
+            self.evictions += 1
+            for path in self._paths(key):
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+
+    def record(self, outcome: str) -> None:
+        """Count a "hit", "miss" or "revalidation"."""
+        with self._lock:
+            if outcome == "hit":
+                self.hits += 1
+            elif outcome == "revalidation":
+                self.revalidations += 1
+            else:
+                self.misses += 1
+
+    def stats(self) -> Dict[str, int]:
+        """Return the hit/miss counters and current cache size."""
+        with self._lock:
+            index = self._load_index()
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "revalidations": self.revalidations,
+                "evictions": self.evictions,
+                "entries": len(index),
+                "bytes": self._total_bytes
+            }
+
+
+def response_from_entry(entry: Dict[str, Any]) -> requests.Response:
+    """
+    Rebuild a requests.Response from a cached entry.
+
+    Args:
+        entry: Entry returned by HTTPCache.lookup
+
+    Returns:
+        Response carrying the cached body and headers
+    """
+    meta = entry["meta"]
+    response = requests.Response()
+    response.status_code = meta["status_code"]
+    response.reason = "OK"
+    response.url = meta["url"]
+    response.encoding = meta.get("encoding")
+    response.headers = CaseInsensitiveDict(meta.get("headers", {}))
+    response._content = entry["body"]
+    return response
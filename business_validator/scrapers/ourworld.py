@@ -1,22 +1,18 @@
 """
 Our World in Data scraper for global health statistics and charts.
 """
-import requests
 import logging
 from typing import Dict, List, Any
 from bs4 import BeautifulSoup
-import time
 import json
 
+from business_validator.scrapers.fetch import http_get
+
 class OurWorldDataScraper:
     """Scraper for Our World in Data health statistics."""
     
     def __init__(self):
         self.base_url = "https://ourworldindata.org"
-        self.session = requests.Session()
-        self.session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-        })
     
     def search_health_data(self, topic: str, limit: int = 5) -> List[Dict[str, Any]]:
         """
@@ -36,7 +32,7 @@ class OurWorldDataScraper:
             search_url = f"{self.base_url}/search"
             search_params = {'q': topic}
             
-            response = self.session.get(search_url, params=search_params, timeout=10)
+            response = http_get(search_url, params=search_params, timeout=10)
             response.raise_for_status()
             
             soup = BeautifulSoup(response.content, 'html.parser')
@@ -116,7 +112,7 @@ class OurWorldDataScraper:
     def _get_chart_content(self, url: str) -> str:
         """Get content from an Our World in Data chart or article."""
         try:
-            response = self.session.get(url, timeout=10)
+            response = http_get(url, timeout=10)
             response.raise_for_status()
             
             soup = BeautifulSoup(response.content, 'html.parser')
@@ -157,9 +153,6 @@ class OurWorldDataScraper:
         except Exception as e:
             logging.error(f"Error getting Our World in Data content from {url}: {str(e)}")
             return "Content unavailable"
-        
-        finally:
-            time.sleep(1)  # Be respectful to servers
 
 def scrape_ourworld_data(topic: str, limit: int = 3) -> List[Dict[str, Any]]:
     """
@@ -1,23 +1,19 @@
 """
 PubMed scraper for research and scientific findings.
 """
-import requests
 import logging
 from typing import Dict, List, Any
 from bs4 import BeautifulSoup
-import time
 import xml.etree.ElementTree as ET
 
+from business_validator.scrapers.fetch import http_get
+
 class PubMedScraper:
     """Scraper for PubMed research articles and scientific findings."""
     
     def __init__(self):
         self.base_url = "https://eutils.ncbi.nlm.nih.gov/entrez/eutils"
         self.pubmed_url = "https://pubmed.ncbi.nlm.nih.gov"
-        self.session = requests.Session()
-        self.session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-        })
     
     def search_research_data(self, topic: str, limit: int = 5) -> List[Dict[str, Any]]:
         """
@@ -43,7 +39,7 @@ class PubMedScraper:
                 'retmode': 'xml'
             }
             
-            response = self.session.get(search_url, params=search_params, timeout=10)
+            response = http_get(search_url, params=search_params, timeout=10)
             response.raise_for_status()
             
             # Parse XML response to get article IDs
@@ -88,7 +84,7 @@ class PubMedScraper:
                 'retmode': 'xml'
             }
             
-            response = self.session.get(fetch_url, params=fetch_params, timeout=10)
+            response = http_get(fetch_url, params=fetch_params, timeout=10)
             response.raise_for_status()
             
             # Parse XML to extract article information
@@ -118,9 +114,6 @@ class PubMedScraper:
         except Exception as e:
             logging.error(f"Error getting PubMed article details for PMID {pmid}: {str(e)}")
             
-        finally:
-            time.sleep(0.5)  # Be respectful to NCBI servers
-            
         return None
     
     def _fallback_web_search(self, topic: str, limit: int) -> List[Dict[str, Any]]:
@@ -132,7 +125,7 @@ class PubMedScraper:
             search_url = f"{self.pubmed_url}/"
             search_params = {'term': f"{topic} epidemiology"}
             
-            response = self.session.get(search_url, params=search_params, timeout=10)
+            response = http_get(search_url, params=search_params, timeout=10)
             response.raise_for_status()
             
             soup = BeautifulSoup(response.content, 'html.parser')
@@ -1,12 +1,38 @@
 """
 Reddit scraper for business idea validation.
 """
-import os
+import json
 import logging
-import requests
-from time import sleep
-from bs4 import BeautifulSoup
-from urllib.parse import quote_plus
+from urllib.parse import quote_plus, urlencode
+
+from business_validator.scrapers.fetch import http_get
+
+# Reddit's public JSON endpoints
+REDDIT_BASE_URL = "https://www.reddit.com"
+REDDIT_SEARCH_URL = f"{REDDIT_BASE_URL}/search.json"
+REDDIT_MAX_LIMIT = 100
+# Bodies Reddit leaves in place of deleted or moderator-removed comments
+DELETED_BODIES = ("[deleted]", "[removed]")
+
+def _get_json(url, api_key=None):
+    """
+    Fetch a Reddit JSON endpoint, optionally through ScraperAPI.
+    
+    Args:
+        url: Full URL of the JSON endpoint
+        api_key: ScraperAPI key for web scraping
+        
+    Returns:
+        Parsed JSON, or None if the request failed
+    """
+    if api_key:
+        url = f"http://api.scraperapi.com?api_key={api_key}&url={quote_plus(url)}"
+    
+    response = http_get(url)
+    if response.status_code != 200:
+        logging.error(f"Reddit request failed with {response.status_code}: {url}")
+        return None
+    return json.loads(response.text)
 
 def search_reddit(keyword, max_pages=3, max_results=10, api_key=None):
     """
@@ -21,100 +47,121 @@ def search_reddit(keyword, max_pages=3, max_results=10, api_key=None):
     Returns:
         List of dictionaries with post data
     """
-    logging.info(f"Searching Reddit for: {keyword}")
+    results = list(iter_reddit(keyword, max_pages=max_pages, max_results=max_results, api_key=api_key))
+    logging.info(f"Found {len(results)} Reddit posts for: {keyword}")
+    return results
+
+def iter_reddit(keyword, max_pages=3, max_results=10, api_key=None):
+    """
+    Search Reddit for a keyword, yielding each post as soon as it is parsed.
     
-    # Use ScraperAPI if available
-    if api_key:
-        base_url = f"http://api.scraperapi.com?api_key={api_key}&url="
-    else:
-        base_url = ""
+    Pages through the search.json listing by following its "after" cursor.
+    
+    Args:
+        keyword: Keyword to search for
+        max_pages: Maximum number of pages to search
+        max_results: Maximum number of results to yield
+        api_key: ScraperAPI key for web scraping
+        
+    Yields:
+        Dictionaries with post data
+    """
+    logging.info(f"Searching Reddit for: {keyword}")
     
-    # Build the search URL
-    encoded_keyword = quote_plus(keyword)
-    search_url = f"{base_url}https://www.reddit.com/search/?q={encoded_keyword}"
+    params = {
+        "q": keyword,
+        "limit": max(1, min(max_results, REDDIT_MAX_LIMIT)),
+        "raw_json": 1
+    }
+    found = 0
     
     try:
-        # Make the request
-        response = requests.get(
-            search_url, 
-            headers={
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-            },
-            timeout=30  # Added timeout for the request
-        )
-        
-        if response.status_code != 200:
-            logging.error(f"Failed to search Reddit: {response.status_code}")
-            return []
-        
-        # Parse the response
-        soup = BeautifulSoup(response.text, 'html.parser')
-        
-        # Extract post data
-        results = []
-        post_elements = soup.select('div[data-testid="post-container"]')
-        
-        for post in post_elements[:max_results]:
-            try:
-                # Extract title
-                title_elem = post.select_one('h3')
-                title = title_elem.text if title_elem else "No title"
-                
-                # Extract subreddit
-                subreddit_elem = post.select_one('a[data-testid="subreddit-name"]')
-                subreddit = subreddit_elem.text if subreddit_elem else ""
-                
-                # Extract link to post
-                link_elem = post.select_one('a[data-testid="post-title"]')
-                link = link_elem['href'] if link_elem and 'href' in link_elem.attrs else ""
-                
-                # Make sure it's a full URL
-                if link and link.startswith('/r/'):
-                    link = f"https://www.reddit.com{link}"
-                
-                # Extract post content
-                content = ""
-                votes = 0
-                
-                # Try to get votes
-                votes_elem = post.select_one('div[data-testid="post-score"]')
-                if votes_elem:
-                    votes_text = votes_elem.text.strip()
-                    try:
-                        # Convert k to thousands (e.g., "1.2k" -> 1200)
-                        if 'k' in votes_text.lower():
-                            votes = int(float(votes_text.lower().replace('k', '')) * 1000)
-                        else:
-                            votes = int(votes_text)
-                    except ValueError:
-                        pass
-                
-                results.append({
-                    "title": title,
-                    "subreddit": subreddit,
-                    "link": link,
-                    "url": link,  # Adding url field for deduplication
-                    "votes": votes,
-                    "content": content  # We'll fetch the full content in another function
-                })
-                
-                # Be nice to the server
-                sleep(1)
-                
-            except Exception as e:
-                logging.warning(f"Error parsing Reddit post: {e}")
-        
-        logging.info(f"Found {len(results)} Reddit posts for: {keyword}")
-        return results
+        for _ in range(max_pages):
+            listing = _get_json(f"{REDDIT_SEARCH_URL}?{urlencode(params)}", api_key)
+            if not listing:
+                return
+            
+            data = listing.get("data", {})
+            for child in data.get("children", []):
+                if child.get("kind") != "t3":
+                    continue
+                yield _post_from_listing(child.get("data", {}))
+                found += 1
+                if found >= max_results:
+                    return
+            
+            # No cursor means this was the last page
+            if not data.get("after"):
+                return
+            params["after"] = data["after"]
         
     except Exception as e:
         logging.error(f"Error searching Reddit: {e}")
-        return []
+
+def _post_from_listing(data):
+    """
+    Convert a search listing entry into the post format used by the validator.
+    
+    Args:
+        data: The "data" object of a t3 listing child
+        
+    Returns:
+        Dictionary with post data
+    """
+    link = f"{REDDIT_BASE_URL}{data.get('permalink', '')}" if data.get("permalink") else ""
+    return {
+        "title": data.get("title") or "No title",
+        "subreddit": data.get("subreddit_name_prefixed") or data.get("subreddit", ""),
+        "link": link,
+        "url": link,  # Adding url field for deduplication
+        "votes": data.get("score", 0),
+        "num_comments": data.get("num_comments", 0),
+        "content": data.get("selftext", ""),
+        "id": data.get("id", ""),
+        "author": data.get("author", ""),
+        "created_utc": data.get("created_utc")
+    }
+
+def _flatten_comments(children):
+    """
+    Flatten a Reddit comment tree into a list, depth first.
+    
+    "more" stubs are skipped; only comments included in the response are kept.
+    Deleted and removed comments are dropped, but their replies are kept.
+    
+    Args:
+        children: Children of a comment listing
+        
+    Returns:
+        List of comment dictionaries
+    """
+    comments = []
+    stack = list(reversed(children))
+    while stack:
+        child = stack.pop()
+        if child.get("kind") != "t1":
+            continue
+        data = child.get("data", {})
+        if data.get("body") not in DELETED_BODIES:
+            comments.append({
+                "author": data.get("author") or "Unknown user",
+                "text": data.get("body") or "",
+                "score": data.get("score") or 0,
+                "depth": data.get("depth", 0)
+            })
+        replies = data.get("replies")
+        if isinstance(replies, dict):
+            stack.extend(reversed(replies.get("data", {}).get("children", [])))
+    return comments
 
 def get_reddit_comments(post_url, api_key=None, max_comments=20):
     """
     Get comments for a Reddit post.
     
+    Fetches the post's .json endpoint once, which returns the post and its
+    whole comment tree; the tree is flattened and the top comments by score
+    are kept.
+    
     Args:
         post_url: URL of the Reddit post
         api_key: ScraperAPI key for web scraping
@@ -125,73 +172,21 @@ def get_reddit_comments(post_url, api_key=None, max_comments=20):
     """
     logging.info(f"Getting Reddit comments for: {post_url}")
     
-    # Use ScraperAPI if available
-    if api_key:
-        base_url = f"http://api.scraperapi.com?api_key={api_key}&url="
-        full_url = f"{base_url}{post_url}"
-    else:
-        full_url = post_url
+    json_url = f"{post_url.split('?')[0].rstrip('/')}.json?{urlencode({'sort': 'top', 'raw_json': 1})}"
     
     try:
-        # Make the request
-        response = requests.get(
-            full_url, 
-            headers={
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-            },
-            timeout=30  # Added timeout for the request
-        )
-        
-        if response.status_code != 200:
-            logging.error(f"Failed to get Reddit comments: {response.status_code}")
+        listings = _get_json(json_url, api_key)
+        if not isinstance(listings, list) or len(listings) < 2:
+            logging.error(f"Unexpected Reddit comments response for: {post_url}")
             return {"content": "", "comments": []}
         
-        # Parse the response
-        soup = BeautifulSoup(response.text, 'html.parser')
-        
-        # Get post content
-        post_content = ""
-        post_elem = soup.select_one('div[data-testid="post-container"]')
-        if post_elem:
-            post_text = post_elem.select_one('div[data-click-id="text"] div')
-            if post_text:
-                post_content = post_text.text
-        
-        # Get comments
-        comments = []
-        comment_elements = soup.select('div[data-testid="comment"]')
+        # The first listing holds the post, the second its comments
+        post_children = listings[0].get("data", {}).get("children", [])
+        post_content = post_children[0].get("data", {}).get("selftext", "") if post_children else ""
         
-        for comment in comment_elements[:max_comments]:
-            try:
-                # Extract comment author
-                author_elem = comment.select_one('a[data-testid="comment_author"]')
-                author = author_elem.text if author_elem else "Unknown user"
-                
-                # Extract comment text
-                text_elem = comment.select_one('div[data-testid="comment"] > div:nth-child(2)')
-                text = text_elem.text if text_elem else ""
-                
-                # Extract comment score
-                score_elem = comment.select_one('div[id*="vote-arrows"]')
-                score = 0
-                if score_elem:
-                    score_text = score_elem.text.strip()
-                    try:
-                        if 'k' in score_text.lower():
-                            score = int(float(score_text.lower().replace('k', '')) * 1000)
-                        else:
-                            score = int(score_text)
-                    except ValueError:
-                        pass
-                
-                comments.append({
-                    "author": author,
-                    "text": text,
-                    "score": score
-                })
-                
-            except Exception as e:
-                logging.warning(f"Error parsing Reddit comment: {e}")
+        comments = _flatten_comments(listings[1].get("data", {}).get("children", []))
+        comments.sort(key=lambda c: c["score"], reverse=True)
+        comments = comments[:max_comments]
         
         # Combine post content and comments
         combined_text = post_content + "\n\n"
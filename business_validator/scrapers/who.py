@@ -1,21 +1,17 @@
 """
 WHO (World Health Organization) data scraper for health statistics and trends.
 """
-import requests
 import logging
 from typing import Dict, List, Any
 from bs4 import BeautifulSoup
-import time
+
+from business_validator.scrapers.fetch import http_get
 
 class WHOScraper:
     """Scraper for WHO health data and statistics."""
     
     def __init__(self):
         self.base_url = "https://www.who.int"
-        self.session = requests.Session()
-        self.session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-        })
     
     def search_health_data(self, topic: str, limit: int = 5) -> List[Dict[str, Any]]:
         """
@@ -35,7 +31,7 @@ class WHOScraper:
             search_url = f"{self.base_url}/news-room/fact-sheets"
             
             # Try to get WHO fact sheets page
-            response = self.session.get(search_url, timeout=10)
+            response = http_get(search_url, timeout=10)
             response.raise_for_status()
             
             soup = BeautifulSoup(response.content, 'html.parser')
@@ -90,7 +86,7 @@ class WHOScraper:
     def _get_fact_sheet_content(self, url: str) -> str:
         """Get content from a WHO fact sheet."""
         try:
-            response = self.session.get(url, timeout=10)
+            response = http_get(url, timeout=10)
             response.raise_for_status()
             
             soup = BeautifulSoup(response.content, 'html.parser')
@@ -110,9 +106,6 @@ class WHOScraper:
         except Exception as e:
             logging.error(f"Error getting WHO fact sheet content: {str(e)}")
             return "Content unavailable"
-        
-        finally:
-            time.sleep(1)  # Be respectful to WHO servers
 
 def scrape_who_data(topic: str, limit: int = 3) -> List[Dict[str, Any]]:
     """
@@ -0,0 +1,194 @@
+"""
+Streaming collection and analysis: posts are analyzed while scraping continues.
+"""
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait
+from queue import Queue
+from typing import Any, Dict, List, Optional
+
+from SimpleLLM.language.llm_result import bind_context
+
+from business_validator.analyzers.post_analyzer import analyze_hn_item, analyze_reddit_item, is_failed_analysis
+from business_validator.config import (
+    DEFAULT_ANALYSIS_WORKERS,
+    DEFAULT_MAX_COMMENTS_PER_POST,
+    DEFAULT_SCRAPE_WORKERS,
+    DEFAULT_STREAM_QUEUE_SIZE,
+)
+from business_validator.scrapers.collector import fetch_post_comments, hydrate_hn_post
+from business_validator.scrapers.hackernews import iter_hackernews
+from business_validator.scrapers.reddit import iter_reddit
+
+_DONE = object()
+
+
+class _PlatformQuota:
+    """
+    Deduplicates one platform's posts and hands out analysis slots up to a limit.
+
+    A slot is held from claim until the post's analysis finishes. If the
+    analysis fails, release frees the slot so another post can take it.
+    """
+
+    def __init__(self, limit: int):
+        self.limit = limit
+        self.full = threading.Event()
+        self._seen_urls = set()
+        self._next_index = 0
+        self._accepted = 0
+        self._in_flight = 0
+        self._changed = threading.Condition()
+        if limit <= 0:
+            self.full.set()
+
+    def claim(self, post: Dict[str, Any]) -> Optional[int]:
+        """Return the post's slot index, or None if it is a duplicate or the quota is used up."""
+        with self._changed:
+            if self._accepted >= self.limit or post["url"] in self._seen_urls:
+                return None
+            self._seen_urls.add(post["url"])
+            index = self._next_index
+            self._next_index += 1
+            self._accepted += 1
+            self._in_flight += 1
+            if self._accepted >= self.limit:
+                self.full.set()
+            return index
+
+    def done(self) -> None:
+        """Mark a claimed post's analysis as finished; its slot stays used."""
+        with self._changed:
+            self._in_flight -= 1
+            self._changed.notify_all()
+
+    def release(self) -> None:
+        """Free a claimed post's slot after its analysis failed."""
+        with self._changed:
+            self._in_flight -= 1
+            self._accepted -= 1
+            self.full.clear()
+            self._changed.notify_all()
+
+    def wait_for_room(self) -> bool:
+        """
+        Block while the quota is full but some analyses are still running.
+
+        Returns:
+            True if a slot was freed, False once every accepted post has been analyzed
+        """
+        with self._changed:
+            self._changed.wait_for(lambda: self._accepted < self.limit or self._in_flight == 0)
+            return self._accepted < self.limit
+
+
+def stream_analyze_posts(
+    keywords: List[str],
+    business_idea: str,
+    data_dir: str,
+    max_pages_per_keyword: int = 3,
+    max_hn_posts: int = 10,
+    max_reddit_posts: int = 10,
+    max_comments: int = DEFAULT_MAX_COMMENTS_PER_POST,
+    analysis_workers: int = DEFAULT_ANALYSIS_WORKERS,
+    queue_size: int = DEFAULT_STREAM_QUEUE_SIZE
+) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    Scrape and analyze HN and Reddit posts as one streaming pipeline.
+
+    Scrapers push posts into a bounded queue as soon as they are parsed.
+    Duplicates are dropped on the fly, analysis workers consume posts
+    immediately, and each platform's scrapers stop once enough unique posts
+    have been analyzed. A post whose analysis fails gives its slot back, so
+    scraping continues until the quota is met by posts that succeeded.
+
+    Args:
+        keywords: Keywords to search for
+        business_idea: The business idea being validated
+        data_dir: Run directory for checkpoints
+        max_pages_per_keyword: Max pages to search per keyword
+        max_hn_posts: Max HN posts to analyze
+        max_reddit_posts: Max Reddit posts to analyze
+        max_comments: Max comments to fetch per Reddit post
+        analysis_workers: Number of analysis workers
+        queue_size: Maximum number of posts waiting for a worker
+
+    Returns:
+        Dict with "hn_posts", "reddit_posts_with_comments", "hn_analyses"
+        and "reddit_analyses", each ordered by acceptance
+    """
+    queue: Queue = Queue(maxsize=max(1, queue_size))
+    quotas = {"hn": _PlatformQuota(max_hn_posts), "reddit": _PlatformQuota(max_reddit_posts)}
+    results: Dict[str, Dict[int, Dict[str, Any]]] = {"hn": {}, "reddit": {}}
+    results_lock = threading.Lock()
+
+    def produce(platform: str, keyword: str) -> None:
+        quota = quotas[platform]
+        if quota.full.is_set() and not quota.wait_for_room():
+            return
+        if platform == "hn":
+            posts = iter_hackernews(keyword, max_pages=max_pages_per_keyword)
+        else:
+            posts = iter_reddit(keyword, max_pages=max_pages_per_keyword)
+        try:
+            for post in posts:
+                index = quota.claim(post)
+                if index is not None:
+                    queue.put((platform, index, post))
+                if quota.full.is_set() and not quota.wait_for_room():
+                    logging.info(f"Enough {platform} posts analyzed; stopping search for: {keyword}")
+                    break
+        except Exception as e:
+            logging.error(f"Error streaming {platform} posts for {keyword}: {e}")
+        finally:
+            posts.close()
+
+    def consume() -> None:
+        while True:
+            item = queue.get()
+            if item is _DONE:
+                return
+            platform, index, post = item
+            try:
+                if platform == "hn":
+                    analysis = analyze_hn_item(hydrate_hn_post(post), business_idea, index, data_dir)
+                else:
+                    post_with_comments = fetch_post_comments(post, index, max_comments, data_dir)
+                    analysis = analyze_reddit_item(post_with_comments, business_idea, index, data_dir)
+                # The analyzers return a placeholder instead of raising when the LLM call fails
+                if is_failed_analysis(analysis):
+                    logging.warning(f"Analysis of streamed {platform} post {index+1} failed; freeing its slot")
+                    quotas[platform].release()
+                    continue
+                with results_lock:
+                    results[platform][index] = analysis
+                quotas[platform].done()
+            except Exception as e:
+                logging.error(f"Error analyzing streamed {platform} post {index+1}: {e}")
+                quotas[platform].release()
+
+    workers = max(1, analysis_workers)
+    with ThreadPoolExecutor(max_workers=workers) as consumers, \
+            ThreadPoolExecutor(max_workers=DEFAULT_SCRAPE_WORKERS) as producers:
+        consumer_futures = [consumers.submit(bind_context(consume)) for _ in range(workers)]
+        wait([
+            producers.submit(produce, platform, keyword)
+            for keyword in keywords
+            for platform in ("hn", "reddit")
+        ])
+        for _ in range(workers):
+            queue.put(_DONE)
+        wait(consumer_futures)
+
+    hn_analyses = [results["hn"][i] for i in sorted(results["hn"])]
+    reddit_analyses = [results["reddit"][i] for i in sorted(results["reddit"])]
+    logging.info(f"Streamed {len(hn_analyses)} HN and {len(reddit_analyses)} Reddit analyses")
+
+    return {
+        "hn_posts": [item["post"] for item in hn_analyses],
+        "reddit_posts_with_comments": [
+            {"post": item["post"], "comments": item["comments"]} for item in reddit_analyses
+        ],
+        "hn_analyses": hn_analyses,
+        "reddit_analyses": reddit_analyses
+    }
@@ -0,0 +1,81 @@
+"""
+Concurrency helpers shared by the scraping and analysis stages.
+"""
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Optional
+from urllib.parse import urlparse
+
+
+def host_of(url: str) -> str:
+    """
+    Return the lower-cased host name of a URL.
+
+    Args:
+        url: URL to inspect
+
+    Returns:
+        Host name, or an empty string if the URL has none
+    """
+    return (urlparse(url).hostname or "").lower()
+
+
+class HostThrottle:
+    """
+    Per-host politeness scheduler.
+
+    Each host gets its own concurrency cap and a minimum interval between
+    request starts, so requests to different hosts never wait on each other.
+    """
+
+    def __init__(
+        self,
+        min_intervals: Optional[Dict[str, float]] = None,
+        default_interval: float = 0.0,
+        max_concurrency: Optional[Dict[str, int]] = None,
+        default_concurrency: int = 2
+    ):
+        self.min_intervals = dict(min_intervals or {})
+        self.default_interval = default_interval
+        self.max_concurrency = dict(max_concurrency or {})
+        self.default_concurrency = default_concurrency
+        self._lock = threading.Lock()
+        self._semaphores: Dict[str, threading.BoundedSemaphore] = {}
+        self._next_start: Dict[str, float] = {}
+
+    def _semaphore(self, host: str) -> threading.BoundedSemaphore:
+        with self._lock:
+            semaphore = self._semaphores.get(host)
+            if semaphore is None:
+                limit = self.max_concurrency.get(host, self.default_concurrency)
+                semaphore = threading.BoundedSemaphore(max(1, limit))
+                self._semaphores[host] = semaphore
+            return semaphore
+
+    def _reserve_start(self, host: str) -> float:
+        """Reserve the next start time for a host and return how long to wait for it."""
+        interval = self.min_intervals.get(host, self.default_interval)
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next_start.get(host, 0.0))
+            self._next_start[host] = start + interval
+        return start - now
+
+    @contextmanager
+    def slot(self, host: str):
+        """
+        Hold a request slot for a host for the duration of the block.
+
+        Args:
+            host: Host name the request is sent to
+        """
+        semaphore = self._semaphore(host)
+        semaphore.acquire()
+        try:
+            delay = self._reserve_start(host)
+            if delay > 0:
+                time.sleep(delay)
+            yield
+        finally:
+            semaphore.release()
@@ -11,12 +11,13 @@ import shutil
 from business_validator.config import DATA_DIR
 
 
-def setup_environment(business_idea: str) -> dict:
+def setup_environment(business_idea: str, parameters: dict = None) -> dict:
     """
     Set up the environment for a validation run.
     
     Args:
         business_idea: The business idea being validated
+        parameters: Optional run parameters, stored so the run can be resumed
         
     Returns:
         Dictionary with environment information
@@ -35,7 +36,8 @@ def setup_environment(business_idea: str) -> dict:
         json.dump({
             "business_idea": business_idea,
             "timestamp": timestamp,
-            "run_id": run_id
+            "run_id": run_id,
+            "parameters": parameters or {}
         }, f)
     
     logging.info(f"Set up environment for validation run: {run_id}")
@@ -47,6 +49,36 @@ def setup_environment(business_idea: str) -> dict:
     }
 
 
+def load_environment(run_id: str) -> dict:
+    """
+    Load the environment of an existing validation run.
+    
+    Args:
+        run_id: ID of the run to load
+        
+    Returns:
+        Dictionary with environment information, including the business idea
+        and the run parameters stored when the run was set up
+    """
+    run_data_dir = os.path.join(DATA_DIR, run_id)
+    info_path = os.path.join(run_data_dir, "info.json")
+    if not os.path.exists(info_path):
+        raise FileNotFoundError(f"No validation run found for run ID: {run_id}")
+    
+    with open(info_path, "r", encoding="utf-8") as f:
+        info = json.load(f)
+    
+    logging.info(f"Loaded environment for validation run: {run_id}")
+    
+    return {
+        "run_id": run_id,
+        "data_dir": run_data_dir,
+        "timestamp": info.get("timestamp", ""),
+        "business_idea": info["business_idea"],
+        "parameters": info.get("parameters", {})
+    }
+
+
 def cleanup_environment(run_id: str = None, keep_last_n: int = 5) -> None:
     """
     Clean up old validation runs, keeping only the most recent ones.
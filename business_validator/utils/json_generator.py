@@ -1,10 +1,11 @@
 """
 Utility functions for generating JSON data from LLM responses.
 """
-import json
 import logging
 from pydantic import ValidationError
 
+from SimpleLLM.language.json_repair import JSONRepairError, repair_json_object
+
 def generate_basic_pydantic_json_model(
     model_class, 
     llm_instance, 
@@ -33,21 +34,13 @@ def generate_basic_pydantic_json_model(
                 system_prompt=system_prompt
             )
 
-            # Clean the response to extract only the JSON part
-            clean_response = llm_response.strip()
-            if clean_response.startswith("```json"):
-                clean_response = clean_response[7:]
-            if clean_response.endswith("```"):
-                clean_response = clean_response[:-3]
-            clean_response = clean_response.strip()
-
-            # Parse the JSON
-            parsed_data = json.loads(clean_response)
+            # Fences, Python literals, stray commas and truncation are repaired locally
+            parsed_data = repair_json_object(llm_response)
 
             # Create and return the Pydantic model
             return model_class(**parsed_data)
 
-        except (json.JSONDecodeError, ValidationError, Exception) as e:
+        except (JSONRepairError, ValidationError, Exception) as e:
             logging.warning(f"Attempt {attempt+1} failed: {str(e)}")
             if attempt == max_attempts - 1:
                 raise ValueError(f"Failed to generate valid model after {max_attempts} attempts: {str(e)}")
@@ -2,6 +2,7 @@
 Reporting utilities.
 """
 import json
+import logging
 import os
 from typing import Dict, List, Any
 
@@ -21,9 +22,12 @@ def save_json_checkpoint(data: Any, file_path: str) -> None:
     if hasattr(data, "dict"):
         data = data.dict()
     
-    # Save the data
-    with open(file_path, "w", encoding="utf-8") as f:
+    # Write to a temporary file first so an interrupted run never leaves a
+    # truncated checkpoint behind for resume to trip over
+    tmp_path = f"{file_path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
         json.dump(data, f, indent=2, ensure_ascii=False)
+    os.replace(tmp_path, file_path)
 
 
 def load_json_checkpoint(file_path: str) -> Any:
@@ -34,13 +38,17 @@ def load_json_checkpoint(file_path: str) -> Any:
         file_path: Path to the file
         
     Returns:
-        Loaded data
+        Loaded data, or None if the file is missing or unreadable
     """
     if not os.path.exists(file_path):
         return None
         
-    with open(file_path, "r", encoding="utf-8") as f:
-        return json.load(f)
+    try:
+        with open(file_path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except json.JSONDecodeError as e:
+        logging.warning(f"Ignoring unreadable checkpoint {file_path}: {e}")
+        return None
 
 
 def print_validation_report(analysis: Dict) -> None:
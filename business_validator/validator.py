@@ -4,202 +4,396 @@ Main validator functionality.
 import json
 import logging
 import os
-import time
-from typing import Dict, List, Optional
+from concurrent.futures import Executor, ThreadPoolExecutor
+from typing import Any, Dict, List, Optional
+
+from SimpleLLM.language.hedging import hedge_recorder
+from SimpleLLM.language.llm import llm_flight
+from SimpleLLM.language.llm_result import LLMMetrics, collect_metrics
+from SimpleLLM.language.llm_providers.usage import usage_tracker
+from SimpleLLM.language.rate_limiter import rate_limiter
 
 from business_validator.analyzers.keyword_generator import generate_keywords
-from business_validator.analyzers.combined_analyzer import generate_final_analysis
+from business_validator.analyzers.combined_analyzer import (
+    gather_web_platform_insights,
+    generate_final_analysis,
+    is_fallback_analysis,
+)
+from business_validator.analyzers.post_analyzer import analyze_hn_posts, analyze_reddit_posts, is_failed_analysis
+from business_validator.config import (
+    DEFAULT_ANALYSIS_WORKERS,
+    DEFAULT_HN_POSTS_TO_ANALYZE,
+    DEFAULT_KEYWORDS_COUNT,
+    DEFAULT_MAX_PAGES_PER_KEYWORD,
+    DEFAULT_REDDIT_POSTS_TO_ANALYZE,
+)
 from business_validator.models import CombinedAnalysis
-from business_validator.scrapers.hackernews import search_hackernews
-from business_validator.scrapers.reddit import search_reddit, get_reddit_comments
-from business_validator.utils.environment import setup_environment
-from business_validator.utils.reporting import save_json_checkpoint, print_validation_report
+from business_validator.pipeline import Pipeline, Stage
+from business_validator.scrapers.collector import collect_hn_posts, collect_reddit_posts, hydrate_hn_posts
+from business_validator.scrapers.fetch import fetch_flight, http_cache
+from business_validator.streaming import stream_analyze_posts
+from business_validator.utils.environment import load_environment, setup_environment
+from business_validator.utils.reporting import load_json_checkpoint, save_json_checkpoint, print_validation_report
 
 
-def validate_business_idea(
-    business_idea: str, 
+def build_validation_pipeline(
+    data_dir: str,
+    analysis_executor: Executor,
     keywords_count: int = 3,
     max_pages_per_keyword: int = 3,
     max_hn_posts: int = 10,
-    max_reddit_posts: int = 10
-) -> Dict:
+    max_reddit_posts: int = 10,
+    streaming: bool = False,
+    analysis_workers: int = DEFAULT_ANALYSIS_WORKERS
+) -> Pipeline:
     """
-    Validate a business idea by searching and analyzing online discussions.
-    
+    Build the validation pipeline as a graph of stages.
+
+    Stages start as soon as their inputs are ready: HN and Reddit collection
+    and web searches run side by side once keywords exist, and each platform's
+    analysis starts as soon as its own posts are collected. HN searches return
+    post stubs; article bodies are only fetched for the selected posts. Stages whose
+    checkpoints already exist in the run directory reuse them, and the
+    analysis stages skip every post that already has a partial checkpoint.
+
     Args:
-        business_idea: The business idea to validate
+        data_dir: Run directory for checkpoints
+        analysis_executor: Worker pool shared by HN and Reddit analysis
         keywords_count: Number of keywords to generate and search for
         max_pages_per_keyword: Max pages to search per keyword
         max_hn_posts: Max HN posts to analyze
         max_reddit_posts: Max Reddit posts to analyze
-        
+        streaming: Replace the separate collection and analysis stages with one
+            streaming stage that analyzes posts while scraping continues
+        analysis_workers: Number of analysis workers in streaming mode
+
     Returns:
-        Dict with validation results
+        Pipeline that expects "business_idea" as its initial input
     """
-    logging.info(f"Starting validation for business idea: {business_idea}")
-    
-    # Setup environment (creates unique data directory)
-    env = setup_environment(business_idea)
-    data_dir = env["data_dir"]
-    
-    try:
-        # Step 1: Generate keywords
-        logging.info("Step 1: Generating keywords")
+    def reuse(file_name: str) -> Any:
+        existing = load_json_checkpoint(os.path.join(data_dir, file_name))
+        if existing is not None:
+            logging.info(f"Reusing checkpoint {file_name}")
+        return existing
+
+    def reuse_analyses(file_name: str) -> Optional[List[Dict[str, Any]]]:
+        # Posts whose analysis failed are retried; the analysis stage reuses the others from their partials
+        existing = load_json_checkpoint(os.path.join(data_dir, file_name))
+        if existing is None:
+            return None
+        if any(is_failed_analysis(item) for item in existing):
+            logging.info(f"Not reusing checkpoint {file_name}: it holds failed analyses")
+            return None
+        logging.info(f"Reusing checkpoint {file_name}")
+        return existing
+
+    def keywords_stage(business_idea: str) -> List[str]:
+        existing = reuse("01_keywords.json")
+        if existing is not None:
+            return existing["keywords"]
         keywords = generate_keywords(business_idea, num_keywords=keywords_count)
         save_json_checkpoint(
             {"business_idea": business_idea, "keywords": keywords},
             os.path.join(data_dir, "01_keywords.json")
         )
-        
-        # Step 2: Search HackerNews
-        logging.info("Step 2: Searching HackerNews")
-        hn_posts = []
-        for i, keyword in enumerate(keywords):
-            logging.info(f"Searching HN for keyword {i+1}/{len(keywords)}: {keyword}")
-            posts = search_hackernews(keyword, max_pages=max_pages_per_keyword)
-            save_json_checkpoint(
-                posts,
-                os.path.join(data_dir, f"02_hn_posts_partial_{i+1}.json")
-            )
-            hn_posts.extend(posts)
-            time.sleep(1)  # Avoid rate limiting
-        
-        # Deduplicate HN posts by URL
-        hn_posts_deduplicated = []
-        seen_urls = set()
-        for post in hn_posts:
-            if post["url"] not in seen_urls:
-                seen_urls.add(post["url"])
-                hn_posts_deduplicated.append(post)
-        
-        # Save HN posts
+        return keywords
+
+    def hn_posts_stage(keywords: List[str]) -> List[Dict[str, Any]]:
+        existing = reuse("02_hn_posts_complete.json")
+        if existing is not None:
+            return existing
+        hn_posts = collect_hn_posts(
+            keywords,
+            data_dir,
+            max_pages_per_keyword=max_pages_per_keyword,
+            max_hn_posts=max_hn_posts
+        )
         save_json_checkpoint(
-            hn_posts_deduplicated[:max_hn_posts],
+            hn_posts,
             os.path.join(data_dir, "02_hn_posts_complete.json")
         )
-        
-        # Step 3: Search Reddit
-        logging.info("Step 3: Searching Reddit")
-        reddit_posts = []
-        for i, keyword in enumerate(keywords):
-            logging.info(f"Searching Reddit for keyword {i+1}/{len(keywords)}: {keyword}")
-            posts = search_reddit(keyword, max_pages=max_pages_per_keyword)
-            save_json_checkpoint(
-                posts,
-                os.path.join(data_dir, f"03_reddit_posts_partial_{i+1}.json")
-            )
-            reddit_posts.extend(posts)
-            time.sleep(1)  # Avoid rate limiting
-        
-        # Deduplicate Reddit posts by URL
-        reddit_posts_deduplicated = []
-        seen_urls = set()
-        for post in reddit_posts:
-            if post["url"] not in seen_urls:
-                seen_urls.add(post["url"])
-                reddit_posts_deduplicated.append(post)
-        
-        # Save Reddit posts
-        reddit_posts_final = reddit_posts_deduplicated[:max_reddit_posts]
+        return hn_posts
+
+    def reddit_posts_stage(keywords: List[str]) -> List[Dict[str, Any]]:
+        existing = reuse("04_reddit_comments_complete.json")
+        if existing is not None:
+            return existing
+        collected = collect_reddit_posts(
+            keywords,
+            data_dir,
+            max_pages_per_keyword=max_pages_per_keyword,
+            max_reddit_posts=max_reddit_posts
+        )
         save_json_checkpoint(
-            reddit_posts_final,
+            collected["reddit_posts"],
             os.path.join(data_dir, "03_reddit_posts_complete.json")
         )
-        
-        # Step 4: Get Reddit comments for selected posts
-        logging.info("Step 4: Getting Reddit comments")
-        reddit_posts_with_comments = []
-        for i, post in enumerate(reddit_posts_final):
-            logging.info(f"Getting comments for Reddit post {i+1}/{len(reddit_posts_final)}")
-            comments = get_reddit_comments(post["url"], max_comments=10)
-            post_with_comments = {
-                "post": post,
-                "comments": comments
-            }
-            reddit_posts_with_comments.append(post_with_comments)
-            save_json_checkpoint(
-                post_with_comments,
-                os.path.join(data_dir, f"04_reddit_comments_partial_{i+1}.json")
-            )
-            time.sleep(0.5)  # Avoid rate limiting
-        
-        # Save Reddit posts with comments
         save_json_checkpoint(
-            reddit_posts_with_comments,
+            collected["reddit_posts_with_comments"],
             os.path.join(data_dir, "04_reddit_comments_complete.json")
         )
-        
-        # Step 5: Analyze HN posts
-        logging.info("Step 5: Analyzing HackerNews posts")
-        from business_validator.analyzers.hackernews_analyzer import analyze_hn_post
-        hn_posts_to_analyze = hn_posts_deduplicated[:max_hn_posts]
-        hn_analyses = []
-        
-        for i, post in enumerate(hn_posts_to_analyze):
-            logging.info(f"Analyzing HN post {i+1}/{len(hn_posts_to_analyze)}")
-            analysis = analyze_hn_post(post, business_idea)
-            hn_analysis = {
-                "post": post,
-                "analysis": analysis.dict() if hasattr(analysis, "dict") else analysis
-            }
-            hn_analyses.append(hn_analysis)
-            save_json_checkpoint(
-                hn_analysis,
-                os.path.join(data_dir, f"05_hn_analyses_partial_{i+1}.json")
-            )
-        
-        # Save HN analyses
+        return collected["reddit_posts_with_comments"]
+
+    def web_insights_stage(business_idea: str, keywords: List[str]) -> List[Dict[str, Any]]:
+        existing = reuse("08_web_insights.json")
+        if existing is not None:
+            return existing
+        web_insights = gather_web_platform_insights(business_idea, keywords)
+        save_json_checkpoint(
+            web_insights,
+            os.path.join(data_dir, "08_web_insights.json")
+        )
+        return web_insights
+
+    def hn_content_stage(hn_posts: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        existing = reuse("02_hn_posts_hydrated.json")
+        if existing is not None:
+            return existing
+        hydrated_hn_posts = hydrate_hn_posts(hn_posts)
+        save_json_checkpoint(
+            hydrated_hn_posts,
+            os.path.join(data_dir, "02_hn_posts_hydrated.json")
+        )
+        return hydrated_hn_posts
+
+    def hn_analyses_stage(business_idea: str, hydrated_hn_posts: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        existing = reuse_analyses("05_hn_analyses_complete.json")
+        if existing is not None:
+            return existing
+        hn_analyses = analyze_hn_posts(hydrated_hn_posts, business_idea, data_dir, analysis_executor)
         save_json_checkpoint(
             hn_analyses,
             os.path.join(data_dir, "05_hn_analyses_complete.json")
         )
-        
-        # Step 6: Analyze Reddit posts
-        logging.info("Step 6: Analyzing Reddit posts")
-        from business_validator.analyzers.reddit_analyzer import analyze_reddit_post
-        reddit_analyses = []
-        
-        for i, post_with_comments in enumerate(reddit_posts_with_comments):
-            logging.info(f"Analyzing Reddit post {i+1}/{len(reddit_posts_with_comments)}")
-            post = post_with_comments["post"]
-            comments = post_with_comments["comments"]
-            analysis = analyze_reddit_post(post, comments, business_idea)
-            reddit_analysis = {
-                "post": post,
-                "comments": comments,
-                "analysis": analysis.dict() if hasattr(analysis, "dict") else analysis
-            }
-            reddit_analyses.append(reddit_analysis)
-            save_json_checkpoint(
-                reddit_analysis,
-                os.path.join(data_dir, f"06_reddit_analyses_partial_{i+1}.json")
-            )
-        
-        # Save Reddit analyses
+        return hn_analyses
+
+    def reddit_analyses_stage(
+        business_idea: str,
+        reddit_posts_with_comments: List[Dict[str, Any]]
+    ) -> List[Dict[str, Any]]:
+        existing = reuse_analyses("06_reddit_analyses_complete.json")
+        if existing is not None:
+            return existing
+        reddit_analyses = analyze_reddit_posts(reddit_posts_with_comments, business_idea, data_dir, analysis_executor)
         save_json_checkpoint(
             reddit_analyses,
             os.path.join(data_dir, "06_reddit_analyses_complete.json")
         )
-        
-        # Step 7: Generate final analysis
-        logging.info("Step 7: Generating final analysis")
+        return reddit_analyses
+
+    def final_analysis_stage(
+        business_idea: str,
+        keywords: List[str],
+        hn_analyses: List[Dict[str, Any]],
+        reddit_analyses: List[Dict[str, Any]],
+        web_insights: List[Dict[str, Any]]
+    ) -> Dict[str, Any]:
+        existing = load_json_checkpoint(os.path.join(data_dir, "07_final_analysis.json"))
+        # A placeholder saved after an LLM failure is not a finished stage, so a resumed run retries it
+        if existing is not None and not is_fallback_analysis(existing):
+            logging.info("Reusing checkpoint 07_final_analysis.json")
+            return existing
         final_analysis = generate_final_analysis(
             business_idea=business_idea,
             hn_analyses=hn_analyses,
             reddit_analyses=reddit_analyses,
-            keywords=keywords
+            keywords=keywords,
+            web_insights=web_insights
         )
-        
-        # Save final analysis
         final_analysis_dict = final_analysis.dict() if hasattr(final_analysis, "dict") else final_analysis
         save_json_checkpoint(
             final_analysis_dict,
             os.path.join(data_dir, "07_final_analysis.json")
         )
-        
-        # Return results
         return final_analysis_dict
-        
+
+    def stream_stage(business_idea: str, keywords: List[str]) -> Dict[str, Any]:
+        hn_analyses = reuse_analyses("05_hn_analyses_complete.json")
+        reddit_analyses = reuse_analyses("06_reddit_analyses_complete.json")
+        if hn_analyses is not None and reddit_analyses is not None:
+            return {"hn_analyses": hn_analyses, "reddit_analyses": reddit_analyses}
+        # Only the platforms without a usable checkpoint are streamed; a zero quota skips the other
+        streamed = stream_analyze_posts(
+            keywords,
+            business_idea,
+            data_dir,
+            max_pages_per_keyword=max_pages_per_keyword,
+            max_hn_posts=max_hn_posts if hn_analyses is None else 0,
+            max_reddit_posts=max_reddit_posts if reddit_analyses is None else 0,
+            analysis_workers=analysis_workers
+        )
+        checkpoints = []
+        if hn_analyses is None:
+            hn_analyses = streamed["hn_analyses"]
+            checkpoints += [("hn_posts", "02_hn_posts_complete.json"), ("hn_analyses", "05_hn_analyses_complete.json")]
+        if reddit_analyses is None:
+            reddit_analyses = streamed["reddit_analyses"]
+            checkpoints += [
+                ("reddit_posts_with_comments", "04_reddit_comments_complete.json"),
+                ("reddit_analyses", "06_reddit_analyses_complete.json"),
+            ]
+        for key, file_name in checkpoints:
+            save_json_checkpoint(streamed[key], os.path.join(data_dir, file_name))
+        return {"hn_analyses": hn_analyses, "reddit_analyses": reddit_analyses}
+
+    common_stages = [
+        Stage("keywords", keywords_stage, inputs=["business_idea"], outputs=["keywords"]),
+        Stage("web_insights", web_insights_stage, inputs=["business_idea", "keywords"], outputs=["web_insights"]),
+        Stage(
+            "final_analysis",
+            final_analysis_stage,
+            inputs=["business_idea", "keywords", "hn_analyses", "reddit_analyses", "web_insights"],
+            outputs=["final_analysis"]
+        ),
+    ]
+
+    if streaming:
+        return Pipeline(common_stages + [
+            Stage(
+                "stream_analyses",
+                stream_stage,
+                inputs=["business_idea", "keywords"],
+                outputs=["hn_analyses", "reddit_analyses"]
+            ),
+        ])
+
+    return Pipeline(common_stages + [
+        Stage("hn_posts", hn_posts_stage, inputs=["keywords"], outputs=["hn_posts"]),
+        Stage("reddit_posts", reddit_posts_stage, inputs=["keywords"], outputs=["reddit_posts_with_comments"]),
+        Stage("hn_content", hn_content_stage, inputs=["hn_posts"], outputs=["hydrated_hn_posts"]),
+        Stage(
+            "hn_analyses",
+            hn_analyses_stage,
+            inputs=["business_idea", "hydrated_hn_posts"],
+            outputs=["hn_analyses"]
+        ),
+        Stage(
+            "reddit_analyses",
+            reddit_analyses_stage,
+            inputs=["business_idea", "reddit_posts_with_comments"],
+            outputs=["reddit_analyses"]
+        ),
+    ])
+
+
+def _run_validation(
+    business_idea: str,
+    data_dir: str,
+    keywords_count: int,
+    max_pages_per_keyword: int,
+    max_hn_posts: int,
+    max_reddit_posts: int,
+    analysis_workers: int,
+    streaming: bool = False
+) -> Dict:
+    """
+    Run the validation pipeline in a run directory and return the final analysis.
+
+    Token usage, cost, latency and retries of every LLM call are written per
+    stage to metrics.json in the run directory, even if the run fails.
+    """
+    with ThreadPoolExecutor(max_workers=max(1, analysis_workers)) as analysis_executor:
+        pipeline = build_validation_pipeline(
+            data_dir,
+            analysis_executor,
+            keywords_count=keywords_count,
+            max_pages_per_keyword=max_pages_per_keyword,
+            max_hn_posts=max_hn_posts,
+            max_reddit_posts=max_reddit_posts,
+            streaming=streaming,
+            analysis_workers=analysis_workers
+        )
+        metrics = LLMMetrics()
+        try:
+            with collect_metrics(metrics):
+                context = pipeline.run({"business_idea": business_idea}, data_dir=data_dir)
+        finally:
+            save_json_checkpoint(metrics.stats(), os.path.join(data_dir, "metrics.json"))
+    logging.info(f"HTTP cache stats: {http_cache.stats()}")
+    logging.info(f"LLM rate limiter waits: {rate_limiter.stats()}")
+    logging.info(f"LLM hedged requests: {hedge_recorder.stats()}")
+    logging.info(f"LLM token usage (cached prompt tokens): {usage_tracker.stats()}")
+    logging.info(f"Coalesced duplicate requests: LLM {llm_flight.stats()}, HTTP {fetch_flight.stats()}")
+    return context["final_analysis"]
+
+
+def validate_business_idea(
+    business_idea: str,
+    keywords_count: int = DEFAULT_KEYWORDS_COUNT,
+    max_pages_per_keyword: int = DEFAULT_MAX_PAGES_PER_KEYWORD,
+    max_hn_posts: int = DEFAULT_HN_POSTS_TO_ANALYZE,
+    max_reddit_posts: int = DEFAULT_REDDIT_POSTS_TO_ANALYZE,
+    analysis_workers: int = DEFAULT_ANALYSIS_WORKERS,
+    streaming: bool = False
+) -> Dict:
+    """
+    Validate a business idea by searching and analyzing online discussions.
+
+    Args:
+        business_idea: The business idea to validate
+        keywords_count: Number of keywords to generate and search for
+        max_pages_per_keyword: Max pages to search per keyword
+        max_hn_posts: Max HN posts to analyze
+        max_reddit_posts: Max Reddit posts to analyze
+        analysis_workers: Max concurrent LLM calls for per-post analysis
+        streaming: Analyze posts while scraping continues and stop scraping
+            once enough unique posts have been accepted
+
+    Returns:
+        Dict with validation results
+    """
+    logging.info(f"Starting validation for business idea: {business_idea}")
+
+    parameters = {
+        "keywords_count": keywords_count,
+        "max_pages_per_keyword": max_pages_per_keyword,
+        "max_hn_posts": max_hn_posts,
+        "max_reddit_posts": max_reddit_posts,
+        "streaming": streaming
+    }
+
+    # Setup environment (creates unique data directory)
+    env = setup_environment(business_idea, parameters)
+    logging.info(f"Run ID: {env['run_id']} (pass it to resume_run if the run is interrupted)")
+
+    try:
+        return _run_validation(business_idea, env["data_dir"], analysis_workers=analysis_workers, **parameters)
     except Exception as e:
         logging.exception(f"Error during validation: {e}")
         raise
+
+
+def resume_run(run_id: str, analysis_workers: int = DEFAULT_ANALYSIS_WORKERS) -> Dict:
+    """
+    Resume an interrupted validation run from its checkpoints.
+
+    Completed stages are loaded from their checkpoint files, posts that were
+    already searched, fetched or analyzed are loaded from their partial files,
+    and work continues from the first incomplete item.
+
+    Args:
+        run_id: ID of the run to resume (its directory name under validation_data)
+        analysis_workers: Max concurrent LLM calls for per-post analysis
+
+    Returns:
+        Dict with validation results
+    """
+    env = load_environment(run_id)
+    business_idea = env["business_idea"]
+    logging.info(f"Resuming validation run {run_id} for business idea: {business_idea}")
+
+    # Runs set up before a parameter was stored fall back to the configured default
+    parameters = {
+        "keywords_count": DEFAULT_KEYWORDS_COUNT,
+        "max_pages_per_keyword": DEFAULT_MAX_PAGES_PER_KEYWORD,
+        "max_hn_posts": DEFAULT_HN_POSTS_TO_ANALYZE,
+        "max_reddit_posts": DEFAULT_REDDIT_POSTS_TO_ANALYZE,
+        "streaming": False
+    }
+    parameters.update(env["parameters"])
+
+    try:
+        return _run_validation(business_idea, env["data_dir"], analysis_workers=analysis_workers, **parameters)
+    except Exception as e:
+        logging.exception(f"Error while resuming validation run {run_id}: {e}")
+        raise
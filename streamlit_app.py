@@ -1674,7 +1674,7 @@ with st.sidebar:
     )
     
     # Note: The model selection is for display purposes only
-    # The actual model is configured in keyword_generator.py
+    # The actual models are configured per call site in config.LLM_ROUTES
     
     model = st.selectbox(
         "LLM Model (for reference only)",
@@ -0,0 +1,105 @@
+"""
+Tests for the awaitable LLM API over the shared async client.
+"""
+import asyncio
+import json
+from unittest import mock
+
+import httpx
+import pytest
+
+from SimpleLLM.language.llm import LLM, LLMProvider
+from SimpleLLM.language.llm_providers import async_http, resilience
+from SimpleLLM.language.llm_providers.resilience import CircuitBreaker
+
+USAGE = {"prompt_tokens": 20, "completion_tokens": 5}
+
+
+def _run(handler, coroutine_fn):
+    async def main():
+        client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        with mock.patch.object(async_http, "get_async_client", return_value=client):
+            try:
+                return await coroutine_fn()
+            finally:
+                await client.aclose()
+    return asyncio.run(main())
+
+
+@pytest.fixture(autouse=True)
+def environment(monkeypatch):
+    monkeypatch.setenv("OPENROUTER_API_KEY", "test-key")
+    with mock.patch.object(resilience, "_breakers", {}), mock.patch.object(async_http, "backoff_delay", return_value=0):
+        yield
+
+
+def test_concurrent_calls_retry_and_report_usage():
+    attempts = {}
+
+    async def handler(request):
+        prompt = json.loads(request.content)["messages"][-1]["content"]
+        attempts[prompt] = attempts.get(prompt, 0) + 1
+        if prompt == "flaky" and attempts[prompt] == 1:
+            return httpx.Response(503)
+        await asyncio.sleep(0.05)
+        return httpx.Response(200, json={"choices": [{"message": {"content": prompt.upper()}}], "usage": USAGE})
+
+    llm = LLM(LLMProvider.OPENROUTER, "test-model")
+
+    async def calls():
+        prompts = ["flaky"] + [f"prompt {i}" for i in range(50)]
+        return await asyncio.gather(*(llm.generate_async(prompt) for prompt in prompts))
+
+    results = _run(handler, calls)
+    assert results[0].text == "FLAKY" and results[0].retries == 1 and results[0].prompt_tokens == 20
+    assert [result.text for result in results[1:]] == [f"PROMPT {i}" for i in range(50)]
+
+
+def test_stream_closed_early_closes_the_response():
+    closed = []
+
+    class Body(httpx.AsyncByteStream):
+        async def __aiter__(self):
+            for word in ("one", " two", " three"):
+                yield f'data: {{"choices": [{{"delta": {{"content": "{word}"}}}}]}}\n\n'.encode()
+            yield b"data: [DONE]\n\n"
+
+        async def aclose(self):
+            closed.append(True)
+
+    llm = LLM(LLMProvider.OPENROUTER, "test-model")
+
+    async def first_chunk():
+        stream = llm.generate_text_stream_async("prompt")
+        try:
+            return await stream.__anext__(), stream.result
+        finally:
+            await stream.aclose()
+
+    chunk, result = _run(lambda request: httpx.Response(200, stream=Body()), first_chunk)
+    assert chunk == "one" and result.text == "one" and result.time_to_first_token is not None
+    assert closed == [True]
+
+
+def test_cancelled_half_open_trial_releases_the_circuit():
+    breaker = CircuitBreaker("openrouter", failure_threshold=1, reset_timeout=0)
+    breaker.record_failure()
+    started = asyncio.Event()
+
+    async def hanging(request):
+        started.set()
+        await asyncio.sleep(10)
+
+    async def cancel_trial():
+        with mock.patch.object(resilience, "_breakers", {"openrouter": breaker}):
+            task = asyncio.ensure_future(
+                async_http.async_post_with_retries("openrouter", "https://llm.example/v1", {}, {})
+            )
+            await started.wait()
+            task.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await task
+            breaker.before_call()  # The trial slot is free again
+
+    _run(hanging, cancel_trial)
+    assert breaker.state == "half-open"
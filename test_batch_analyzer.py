@@ -0,0 +1,60 @@
+"""
+Tests for batched post analysis.
+"""
+import json
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
+
+from business_validator.analyzers import batch_analyzer
+from business_validator.analyzers.post_analyzer import analyze_hn_posts
+from business_validator.models import HNPostAnalysis
+
+
+def _analysis(number, **overrides):
+    item = {
+        "post_number": number,
+        "relevant": True,
+        "pain_points": [f"pain {number}"],
+        "solutions_mentioned": [],
+        "market_signals": [],
+        "sentiment": "neutral",
+        "engagement_score": 5
+    }
+    item.update(overrides)
+    return item
+
+
+def _hn_post(i):
+    return {"title": f"Post {i}", "points": i, "comments": 0, "url": f"https://example.com/{i}"}
+
+
+def test_batches_respect_token_budget_and_size():
+    texts = ["x" * 400] * 7  # about 100 tokens each
+    assert batch_analyzer.plan_batches(texts, "hn_post", token_budget=250, max_batch_size=5) == [[0, 1], [2, 3], [4, 5], [6]]
+    assert batch_analyzer.plan_batches(texts, "hn_post", token_budget=10000, max_batch_size=3) == [[0, 1, 2], [3, 4, 5], [6]]
+    assert batch_analyzer.plan_batches(["x" * 4000], "hn_post", token_budget=10) == [[0]]
+
+
+def test_only_malformed_items_are_retried_individually():
+    response = json.dumps([_analysis(2), _analysis(1, engagement_score="lots"), _analysis(3)])
+    single = HNPostAnalysis(**_analysis(0, pain_points=["single"]))
+
+    with mock.patch.object(batch_analyzer.get_llm("hn_post"), "generate_text", return_value=response) as generate, \
+            mock.patch.object(batch_analyzer, "analyze_hn_post", return_value=single) as analyze_single:
+        analyses = batch_analyzer.analyze_hn_batch([_hn_post(1), _hn_post(2), _hn_post(3)], "idea")
+
+    assert generate.call_count == 1
+    assert analyze_single.call_count == 1
+    assert [a.pain_points for a in analyses] == [["single"], ["pain 2"], ["pain 3"]]
+
+
+def test_batched_analysis_writes_checkpoints_per_post(tmp_path):
+    posts = [_hn_post(i) for i in range(1, 4)]
+    response = json.dumps([_analysis(1), _analysis(2), _analysis(3)])
+
+    with mock.patch.object(batch_analyzer.get_llm("hn_post"), "generate_text", return_value=response), \
+            ThreadPoolExecutor(max_workers=2) as executor:
+        hn_analyses = analyze_hn_posts(posts, "idea", str(tmp_path), executor)
+
+    assert [a["post"]["url"] for a in hn_analyses] == [p["url"] for p in posts]
+    assert (tmp_path / "05_hn_analyses_partial_3.json").exists()
@@ -0,0 +1,135 @@
+"""
+Tests for concurrent collection of HackerNews and Reddit posts.
+"""
+import json
+import threading
+import time
+from unittest import mock
+
+from business_validator.scrapers import collector
+from business_validator.scrapers.collector import collect_hn_posts, collect_reddit_posts
+
+
+def _posts(prefix, count):
+    return [{"title": f"{prefix} {i}", "url": f"https://example.com/{prefix}/{i}"} for i in range(count)]
+
+
+def _slow_first(results):
+    """Fake search where the first keyword finishes last, so completion order differs from keyword order."""
+    def search(keyword, max_pages=3):
+        if keyword == "first":
+            time.sleep(0.2)
+        return results[keyword]
+    return search
+
+
+def test_hn_results_keep_keyword_order_when_searches_finish_out_of_order(tmp_path):
+    first, second = _posts("first", 2), _posts("second", 2)
+    results = {"first": first, "second": second + first[:1]}
+
+    with mock.patch.object(collector, "search_hackernews", side_effect=_slow_first(results)):
+        posts = collect_hn_posts(["first", "second"], str(tmp_path), max_hn_posts=3)
+
+    assert posts == first + second[:1]
+
+
+def test_hn_searches_run_concurrently(tmp_path):
+    both_started = threading.Barrier(2, timeout=2)
+
+    def search(keyword, max_pages=3):
+        both_started.wait()
+        return _posts(keyword, 1)
+
+    with mock.patch.object(collector, "search_hackernews", side_effect=search):
+        posts = collect_hn_posts(["a", "b"], str(tmp_path), max_workers=2)
+
+    assert len(posts) == 2
+
+
+def test_hn_keyword_checkpoints_are_written_and_reused(tmp_path):
+    with mock.patch.object(collector, "search_hackernews", side_effect=lambda keyword, max_pages=3: _posts(keyword, 1)):
+        collect_hn_posts(["a", "b"], str(tmp_path))
+
+    with open(tmp_path / "02_hn_posts_partial_2.json") as f:
+        assert json.load(f) == _posts("b", 1)
+
+    with mock.patch.object(collector, "search_hackernews", side_effect=AssertionError("searched again")):
+        assert collect_hn_posts(["a", "b"], str(tmp_path)) == _posts("a", 1) + _posts("b", 1)
+
+
+def test_failed_hn_search_is_skipped(tmp_path):
+    def search(keyword, max_pages=3):
+        if keyword == "broken":
+            raise RuntimeError("search failed")
+        return _posts(keyword, 1)
+
+    with mock.patch.object(collector, "search_hackernews", side_effect=search):
+        assert collect_hn_posts(["broken", "ok"], str(tmp_path)) == _posts("ok", 1)
+
+
+def test_reddit_selection_keeps_keyword_order_and_fetches_comments_once(tmp_path):
+    first, second = _posts("first", 2), _posts("second", 3)
+    results = {"first": first, "second": first[1:] + second}
+    fetched = []
+
+    def comments(url, max_comments=20):
+        fetched.append(url)
+        return {"content": "", "comments": [{"text": url}]}
+
+    with mock.patch.object(collector, "search_reddit", side_effect=_slow_first(results)), \
+            mock.patch.object(collector, "get_reddit_comments", side_effect=comments):
+        collected = collect_reddit_posts(["first", "second"], str(tmp_path), max_reddit_posts=4)
+
+    expected = first + second[:2]
+    assert collected["reddit_posts"] == expected
+    assert [item["post"] for item in collected["reddit_posts_with_comments"]] == expected
+    assert sorted(fetched) == sorted(post["url"] for post in expected)
+    with open(tmp_path / "04_reddit_comments_partial_4.json") as f:
+        assert json.load(f)["post"] == second[1]
+
+
+def test_reddit_comment_checkpoints_are_reused(tmp_path):
+    posts = _posts("a", 2)
+    with mock.patch.object(collector, "search_reddit", return_value=posts), \
+            mock.patch.object(collector, "get_reddit_comments", return_value={"content": "", "comments": []}):
+        first_run = collect_reddit_posts(["a"], str(tmp_path))
+
+    with mock.patch.object(collector, "search_reddit", side_effect=AssertionError("searched again")), \
+            mock.patch.object(collector, "get_reddit_comments", side_effect=AssertionError("fetched again")):
+        assert collect_reddit_posts(["a"], str(tmp_path)) == first_run
+
+
+def test_only_stubs_with_a_link_and_no_content_are_fetched():
+    stubs = [
+        {"title": "article", "link": "https://example.com/a", "url": "https://example.com/a", "content": ""},
+        {"title": "ask hn", "link": "https://news.ycombinator.com/item?id=1", "url": "x", "content": "Story text"},
+        {"title": "no link", "link": "", "url": "y", "content": ""},
+    ]
+    fetch = mock.Mock(side_effect=lambda post: {**post, "content": f"body of {post['link']}"})
+
+    with mock.patch.object(collector, "fetch_hn_post_content", fetch):
+        hydrated = collector.hydrate_hn_posts(stubs)
+
+    assert fetch.call_count == 1
+    assert [post["content"] for post in hydrated] == ["body of https://example.com/a", "Story text", ""]
+    assert stubs[0]["content"] == ""
+
+
+def test_hydration_runs_concurrently_and_keeps_order():
+    stubs = [{"title": str(i), "link": f"https://example.com/{i}", "url": str(i), "content": ""} for i in range(4)]
+    all_started = threading.Barrier(4, timeout=2)
+
+    def fetch(post):
+        all_started.wait()
+        return {**post, "content": post["title"]}
+
+    with mock.patch.object(collector, "fetch_hn_post_content", side_effect=fetch):
+        hydrated = collector.hydrate_hn_posts(stubs, max_workers=4)
+
+    assert [post["content"] for post in hydrated] == ["0", "1", "2", "3"]
+
+
+def test_collection_returns_stubs_without_fetching_articles(tmp_path):
+    with mock.patch.object(collector, "search_hackernews", return_value=_posts("a", 3)), \
+            mock.patch.object(collector, "fetch_hn_post_content", side_effect=AssertionError("fetched during search")):
+        assert len(collect_hn_posts(["a"], str(tmp_path), max_hn_posts=2)) == 2
@@ -0,0 +1,106 @@
+"""
+Tests for the shared HTTP fetch layer and its per-host politeness scheduler.
+"""
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
+
+import pytest
+import requests
+
+from business_validator.config import HTTP_TIMEOUT
+from business_validator.scrapers import fetch
+from business_validator.utils.concurrency import HostThrottle, host_of
+
+
+def _response(body=b"page"):
+    response = requests.Response()
+    response.status_code = 200
+    response._content = body
+    return response
+
+
+def _start_times(throttle, hosts):
+    """Enter a slot for each host from its own thread and return (host, start time) pairs."""
+    starts = []
+    lock = threading.Lock()
+
+    def request(host):
+        with throttle.slot(host):
+            with lock:
+                starts.append((host, time.monotonic()))
+
+    with ThreadPoolExecutor(max_workers=len(hosts)) as executor:
+        list(executor.map(request, hosts))
+    return starts
+
+
+def test_host_of_lowercases_and_ignores_ports():
+    assert host_of("https://WWW.Reddit.com:443/r/x") == "www.reddit.com"
+    assert host_of("not a url") == ""
+
+
+def test_request_starts_to_one_host_are_spaced_by_its_interval():
+    throttle = HostThrottle(min_intervals={"slow.example": 0.1}, default_concurrency=3)
+
+    starts = sorted(start for _, start in _start_times(throttle, ["slow.example"] * 3))
+
+    gaps = [later - earlier for earlier, later in zip(starts, starts[1:])]
+    assert all(gap >= 0.09 for gap in gaps)
+
+
+def test_hosts_do_not_wait_on_each_other():
+    throttle = HostThrottle(min_intervals={"slow.example": 0.3}, default_interval=0.0)
+    began = time.monotonic()
+
+    starts = _start_times(throttle, ["slow.example", "slow.example", "fast.example"])
+
+    fast_start = next(start for host, start in starts if host == "fast.example")
+    assert fast_start - began < 0.2
+
+
+def test_concurrency_is_capped_per_host():
+    throttle = HostThrottle(max_concurrency={"capped.example": 1}, default_concurrency=4)
+    running = {"capped.example": 0, "open.example": 0}
+    peak = dict(running)
+    lock = threading.Lock()
+
+    def request(host):
+        with throttle.slot(host):
+            with lock:
+                running[host] += 1
+                peak[host] = max(peak[host], running[host])
+            time.sleep(0.05)
+            with lock:
+                running[host] -= 1
+
+    with ThreadPoolExecutor(max_workers=6) as executor:
+        list(executor.map(request, ["capped.example"] * 3 + ["open.example"] * 3))
+
+    assert peak == {"capped.example": 1, "open.example": 3}
+
+
+def test_http_get_uses_the_default_timeout_and_the_hosts_slot():
+    throttle = mock.MagicMock(wraps=HostThrottle())
+    with mock.patch.object(fetch, "host_throttle", throttle), \
+            mock.patch.object(fetch.session, "get", return_value=_response()) as get:
+        fetch.http_get("https://Example.com/page", use_cache=False)
+        fetch.http_get("https://example.com/other", timeout=2, use_cache=False)
+
+    throttle.slot.assert_called_with("example.com")
+    assert throttle.slot.call_count == 2
+    assert get.call_args_list[0].kwargs["timeout"] == HTTP_TIMEOUT
+    assert get.call_args_list[1].kwargs["timeout"] == 2
+
+
+def test_http_get_raises_timeouts_and_frees_the_slot():
+    throttle = HostThrottle(max_concurrency={"example.com": 1})
+    with mock.patch.object(fetch, "host_throttle", throttle), \
+            mock.patch.object(fetch.session, "get", side_effect=requests.Timeout("read timed out")):
+        for _ in range(2):
+            with pytest.raises(requests.Timeout):
+                fetch.http_get("https://example.com/slow", use_cache=False)
+
+    # A leaked slot would make this acquire block
+    assert throttle._semaphore("example.com").acquire(timeout=0.1)
@@ -0,0 +1,118 @@
+"""
+Tests for parsing and paging the HackerNews Algolia search API.
+"""
+import json
+from unittest import mock
+from urllib.parse import parse_qs, urlparse
+
+import requests
+
+from business_validator.scrapers import hackernews
+from business_validator.scrapers.hackernews import iter_hackernews, search_hackernews
+
+
+def _response(payload, status_code=200):
+    response = requests.Response()
+    response.status_code = status_code
+    response._content = json.dumps(payload).encode("utf-8")
+    return response
+
+
+def _hit(object_id, **fields):
+    hit = {
+        "objectID": str(object_id),
+        "title": f"Story {object_id}",
+        "url": f"https://example.com/{object_id}",
+        "points": 10,
+        "num_comments": 2,
+        "author": "pg",
+        "created_at": "2026-01-01T00:00:00.000Z",
+        "created_at_i": 1767225600,
+    }
+    hit.update(fields)
+    return hit
+
+
+def _pages(*pages):
+    """Fake http_get serving Algolia pages by their "page" parameter, recording requested URLs."""
+    requested = []
+
+    def http_get(url, **kwargs):
+        requested.append(url)
+        page = int(parse_qs(urlparse(url).query)["page"][0])
+        return _response({"hits": pages[page], "nbPages": len(pages), "page": page})
+
+    return http_get, requested
+
+
+def test_hit_is_parsed_into_a_post():
+    http_get, _ = _pages([_hit(1, story_text=None)])
+    with mock.patch.object(hackernews, "http_get", side_effect=http_get):
+        [post] = search_hackernews("idea")
+
+    assert post["title"] == "Story 1"
+    assert post["url"] == post["link"] == "https://example.com/1"
+    assert post["hn_url"] == "https://news.ycombinator.com/item?id=1"
+    assert post["meta"] == "10 points by pg | 2 comments"
+    assert post["content"] == ""
+
+
+def test_missing_fields_get_defaults():
+    http_get, _ = _pages([{"objectID": 7, "url": None, "points": None, "title": None}])
+    with mock.patch.object(hackernews, "http_get", side_effect=http_get):
+        [post] = search_hackernews("idea")
+
+    # Ask HN stories have no link; the post falls back to its HN item page
+    assert post["url"] == "https://news.ycombinator.com/item?id=7"
+    assert post["title"] == "No title"
+    assert post["points"] == 0 and post["comments"] == 0 and post["author"] == ""
+
+
+def test_story_text_markup_is_stripped():
+    http_get, _ = _pages([_hit(1, url=None, story_text="First<p>Second &amp; third<br>with <i>style</i>")])
+    with mock.patch.object(hackernews, "http_get", side_effect=http_get):
+        [post] = search_hackernews("idea")
+
+    assert post["content"] == "First\nSecond & third\nwith style"
+
+
+def test_pages_are_read_until_enough_results():
+    http_get, requested = _pages([_hit(1), _hit(2)], [_hit(3), _hit(4)], [_hit(5), _hit(6)])
+    with mock.patch.object(hackernews, "http_get", side_effect=http_get):
+        posts = search_hackernews("idea", max_pages=3, max_results=3)
+
+    assert [post["object_id"] for post in posts] == ["1", "2", "3"]
+    assert len(requested) == 2
+    assert parse_qs(urlparse(requested[0]).query)["hitsPerPage"] == ["3"]
+
+
+def test_paging_stops_when_the_results_run_out():
+    http_get, requested = _pages([_hit(1), _hit(2)], [_hit(3)])
+    with mock.patch.object(hackernews, "http_get", side_effect=http_get):
+        posts = search_hackernews("idea", max_pages=5, max_results=10)
+
+    assert [post["object_id"] for post in posts] == ["1", "2", "3"]
+    assert len(requested) == 2
+
+
+def test_unparseable_hit_is_skipped():
+    http_get, _ = _pages([{"title": "no objectID"}, _hit(2)])
+    with mock.patch.object(hackernews, "http_get", side_effect=http_get):
+        posts = search_hackernews("idea")
+
+    assert [post["object_id"] for post in posts] == ["2"]
+
+
+def test_failed_request_ends_the_search():
+    with mock.patch.object(hackernews, "http_get", return_value=_response({}, status_code=503)):
+        assert search_hackernews("idea") == []
+
+
+def test_iteration_can_stop_early():
+    http_get, requested = _pages([_hit(1), _hit(2)], [_hit(3)])
+    with mock.patch.object(hackernews, "http_get", side_effect=http_get):
+        posts = iter_hackernews("idea", max_pages=5, max_results=10)
+        assert next(posts)["object_id"] == "1"
+        posts.close()
+
+    assert len(requested) == 1
@@ -0,0 +1,102 @@
+"""
+Tests for hedged LLM requests.
+"""
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest import mock
+
+from SimpleLLM.language import hedging
+from SimpleLLM.language.hedging import HedgePolicy
+from SimpleLLM.language.llm import LLM, LLMProvider
+from SimpleLLM.language.llm_providers import openrouter_llm
+
+closed = {}
+
+
+class FakeLLM(LLM):
+    """Streams its model name after a per-model delay instead of calling a provider."""
+
+    delays = {"slow": 1.0, "fast": 0.0}
+
+    def _provider_stream(self, user_prompt, system_prompt="", response_format=None):
+        try:
+            time.sleep(self.delays[self.model_name])
+            yield self.model_name
+            yield "!"
+        finally:
+            closed[self.model_name] = True
+
+
+def _llm(model, secondary="fast", initial_delay=0.1):
+    policy = HedgePolicy(LLMProvider.OPENROUTER, secondary, initial_delay=initial_delay, min_delay=0.0)
+    return FakeLLM(LLMProvider.OPENROUTER, model, hedge=policy)
+
+
+def setup_function():
+    closed.clear()
+    hedging.hedge_recorder.reset()
+    hedging.latency_tracker = hedging.LatencyTracker()
+
+
+def test_slow_primary_loses_to_hedge_and_is_cancelled():
+    llm = _llm("slow")
+    started = time.monotonic()
+    assert llm.generate_text("prompt", use_cache=False) == "fast!"
+    assert time.monotonic() - started < 0.8
+
+    deadline = time.monotonic() + 5
+    while "slow" not in closed and time.monotonic() < deadline:
+        time.sleep(0.05)
+    assert closed.get("slow")
+    stats = hedging.hedge_recorder.stats()["OPENROUTER/slow"]
+    assert stats == {"calls": 1, "hedged": 1, "secondary_wins": 1, "failed": 0}
+    assert hedging.hedge_recorder.records[-1]["winner"] == "secondary"
+
+
+def test_fast_primary_is_not_hedged_and_streams():
+    llm = _llm("fast", secondary="slow", initial_delay=1.0)
+    assert list(llm.generate_text_stream("prompt", use_cache=False)) == ["fast", "!"]
+    assert hedging.hedge_recorder.stats()["OPENROUTER/fast"]["hedged"] == 0
+
+
+class _ReasoningServer(BaseHTTPRequestHandler):
+    """Streams keep-alive comments without content for "reasoning" and answers at once for "fast"."""
+
+    disconnected = threading.Event()
+
+    def do_POST(self):
+        model = json.loads(self.rfile.read(int(self.headers["Content-Length"])))["model"]
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.end_headers()
+        if model == "fast":
+            chunk = {"choices": [{"delta": {"content": "fast!"}}]}
+            self.wfile.write(f"data: {json.dumps(chunk)}\n\ndata: [DONE]\n\n".encode("utf-8"))
+            return
+        try:
+            for _ in range(100):
+                self.wfile.write(b": OPENROUTER PROCESSING\n\n")
+                self.wfile.flush()
+                time.sleep(0.05)
+        except OSError:
+            type(self).disconnected.set()
+
+    def log_message(self, *args):
+        pass
+
+
+def test_loser_without_content_yet_is_disconnected():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _ReasoningServer)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    policy = HedgePolicy(LLMProvider.OPENROUTER, "fast", initial_delay=0.2, min_delay=0.0)
+    llm = LLM(LLMProvider.OPENROUTER, "reasoning", hedge=policy)
+    try:
+        with mock.patch.object(openrouter_llm, "API_URL", f"http://127.0.0.1:{server.server_port}/"), \
+                mock.patch.dict("os.environ", {"OPENROUTER_API_KEY": "test"}):
+            assert llm.generate_text("prompt", use_cache=False) == "fast!"
+            assert _ReasoningServer.disconnected.wait(2)
+    finally:
+        server.shutdown()
+        server.server_close()
@@ -0,0 +1,103 @@
+"""
+Tests for the on-disk HTTP response cache used by the scrapers.
+"""
+import json
+import os
+from unittest import mock
+
+import requests
+
+from business_validator.scrapers import fetch
+from business_validator.scrapers.http_cache import HTTPCache, cache_key
+
+
+def _response(status_code=200, body=b"payload", headers=None, url="https://example.com/page"):
+    response = requests.Response()
+    response.status_code = status_code
+    response._content = body
+    response.url = url
+    response.encoding = "utf-8"
+    response.headers.update(headers or {})
+    return response
+
+
+def test_fresh_entry_is_served_without_network(tmp_path):
+    cache = HTTPCache(str(tmp_path), default_ttl=60)
+    with mock.patch.object(fetch, "http_cache", cache), \
+            mock.patch.object(fetch.session, "get", return_value=_response()) as get:
+        first = fetch.http_get("https://example.com/page", params={"q": "a b"})
+        second = fetch.http_get("https://example.com/page", params={"q": "a b"})
+
+    assert get.call_count == 1
+    assert first.text == second.text == "payload"
+    assert cache.stats()["hits"] == 1 and cache.stats()["misses"] == 1
+
+
+def test_stale_entry_is_revalidated_with_etag(tmp_path):
+    cache = HTTPCache(str(tmp_path), default_ttl=60)
+    url = "https://example.com/page"
+    cache.store(cache_key(url), url, _response(headers={"ETag": '"v1"'}))
+    # Age the entry past its TTL
+    meta_path = os.path.join(tmp_path, f"{cache_key(url)}.json")
+    with open(meta_path) as f:
+        meta = json.load(f)
+    meta["stored_at"] -= 120
+    with open(meta_path, "w") as f:
+        json.dump(meta, f)
+
+    with mock.patch.object(fetch, "http_cache", cache), \
+            mock.patch.object(fetch.session, "get", return_value=_response(status_code=304, body=b"")) as get:
+        response = fetch.http_get(url)
+
+    assert get.call_args.kwargs["headers"]["If-None-Match"] == '"v1"'
+    assert response.status_code == 200 and response.content == b"payload"
+    assert cache.is_fresh(cache.lookup(cache_key(url)))
+    assert cache.stats()["revalidations"] == 1
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path):
+    cache = HTTPCache(str(tmp_path), default_ttl=60, max_bytes=25)
+    for name in ("a", "b", "c"):
+        url = f"https://example.com/{name}"
+        cache.store(cache_key(url), url, _response(body=b"x" * 10, url=url))
+        if name == "b":
+            cache.touch(cache_key("https://example.com/a"))
+
+    assert cache.lookup(cache_key("https://example.com/b")) is None
+    assert cache.lookup(cache_key("https://example.com/a")) is not None
+    assert cache.stats()["evictions"] == 1
+    assert len([n for n in os.listdir(tmp_path) if n.endswith(".body")]) == 2
+
+
+def test_hosts_with_zero_ttl_are_not_cached(tmp_path):
+    cache = HTTPCache(str(tmp_path), ttls={"example.com": 0}, default_ttl=60)
+    url = "https://example.com/page"
+    cache.store(cache_key(url), url, _response())
+    assert cache.lookup(cache_key(url)) is None
+
+
+def test_api_key_is_kept_out_of_keys_and_metadata(tmp_path):
+    cache = HTTPCache(str(tmp_path), default_ttl=60)
+    target = "https%3A%2F%2Fwww.reddit.com%2Fsearch.json%3Fq%3Dai"
+    url = f"http://api.scraperapi.com?api_key=secret&url={target}"
+
+    assert cache_key(url) == cache_key(f"http://api.scraperapi.com?api_key=other&url={target}")
+    cache.store(cache_key(url), url, _response(url=url))
+    for name in os.listdir(tmp_path):
+        with open(os.path.join(tmp_path, name), "rb") as f:
+            assert b"secret" not in f.read()
+    assert cache.lookup(cache_key(url))["meta"]["url"] == f"http://api.scraperapi.com?url={target}"
+
+
+def test_index_skips_entries_removed_while_loading(tmp_path):
+    cache = HTTPCache(str(tmp_path), default_ttl=60)
+    (tmp_path / "gone.body").write_bytes(b"x")
+    real_stat = os.stat
+
+    def stat(path, *args, **kwargs):
+        if path.endswith("gone.body"):
+            raise FileNotFoundError(path)
+        return real_stat(path, *args, **kwargs)
+
+    with mock.patch("os.stat", side_effect=stat):
+        assert cache.stats()["entries"] == 0
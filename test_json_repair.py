@@ -0,0 +1,41 @@
+"""
+Tests for the JSON repair parser.
+"""
+import pytest
+
+from SimpleLLM.language.json_repair import JSONRepairError, repair_json, repair_json_object
+from SimpleLLM.language.llm_addons import extract_json
+
+
+@pytest.mark.parametrize("text, expected", [
+    ('```json\n{"a": [1, 2,], "b": {"c": "d",},}\n```', {"a": [1, 2], "b": {"c": "d"}}),
+    ("Here you go: {'name': 'O\\'Brien', 'ok': True, 'missing': None}", {"name": "O'Brien", "ok": True, "missing": None}),
+    ('{"a": 1 "b": [x, y] c: two words}', {"a": 1, "b": ["x", "y"], "c": "two words"}),
+    ('{"quote": "He said "hi" today", "line": "a\nb"}', {"quote": 'He said "hi" today', "line": "a\nb"}),
+    ('{"a": [1, 2.5e', {"a": [1, 2.5]}),
+    ('{"done": "yes", "cut": "half a sent', {"done": "yes", "cut": "half a sent"}),
+    ('{"a": 1, "dangling":', {"a": 1}),
+    ('[{"x": 1}, {"x": 2},', [{"x": 1}, {"x": 2}]),
+])
+def test_repairs_common_llm_mistakes(text, expected):
+    assert repair_json(text) == expected
+
+
+def test_values_with_quotes_and_literals_survive():
+    # The old str.replace cleanup turned these into broken or altered values
+    text = "{\"note\": \"it's None of True's business\", 'flag': False,}"
+    assert repair_json(text) == {"note": "it's None of True's business", "flag": False}
+
+
+def test_unrecoverable_text():
+    with pytest.raises(JSONRepairError):
+        repair_json("no json here")
+    assert extract_json("still nothing") == {}
+
+
+def test_object_repair_skips_brackets_in_the_preamble():
+    text = 'Here is [the] result: {"a": 1, "b": [2,]}'
+    assert repair_json_object(text) == {"a": 1, "b": [2]}
+    assert extract_json(text) == {"a": 1, "b": [2]}
+    with pytest.raises(JSONRepairError):
+        repair_json_object('[1, 2]')
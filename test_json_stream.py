@@ -0,0 +1,113 @@
+"""
+Tests for the incremental JSON parser and streamed structured generation.
+"""
+import json
+from unittest import mock
+
+import pytest
+from pydantic import BaseModel
+
+from SimpleLLM.language.json_stream import InvalidJSONStreamError, JSONStreamParser
+from SimpleLLM.language.llm import LLM, LLMProvider
+from SimpleLLM.language.llm_addons import generate_basic_pydantic_json_model
+from SimpleLLM.language.llm_providers.resilience import ProviderHTTPError
+
+
+class Verdict(BaseModel):
+    relevant: bool
+    notes: list
+
+
+def _feed_all(text, chunk_size=3):
+    parser = JSONStreamParser()
+    for start in range(0, len(text), chunk_size):
+        if parser.feed(text[start:start + chunk_size]):
+            break
+    return parser
+
+
+def test_stops_at_top_level_close_and_skips_preamble():
+    text = '```json\n{"a": [1, -2.5e3, true, null, "q\\"\\u00e9"], "b": {}}\n```\nHope this helps!'
+    parser = _feed_all(text)
+    assert parser.complete
+    assert json.loads(parser.text) == {"a": [1, -2500.0, True, None, 'q"é'], "b": {}}
+
+
+def test_object_stream_skips_brackets_in_the_preamble():
+    parser = JSONStreamParser(start="{")
+    parser.feed('Here is [the] result: ')
+    assert parser.feed('{"a": [1]} trailing')
+    assert json.loads(parser.text) == {"a": [1]}
+
+
+@pytest.mark.parametrize("text", ['{"a": True}', '{"a": 1,}', '{"a" 1}', "{'a': 1}", '{"a": [1 2]}'])
+def test_invalid_json_is_rejected_as_soon_as_it_appears(text):
+    with pytest.raises(InvalidJSONStreamError):
+        _feed_all(text)
+
+
+def _streams(*chunk_lists):
+    """Fake _generate_text_stream results, recording which chunks were read and whether each was closed."""
+    read, closed = [], []
+
+    def stream(chunks):
+        try:
+            for chunk in chunks:
+                read.append(chunk)
+                yield chunk
+        finally:
+            closed.append(True)
+
+    streams = iter([stream(chunks) for chunks in chunk_lists])
+    return (lambda *args: next(streams)), read, closed
+
+
+def test_doomed_stream_is_closed_at_first_invalid_token_and_retried():
+    llm = LLM.create(provider=LLMProvider.OPENROUTER, model_name="stream-model")
+    bad = ['{"relevant": ', "True", ', "notes": ["never read"]}']
+    good = ['{"relevant": true, ', '"notes": ["ok"]}', " trailing chatter"]
+    streams, read, closed = _streams(bad, good)
+
+    with mock.patch.object(LLM, "_generate_text_stream", side_effect=streams):
+        verdict = generate_basic_pydantic_json_model(Verdict, llm, "prompt", structured_output=False, stream=True)
+
+    assert verdict == Verdict(relevant=True, notes=["ok"])
+    assert ', "notes": ["never read"]}' not in read and " trailing chatter" not in read
+    assert closed == [True, True]
+
+
+def test_invalid_prefix_is_repaired_without_another_call():
+    llm = LLM.create(provider=LLMProvider.OPENROUTER, model_name="stream-model")
+    malformed = ['{"relevant": true, "notes": ["kept"]', ", 'extra'", ": 1} never read"]
+    streams, read, closed = _streams(malformed)
+
+    with mock.patch.object(LLM, "_generate_text_stream", side_effect=streams):
+        verdict = generate_basic_pydantic_json_model(Verdict, llm, "prompt", structured_output=False, stream=True)
+
+    assert verdict == Verdict(relevant=True, notes=["kept"])
+    assert read == malformed[:2] and closed == [True]
+
+
+def test_unrecognised_client_error_falls_back_to_the_plain_prompt():
+    llm = LLM.create(provider=LLMProvider.OPENROUTER, model_name="strict-stream-model")
+    formats = []
+
+    def stream(user_prompt, system_prompt="", response_format=None):
+        formats.append(response_format)
+        if response_format is not None:
+            raise ProviderHTTPError("OpenRouter API error: 400, bad request", 400)
+        return iter(['{"relevant": false, "notes": []}'])
+
+    with mock.patch.object(LLM, "_generate_text_stream", side_effect=stream):
+        verdict = generate_basic_pydantic_json_model(Verdict, llm, "prompt", stream=True)
+
+    assert verdict == Verdict(relevant=False, notes=[])
+    assert formats[0] is not None and formats[1:] == [None]
+
+
+def test_retryable_provider_errors_are_raised_from_the_stream():
+    llm = LLM.create(provider=LLMProvider.OPENROUTER, model_name="busy-stream-model")
+    error = ProviderHTTPError("OpenRouter API error: 503, busy", 503, retryable=True)
+
+    with mock.patch.object(LLM, "_generate_text_stream", side_effect=error), pytest.raises(ProviderHTTPError):
+        generate_basic_pydantic_json_model(Verdict, llm, "prompt", stream=True)
@@ -0,0 +1,88 @@
+"""
+Tests for the SimpleLLM response cache.
+"""
+import os
+from unittest import mock
+
+from SimpleLLM.language.llm import LLM, LLMProvider
+from SimpleLLM.language.llm_cache import LLMCache
+
+
+def _llm(cache):
+    return LLM.create(provider=LLMProvider.OPENROUTER, model_name="test-model", cache=cache)
+
+
+def test_repeated_prompt_is_served_from_memory_and_disk(tmp_path):
+    llm = _llm(LLMCache(cache_dir=str(tmp_path)))
+    with mock.patch.object(LLM, "_generate_text", return_value="answer") as generate:
+        assert llm.generate_text("prompt", system_prompt="sys") == "answer"
+        assert llm.generate_text("prompt", system_prompt="sys") == "answer"
+        assert generate.call_count == 1
+
+        # A new process only has the disk tier
+        fresh = _llm(LLMCache(cache_dir=str(tmp_path)))
+        assert fresh.generate_text("prompt", system_prompt="sys") == "answer"
+        assert generate.call_count == 1
+
+        # Any parameter change is a different key
+        llm.temperature = 0.1
+        llm.generate_text("prompt", system_prompt="sys")
+        assert generate.call_count == 2
+
+
+def test_bypass_and_expiry_call_the_provider(tmp_path):
+    cache = LLMCache(cache_dir=str(tmp_path), ttl=60)
+    llm = _llm(cache)
+    with mock.patch.object(LLM, "_generate_text", return_value="answer") as generate, \
+            mock.patch("SimpleLLM.language.llm_cache.time.time", return_value=1000.0):
+        llm.generate_text("prompt")
+        llm.generate_text("prompt", use_cache=False)
+        assert generate.call_count == 2
+
+    with mock.patch.object(LLM, "_generate_text", return_value="answer") as generate, \
+            mock.patch("SimpleLLM.language.llm_cache.time.time", return_value=1100.0):
+        llm.generate_text("prompt")
+        assert generate.call_count == 1
+
+
+def test_stream_is_cached_and_replayed_as_chunks():
+    llm = _llm(LLMCache(max_entries=1))
+    with mock.patch.object(LLM, "_generate_text_stream", return_value=iter(["Hel", "lo"])) as stream:
+        assert "".join(llm.generate_text_stream("prompt")) == "Hello"
+        replayed = list(llm.generate_text_stream("prompt"))
+        assert "".join(replayed) == "Hello"
+        assert stream.call_count == 1
+        assert llm.generate_text("prompt") == "Hello"
+
+
+def test_memory_tier_is_bounded():
+    cache = LLMCache(max_entries=2)
+    for key in ("a", "b", "c"):
+        cache.set(key, key)
+    assert cache.get("a") is None
+    assert cache.get("c") == "c"
+
+
+def test_disk_tier_evicts_least_recently_used_without_rescanning(tmp_path):
+    cache = LLMCache(cache_dir=str(tmp_path), max_entries=1, max_disk_bytes=250)
+    cache.set("a", "x" * 60)
+    cache.set("b", "x" * 60)
+    assert cache.get("a") is not None  # "a" is now more recently used than "b"
+
+    with mock.patch("SimpleLLM.language.llm_cache.os.listdir", side_effect=AssertionError("rescanned")):
+        cache.set("c", "x" * 60)
+
+    assert sorted(os.listdir(tmp_path)) == ["a.json", "c.json"]
+
+
+def test_disk_trim_ignores_files_removed_by_another_process(tmp_path):
+    first = LLMCache(cache_dir=str(tmp_path), max_disk_bytes=250)
+    second = LLMCache(cache_dir=str(tmp_path), max_disk_bytes=250)
+    for key in ("a", "b"):
+        first.set(key, "x" * 60)
+    second.set("c", "x" * 60)  # Loads an index that still lists "a" and "b"
+    first.set("d", "x" * 60)  # Evicts "a", which second still counts
+
+    second.set("e", "x" * 60)
+
+    assert len(os.listdir(tmp_path)) <= 3
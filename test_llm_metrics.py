@@ -0,0 +1,77 @@
+"""
+Tests for LLM results and per-stage metrics.
+"""
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
+
+from SimpleLLM.language.llm import LLM, LLMProvider
+from SimpleLLM.language.llm_providers import openrouter_llm
+from SimpleLLM.language.llm_result import LLMMetrics, bind_context, collect_metrics, record_retry, record_usage
+from business_validator.pipeline import Pipeline, Stage
+
+USAGE = {"prompt_tokens": 100, "completion_tokens": 10, "prompt_tokens_details": {"cached_tokens": 60}, "cost": 0.002}
+
+
+def fake_generate_text(user_prompt, model, **kwargs):
+    record_retry()
+    record_usage("openrouter", model, USAGE)
+    return f"answer to {user_prompt}"
+
+
+def fake_generate_text_stream(user_prompt, model, **kwargs):
+    yield "first"
+    yield " second"
+    record_usage("openrouter", model, USAGE)
+
+
+def test_generate_returns_usage_latency_and_retries():
+    llm = LLM(LLMProvider.OPENROUTER, "test-model")
+    with mock.patch.object(openrouter_llm, "generate_text", side_effect=fake_generate_text):
+        result = llm.generate("question")
+
+    assert result.text == "answer to question"
+    assert (result.prompt_tokens, result.completion_tokens, result.cached_tokens) == (100, 10, 60)
+    assert result.retries == 1 and result.model == "test-model" and not result.estimated
+    assert result.latency is not None and result.time_to_first_token is None
+
+
+def test_stream_result_has_time_to_first_token_and_estimates_when_closed_early():
+    llm = LLM(LLMProvider.OPENROUTER, "test-model")
+    with mock.patch.object(openrouter_llm, "generate_text_stream", side_effect=fake_generate_text_stream):
+        stream = llm.generate_text_stream("question")
+        assert "".join(stream) == "first second"
+        assert stream.result.completion_tokens == 10 and stream.result.time_to_first_token is not None
+
+        stream = llm.generate_text_stream("question")
+        next(stream)
+        stream.close()
+    assert stream.result.text == "first" and stream.result.estimated
+
+
+def test_metrics_are_attributed_to_stages_across_worker_threads():
+    llm = LLM(LLMProvider.OPENROUTER, "test-model")
+
+    def keywords():
+        return llm.generate_text("keywords")
+
+    def analyses(keywords):
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            return list(executor.map(bind_context(llm.generate_text), ["a", "b", "c"]))
+
+    pipeline = Pipeline([
+        Stage("keywords", keywords, outputs=["keywords"]),
+        Stage("analyses", analyses, inputs=["keywords"], outputs=["analyses"]),
+    ])
+    metrics = LLMMetrics()
+    with mock.patch.object(openrouter_llm, "generate_text", side_effect=fake_generate_text):
+        with collect_metrics(metrics):
+            pipeline.run({})
+        llm.generate_text("outside the run")
+
+    stats = metrics.stats()
+    assert set(stats["stages"]) == {"keywords", "analyses"}
+    assert stats["stages"]["analyses"]["calls"] == 3
+    assert stats["stages"]["analyses"]["cached_tokens"] == 180
+    assert stats["total"]["calls"] == 4 and stats["total"]["retries"] == 4
+    assert stats["total"]["cost"] == 0.008
+    assert stats["total"]["models"] == {"OPENROUTER/test-model": 4}
@@ -0,0 +1,53 @@
+"""
+Tests for the map-reduce final analysis.
+"""
+import threading
+from unittest import mock
+
+from business_validator.analyzers import combined_analyzer
+from business_validator.models import CombinedAnalysis
+
+
+def _item(i, relevant=True):
+    return {
+        "post": {"title": f"Post {i}"},
+        "analysis": {"relevant": relevant, "pain_points": [f"pain {i}"], "sentiment": "neutral", "engagement_score": 5},
+    }
+
+
+def _run(levels, fail_prompt=None):
+    prompts = []
+    lock = threading.Lock()
+
+    def fake_generate(prompt):
+        with lock:
+            prompts.append(prompt)
+        if fail_prompt and fail_prompt in prompt:
+            raise ValueError("bad output")
+        return CombinedAnalysis(overall_score=60, market_validation_summary="partial")
+
+    hn = [_item(i) for i in range(100)] + [_item(i, relevant=False) for i in range(30)]
+    reddit = [_item(i) for i in range(100)]
+    with mock.patch.object(combined_analyzer, "_generate_combined", side_effect=fake_generate):
+        result = combined_analyzer.generate_map_reduce_analysis(
+            "idea", hn, reddit, [], chunk_size=10, fanin=4, levels=levels
+        )
+    return result, prompts
+
+
+def test_levels_control_the_reduction_tree():
+    # 20 chunks; two levels merge them into 5 partials before the final call
+    result, prompts = _run(levels=2)
+    assert result.overall_score == 60
+    assert len(prompts) == 20 + 5 + 1
+    assert sum("Partial Analyses:" in prompt for prompt in prompts) == 6
+
+    _, prompts = _run(levels=1)
+    assert len(prompts) == 20 + 1
+
+
+def test_failed_chunks_are_skipped():
+    result, prompts = _run(levels=1, fail_prompt="HackerNews Data:")
+    assert result.overall_score == 60
+    final_prompt = prompts[-1]
+    assert "Reddit posts 91-100" in final_prompt and "HackerNews posts" not in final_prompt
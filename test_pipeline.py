@@ -0,0 +1,93 @@
+"""
+Tests for the validation pipeline stage scheduler.
+"""
+import json
+import os
+import threading
+import time
+
+import pytest
+
+from business_validator.pipeline import Pipeline, Stage
+
+
+def test_independent_stages_run_concurrently(tmp_path):
+    """Stages that only share an upstream input should overlap in time."""
+    both_started = threading.Barrier(2, timeout=2)
+
+    def branch(value):
+        both_started.wait()
+        return value * 2
+
+    pipeline = Pipeline([
+        Stage("source", lambda seed: seed + 1, inputs=["seed"], outputs=["value"]),
+        Stage("left", branch, inputs=["value"], outputs=["left"]),
+        Stage("right", branch, inputs=["value"], outputs=["right"]),
+        Stage("join", lambda left, right: left + right, inputs=["left", "right"], outputs=["total"]),
+    ])
+
+    context = pipeline.run({"seed": 1}, data_dir=str(tmp_path))
+
+    assert context["total"] == 8
+    with open(os.path.join(tmp_path, "stage_timings.json")) as f:
+        timings = json.load(f)
+    assert {t["stage"] for t in timings["stages"]} == {"source", "left", "right", "join"}
+    assert all(t["status"] == "completed" for t in timings["stages"])
+
+
+def test_stage_starts_before_unrelated_slow_stage_finishes():
+    """A stage should not wait for stages it does not depend on."""
+    order = []
+
+    def slow(seed):
+        time.sleep(0.3)
+        order.append("slow")
+        return seed
+
+    def fast(seed):
+        order.append("fast")
+        return seed
+
+    pipeline = Pipeline([
+        Stage("slow", slow, inputs=["seed"], outputs=["slow"]),
+        Stage("fast", fast, inputs=["seed"], outputs=["fast"]),
+        Stage("after_fast", lambda fast: order.append("after_fast"), inputs=["fast"], outputs=["done"]),
+    ])
+    pipeline.run({"seed": 0})
+
+    assert order.index("after_fast") < order.index("slow")
+
+
+def test_multiple_outputs_must_be_returned_as_dict():
+    """A stage with several outputs returns them keyed by name."""
+    pipeline = Pipeline([
+        Stage("split", lambda seed: {"a": seed, "b": seed + 1}, inputs=["seed"], outputs=["a", "b"]),
+    ])
+    assert pipeline.run({"seed": 1})["b"] == 2
+
+
+def test_cycles_and_missing_inputs_are_rejected():
+    """Invalid graphs fail before any stage runs."""
+    with pytest.raises(ValueError):
+        Pipeline([
+            Stage("a", lambda b: b, inputs=["b"], outputs=["a"]),
+            Stage("b", lambda a: a, inputs=["a"], outputs=["b"]),
+        ])
+
+    pipeline = Pipeline([Stage("a", lambda missing: missing, inputs=["missing"], outputs=["a"])])
+    with pytest.raises(ValueError):
+        pipeline.run({})
+
+
+def test_stage_failure_is_raised_and_recorded(tmp_path):
+    """A failing stage stops the pipeline and is marked failed in the timings."""
+    def broken(seed):
+        raise RuntimeError("boom")
+
+    pipeline = Pipeline([Stage("broken", broken, inputs=["seed"], outputs=["value"])])
+    with pytest.raises(RuntimeError):
+        pipeline.run({"seed": 1}, data_dir=str(tmp_path))
+
+    with open(os.path.join(tmp_path, "stage_timings.json")) as f:
+        timings = json.load(f)
+    assert timings["stages"][0]["status"] == "failed"
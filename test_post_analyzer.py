@@ -0,0 +1,99 @@
+"""
+Tests for analyzing posts on the shared analysis worker pool.
+"""
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
+
+from business_validator.analyzers import post_analyzer
+from business_validator.analyzers.post_analyzer import analyze_hn_posts, analyze_reddit_posts
+
+
+def _hn_post(i):
+    return {"title": f"Post {i}", "points": i, "comments": 0, "url": f"https://example.com/{i}"}
+
+
+def _one_per_batch(texts, route):
+    return [[i] for i in range(len(texts))]
+
+
+def _analysis(label):
+    return {"relevant": True, "pain_points": [label]}
+
+
+def test_analyses_keep_input_order_when_batches_finish_out_of_order(tmp_path):
+    posts = [_hn_post(i) for i in range(4)]
+
+    def analyze_batch(batch, business_idea):
+        time.sleep(0.05 * (4 - batch[0]["points"]))
+        return [_analysis(post["title"]) for post in batch]
+
+    with mock.patch.object(post_analyzer, "plan_batches", side_effect=_one_per_batch), \
+            mock.patch.object(post_analyzer, "analyze_hn_batch", side_effect=analyze_batch), \
+            ThreadPoolExecutor(max_workers=4) as executor:
+        analyses = analyze_hn_posts(posts, "idea", str(tmp_path), executor)
+
+    assert [a["post"]["url"] for a in analyses] == [p["url"] for p in posts]
+    assert [a["analysis"]["pain_points"] for a in analyses] == [[p["title"]] for p in posts]
+    assert all((tmp_path / f"05_hn_analyses_partial_{i}.json").exists() for i in range(1, 5))
+
+
+def test_shared_executor_bounds_concurrent_calls_across_platforms(tmp_path):
+    running = 0
+    peak = 0
+    lock = threading.Lock()
+
+    def analyze_batch(batch, business_idea):
+        nonlocal running, peak
+        with lock:
+            running += 1
+            peak = max(peak, running)
+        time.sleep(0.05)
+        with lock:
+            running -= 1
+        return [_analysis("x") for _ in batch]
+
+    reddit_posts = [{"post": _hn_post(i), "comments": {"comments": []}} for i in range(4)]
+    with mock.patch.object(post_analyzer, "plan_batches", side_effect=_one_per_batch), \
+            mock.patch.object(post_analyzer, "analyze_hn_batch", side_effect=analyze_batch), \
+            mock.patch.object(post_analyzer, "analyze_reddit_batch", side_effect=analyze_batch), \
+            ThreadPoolExecutor(max_workers=2) as executor:
+        hn_posts = [_hn_post(i) for i in range(4)]
+        hn = threading.Thread(target=analyze_hn_posts, args=(hn_posts, "idea", str(tmp_path), executor))
+        hn.start()
+        reddit = analyze_reddit_posts(reddit_posts, "idea", str(tmp_path), executor)
+        hn.join()
+
+    assert len(reddit) == 4
+    assert peak == 2
+
+
+def test_checkpointed_posts_are_not_analyzed_again(tmp_path):
+    posts = [_hn_post(i) for i in range(3)]
+    analyzed = []
+
+    def analyze_batch(batch, business_idea):
+        analyzed.extend(post["url"] for post in batch)
+        return [_analysis("fresh") for _ in batch]
+
+    with mock.patch.object(post_analyzer, "analyze_hn_batch", side_effect=analyze_batch), \
+            ThreadPoolExecutor(max_workers=2) as executor:
+        analyze_hn_posts(posts[:2], "idea", str(tmp_path), executor)
+        analyzed.clear()
+        analyses = analyze_hn_posts(posts, "idea", str(tmp_path), executor)
+
+    assert analyzed == [posts[2]["url"]]
+    assert len(analyses) == 3
+
+
+def test_failed_placeholder_analyses_are_redone(tmp_path):
+    posts = [_hn_post(0)]
+    responses = iter([[{"relevant": False, "pain_points": ["Analysis failed"]}], [_analysis("retried")]])
+
+    with mock.patch.object(post_analyzer, "analyze_hn_batch", side_effect=lambda batch, idea: next(responses)), \
+            ThreadPoolExecutor(max_workers=1) as executor:
+        analyze_hn_posts(posts, "idea", str(tmp_path), executor)
+        [analysis] = analyze_hn_posts(posts, "idea", str(tmp_path), executor)
+
+    assert analysis["analysis"]["pain_points"] == ["retried"]
@@ -0,0 +1,53 @@
+"""
+Tests for token-budgeted final analysis prompt assembly.
+"""
+from business_validator.analyzers.prompt_assembler import (
+    assemble_final_analysis_prompt,
+    escape_prompt_text,
+    estimate_tokens,
+    rank_analyses,
+    relevance_terms,
+)
+
+BUDGETS = {"hn": 500, "reddit": 500, "web": 300}
+
+
+def _item(i, engagement=5, relevant=True, title=None):
+    return {
+        "post": {"title": title or f"Post about widgets {i}", "subreddit": "startups"},
+        "analysis": {
+            "relevant": relevant,
+            "pain_points": [f"pain {i}"],
+            "solutions_mentioned": [],
+            "market_signals": [],
+            "sentiment": "neutral",
+            "engagement_score": engagement,
+        },
+    }
+
+
+def test_prompt_size_is_bounded_by_section_budgets():
+    def size(count):
+        items = [_item(i) for i in range(count)]
+        web = [{"title": f"Result {i}", "snippet": "widget market " * 10} for i in range(count)]
+        prompt = assemble_final_analysis_prompt("widget tracker", items, items, web, "Return JSON.", budgets=BUDGETS)
+        return estimate_tokens(prompt)
+
+    assert size(500) <= sum(BUDGETS.values()) + 100
+    assert size(500) - size(50) < 50
+
+
+def test_ranking_prefers_engagement_and_relevance_and_drops_irrelevant():
+    terms = relevance_terms("gardening app", ["plants"])
+    items = [
+        _item(1, engagement=2, title="Unrelated thread"),
+        _item(2, engagement=9, title="Unrelated thread"),
+        _item(3, engagement=2, title="Gardening app for plants"),
+        _item(4, engagement=10, relevant=False),
+    ]
+    assert [number for number, _ in rank_analyses(items, terms)] == [3, 2, 1]
+
+
+def test_scraped_text_is_escaped_and_truncated():
+    assert escape_prompt_text('say "hi"\\\nnext') == 'say \\"hi\\"\\\\\\nnext'
+    assert escape_prompt_text("x" * 50, max_chars=10) == "x" * 10 + "..."
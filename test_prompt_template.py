@@ -0,0 +1,37 @@
+"""
+Tests for prompt templates and cached-token reporting.
+"""
+import pytest
+
+from SimpleLLM.language.llm_addons import schema_response_format, schema_system_prompt
+from SimpleLLM.language.llm_providers.usage import UsageTracker
+from business_validator.analyzers.hackernews_analyzer import HN_POST_PROMPT
+from business_validator.models import HNPostAnalysis
+from business_validator.prompt_template import PromptTemplate
+
+
+def test_render_puts_static_prefix_first():
+    template = PromptTemplate(prefix="Use {braces} literally.\n", body="Idea: {idea} ({count}) {{x}}")
+    assert template.fields == {"idea", "count"}
+    assert template.render(idea="tea", count=2) == "Use {braces} literally.\nIdea: tea (2) {x}"
+    with pytest.raises(KeyError):
+        template.render(idea="tea")
+
+
+def test_prompts_for_different_posts_share_a_prefix():
+    first = HN_POST_PROMPT.render(business_idea="idea one", post="Title: A")
+    second = HN_POST_PROMPT.render(business_idea="idea two", post="Title: B")
+    assert first.startswith(HN_POST_PROMPT.prefix) and second.startswith(HN_POST_PROMPT.prefix)
+    assert schema_system_prompt(HNPostAnalysis) is schema_system_prompt(HNPostAnalysis)
+    assert schema_response_format(HNPostAnalysis) is schema_response_format(HNPostAnalysis)
+
+
+def test_usage_tracker_reports_cached_tokens():
+    tracker = UsageTracker()
+    tracker.record("openrouter", "m", {"prompt_tokens": 1000, "completion_tokens": 50,
+                                       "prompt_tokens_details": {"cached_tokens": 800}})
+    tracker.record("openrouter", "m", {"prompt_tokens": 1000, "completion_tokens": 50, "prompt_cache_hit_tokens": 200})
+    tracker.record("openrouter", "m", None)
+    assert tracker.stats()["openrouter/m"] == {
+        "calls": 2, "prompt_tokens": 2000, "cached_tokens": 1000, "completion_tokens": 100, "cached_ratio": 0.5
+    }
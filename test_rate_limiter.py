@@ -0,0 +1,62 @@
+"""
+Tests for the process-wide LLM rate limiter.
+"""
+from unittest import mock
+
+import pytest
+
+from SimpleLLM.language import rate_limiter as rate_limiter_module
+from SimpleLLM.language.rate_limiter import RateLimiter
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def monotonic(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+
+@pytest.fixture
+def clock():
+    clock = FakeClock()
+    with mock.patch.object(rate_limiter_module.time, "monotonic", clock.monotonic), \
+            mock.patch.object(rate_limiter_module.time, "sleep", clock.sleep):
+        yield clock
+
+
+def test_requests_per_minute_are_enforced_and_waits_reported(clock):
+    limiter = RateLimiter()
+    limiter.configure("OPENROUTER", rpm=2)
+
+    waits = [limiter.acquire("OPENROUTER", "model", tokens=10).waited for _ in range(3)]
+
+    assert waits[:2] == [0.0, 0.0]
+    assert waits[2] == pytest.approx(30.0)
+    stats = limiter.stats()["OPENROUTER/model"]
+    assert stats["calls"] == 3 and stats["waited_calls"] == 1
+    assert stats["max_wait_seconds"] == pytest.approx(30.0)
+
+
+def test_model_and_provider_token_budgets_both_apply(clock):
+    limiter = RateLimiter()
+    limiter.configure("OPENAI", tpm=6000)
+    limiter.configure("OPENAI", "small", tpm=600)
+
+    limiter.acquire("OPENAI", "small", tokens=600)
+    assert limiter.acquire("OPENAI", "small", tokens=300).waited == pytest.approx(30.0)
+    # Another model is only bound by the provider budget, which still has room
+    assert limiter.acquire("OPENAI", "large", tokens=3000).waited == 0.0
+
+
+def test_unused_reserved_tokens_are_returned(clock):
+    limiter = RateLimiter()
+    limiter.configure("OPENAI", tpm=1000)
+
+    reservation = limiter.acquire("OPENAI", "model", tokens=1000)
+    limiter.settle(reservation, actual_tokens=200)
+
+    assert limiter.acquire("OPENAI", "model", tokens=800).waited == 0.0
@@ -0,0 +1,159 @@
+"""
+Tests for parsing and paging Reddit's JSON search and comment endpoints.
+"""
+import json
+from unittest import mock
+from urllib.parse import parse_qs, urlparse
+
+import requests
+
+from business_validator.scrapers import reddit
+from business_validator.scrapers.reddit import _flatten_comments, get_reddit_comments, search_reddit
+
+
+def _response(payload, status_code=200):
+    response = requests.Response()
+    response.status_code = status_code
+    response._content = json.dumps(payload).encode("utf-8")
+    return response
+
+
+def _post(post_id, **fields):
+    data = {
+        "id": post_id,
+        "title": f"Post {post_id}",
+        "subreddit": "startups",
+        "subreddit_name_prefixed": "r/startups",
+        "permalink": f"/r/startups/comments/{post_id}/post/",
+        "score": 12,
+        "num_comments": 3,
+        "selftext": "Body",
+        "author": "founder",
+        "created_utc": 1767225600.0,
+    }
+    data.update(fields)
+    return {"kind": "t3", "data": data}
+
+
+def _listing(children, after=None):
+    return {"kind": "Listing", "data": {"children": children, "after": after}}
+
+
+def _comment(body, score=1, depth=0, author="user", replies=""):
+    data = {"body": body, "score": score, "depth": depth, "author": author, "replies": replies}
+    return {"kind": "t1", "data": data}
+
+
+def _search_pages(*pages):
+    """Fake http_get serving search listings in order, chained by their "after" cursors."""
+    requested = []
+
+    def http_get(url, **kwargs):
+        requested.append(url)
+        after = parse_qs(urlparse(url).query).get("after", [None])[0]
+        index = 0 if after is None else int(after)
+        cursor = str(index + 1) if index + 1 < len(pages) else None
+        return _response(_listing(pages[index], after=cursor))
+
+    return http_get, requested
+
+
+def test_listing_entry_is_parsed_into_a_post():
+    http_get, requested = _search_pages([_post("abc")])
+    with mock.patch.object(reddit, "http_get", side_effect=http_get):
+        [post] = search_reddit("idea")
+
+    assert post["url"] == post["link"] == "https://www.reddit.com/r/startups/comments/abc/post/"
+    assert post["subreddit"] == "r/startups"
+    assert post["votes"] == 12 and post["num_comments"] == 3
+    assert post["content"] == "Body"
+    assert parse_qs(urlparse(requested[0]).query)["q"] == ["idea"]
+
+
+def test_missing_fields_get_defaults():
+    http_get, _ = _search_pages([{"kind": "t3", "data": {"id": "x", "subreddit": "ideas"}}])
+    with mock.patch.object(reddit, "http_get", side_effect=http_get):
+        [post] = search_reddit("idea")
+
+    assert post["title"] == "No title"
+    assert post["subreddit"] == "ideas"
+    assert post["url"] == ""
+    assert post["votes"] == 0 and post["content"] == ""
+
+
+def test_search_follows_the_after_cursor_until_enough_results():
+    http_get, requested = _search_pages([_post("a"), _post("b")], [_post("c"), _post("d")], [_post("e")])
+    with mock.patch.object(reddit, "http_get", side_effect=http_get):
+        posts = search_reddit("idea", max_pages=3, max_results=3)
+
+    assert [post["id"] for post in posts] == ["a", "b", "c"]
+    assert len(requested) == 2
+    assert parse_qs(urlparse(requested[1]).query)["after"] == ["1"]
+
+
+def test_search_stops_when_paging_runs_out():
+    http_get, requested = _search_pages([_post("a")], [_post("b")])
+    with mock.patch.object(reddit, "http_get", side_effect=http_get):
+        posts = search_reddit("idea", max_pages=5, max_results=10)
+
+    assert [post["id"] for post in posts] == ["a", "b"]
+    assert len(requested) == 2
+
+
+def test_non_post_children_are_skipped():
+    http_get, _ = _search_pages([{"kind": "t5", "data": {"display_name": "startups"}}, _post("a")])
+    with mock.patch.object(reddit, "http_get", side_effect=http_get):
+        assert [post["id"] for post in search_reddit("idea")] == ["a"]
+
+
+def test_failed_search_returns_no_posts():
+    with mock.patch.object(reddit, "http_get", return_value=_response({}, status_code=429)):
+        assert search_reddit("idea") == []
+
+
+def test_nested_comments_are_flattened_depth_first():
+    tree = [
+        _comment("top", replies=_listing([
+            _comment("reply", depth=1, replies=_listing([_comment("deep", depth=2)])),
+            {"kind": "more", "data": {"children": ["zzz"]}},
+        ])),
+        _comment("second"),
+    ]
+
+    comments = _flatten_comments(tree)
+
+    assert [comment["text"] for comment in comments] == ["top", "reply", "deep", "second"]
+    assert [comment["depth"] for comment in comments] == [0, 1, 2, 0]
+
+
+def test_deleted_comments_are_dropped_but_their_replies_kept():
+    tree = [
+        _comment("[deleted]", author="[deleted]", replies=_listing([_comment("still here", depth=1)])),
+        _comment("[removed]"),
+        _comment("kept", author=None, score=None),
+    ]
+
+    comments = _flatten_comments(tree)
+
+    assert [comment["text"] for comment in comments] == ["still here", "kept"]
+    assert comments[1]["author"] == "Unknown user"
+    assert comments[1]["score"] == 0
+
+
+def test_comments_are_fetched_in_one_request_and_ranked_by_score():
+    listings = [
+        _listing([_post("abc", selftext="Post body")]),
+        _listing([_comment("low", score=1), _comment("high", score=50, replies=_listing([_comment("mid", score=5)]))]),
+    ]
+    with mock.patch.object(reddit, "http_get", return_value=_response(listings)) as http_get:
+        result = get_reddit_comments("https://www.reddit.com/r/startups/comments/abc/post/?utm=x", max_comments=2)
+
+    assert http_get.call_count == 1
+    assert http_get.call_args[0][0].startswith("https://www.reddit.com/r/startups/comments/abc/post.json?")
+    assert result["content"] == "Post body"
+    assert [comment["text"] for comment in result["comments"]] == ["high", "mid"]
+
+
+def test_unexpected_comments_response_returns_no_comments():
+    with mock.patch.object(reddit, "http_get", return_value=_response({"error": 404})):
+        assert get_reddit_comments("https://www.reddit.com/r/x/comments/1/") == {"content": "", "comments": []}
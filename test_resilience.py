@@ -0,0 +1,82 @@
+"""
+Tests for the LLM provider retry and circuit breaker policy.
+"""
+import io
+from unittest import mock
+
+import pytest
+import requests
+
+from SimpleLLM.language.llm_providers import resilience
+from SimpleLLM.language.llm_providers.resilience import CircuitBreaker, CircuitOpenError, post_with_retries
+
+
+def _response(status_code, headers=None):
+    response = requests.Response()
+    response.status_code = status_code
+    response.raw = io.BytesIO(b"")
+    response.headers.update(headers or {})
+    return response
+
+
+@pytest.fixture(autouse=True)
+def fresh_breakers():
+    with mock.patch.object(resilience, "_breakers", {}), mock.patch.object(resilience.time, "sleep") as sleep:
+        yield sleep
+
+
+def test_retries_server_errors_and_honours_retry_after(fresh_breakers):
+    responses = [_response(429, {"Retry-After": "7"}), _response(503), _response(200)]
+    with mock.patch.object(resilience.requests, "post", side_effect=responses) as post:
+        response = post_with_retries("test", "https://llm.example/v1", {}, {})
+
+    assert response.status_code == 200
+    assert post.call_count == 3
+    assert post.call_args.kwargs["timeout"] == resilience.DEFAULT_TIMEOUT
+    assert fresh_breakers.call_args_list[0].args[0] >= 7
+
+
+def test_client_errors_are_returned_without_retrying():
+    with mock.patch.object(resilience.requests, "post", return_value=_response(400)) as post:
+        assert post_with_retries("test", "https://llm.example/v1", {}, {}).status_code == 400
+    assert post.call_count == 1
+
+
+def test_circuit_opens_after_repeated_failures_and_fails_fast():
+    with mock.patch.object(resilience.requests, "post", side_effect=requests.ConnectionError("down")) as post:
+        with pytest.raises(CircuitOpenError):
+            for _ in range(3):
+                try:
+                    post_with_retries("test", "https://llm.example/v1", {}, {})
+                except requests.ConnectionError:
+                    pass
+    assert post.call_count == resilience.FAILURE_THRESHOLD
+
+
+def test_half_open_trial_closes_the_circuit():
+    breaker = CircuitBreaker("test", failure_threshold=1, reset_timeout=10)
+    with mock.patch.object(resilience.time, "monotonic", return_value=100.0):
+        breaker.record_failure()
+        with pytest.raises(CircuitOpenError):
+            breaker.before_call()
+    with mock.patch.object(resilience.time, "monotonic", return_value=111.0):
+        breaker.before_call()
+        with pytest.raises(CircuitOpenError):
+            breaker.before_call()  # Only one trial at a time
+        breaker.record_success()
+        breaker.before_call()
+    assert breaker.state == "closed"
+
+
+def test_unexpected_error_during_half_open_trial_releases_it():
+    breaker = CircuitBreaker("test", failure_threshold=1, reset_timeout=10)
+    with mock.patch.object(resilience, "_breakers", {"test": breaker}):
+        with mock.patch.object(resilience.time, "monotonic", return_value=100.0):
+            breaker.record_failure()
+        with mock.patch.object(resilience.time, "monotonic", return_value=111.0):
+            with mock.patch.object(resilience.requests, "post", side_effect=requests.exceptions.InvalidURL("bad")):
+                with pytest.raises(requests.exceptions.InvalidURL):
+                    post_with_retries("test", "https://llm.example/v1", {}, {}, max_retries=0)
+            with mock.patch.object(resilience.requests, "post", return_value=_response(200)):
+                assert post_with_retries("test", "https://llm.example/v1", {}, {}).status_code == 200
+    assert breaker.state == "closed"
@@ -0,0 +1,151 @@
+"""
+Tests for resuming an interrupted validation run from its checkpoints.
+"""
+import json
+import os
+from unittest import mock
+
+import pytest
+
+from business_validator import validator
+from business_validator.analyzers.combined_analyzer import _fallback_analysis
+from business_validator.models import CombinedAnalysis
+from business_validator.utils import environment
+
+RUN_ID = "validation_test_idea_20260101_000000"
+
+FINAL_ANALYSIS = CombinedAnalysis(overall_score=72, market_validation_summary="Real demand")
+
+
+def _write(run_dir, file_name, data):
+    with open(os.path.join(run_dir, file_name), "w", encoding="utf-8") as f:
+        json.dump(data, f)
+
+
+def _not_called(*args, **kwargs):
+    raise AssertionError("a completed stage was run again")
+
+
+@pytest.fixture
+def partial_run(tmp_path):
+    """A run interrupted after HN analysis and web search, before Reddit collection finished."""
+    run_dir = tmp_path / RUN_ID
+    run_dir.mkdir()
+    _write(run_dir, "info.json", {
+        "business_idea": "test idea",
+        "timestamp": "20260101_000000",
+        "run_id": RUN_ID,
+        "parameters": {"keywords_count": 2, "max_pages_per_keyword": 1, "max_hn_posts": 1, "max_reddit_posts": 1}
+    })
+    hn_posts = [{"title": "Ask HN: test idea?", "url": "https://example.com", "points": 10}]
+    _write(run_dir, "01_keywords.json", {"business_idea": "test idea", "keywords": ["test", "idea"]})
+    _write(run_dir, "02_hn_posts_complete.json", hn_posts)
+    _write(run_dir, "02_hn_posts_hydrated.json", hn_posts)
+    _write(run_dir, "05_hn_analyses_complete.json", [{"post": hn_posts[0], "analysis": {"relevant": True}}])
+    _write(run_dir, "08_web_insights.json", [])
+    with mock.patch.object(environment, "DATA_DIR", str(tmp_path)):
+        yield run_dir
+
+
+def _patch_stages(**overrides):
+    """Patch every stage's work with a failure unless an override is given."""
+    targets = {
+        "generate_keywords": _not_called,
+        "collect_hn_posts": _not_called,
+        "hydrate_hn_posts": _not_called,
+        "analyze_hn_posts": _not_called,
+        "gather_web_platform_insights": _not_called,
+        "collect_reddit_posts": _not_called,
+        "analyze_reddit_posts": _not_called,
+        "generate_final_analysis": _not_called,
+    }
+    targets.update(overrides)
+    return [mock.patch.object(validator, name, side_effect=fn) for name, fn in targets.items()]
+
+
+def _resume(patches):
+    for patch in patches:
+        patch.start()
+    try:
+        return validator.resume_run(RUN_ID, analysis_workers=1)
+    finally:
+        for patch in patches:
+            patch.stop()
+
+
+def test_resume_skips_completed_stages(partial_run):
+    reddit_post = {"title": "Anyone tried this?", "permalink": "/r/test/1"}
+    collected = {"reddit_posts": [reddit_post], "reddit_posts_with_comments": [{"post": reddit_post, "comments": []}]}
+
+    final = _resume(_patch_stages(
+        collect_reddit_posts=lambda *args, **kwargs: collected,
+        analyze_reddit_posts=lambda posts, *args: [{"post": posts[0]["post"], "analysis": {"relevant": False}}],
+        generate_final_analysis=lambda **kwargs: FINAL_ANALYSIS,
+    ))
+
+    assert final["overall_score"] == 72
+    for file_name in ("04_reddit_comments_complete.json", "06_reddit_analyses_complete.json", "07_final_analysis.json"):
+        assert os.path.exists(partial_run / file_name)
+
+
+def test_resume_retries_a_fallback_final_analysis(partial_run):
+    _write(partial_run, "04_reddit_comments_complete.json", [])
+    _write(partial_run, "06_reddit_analyses_complete.json", [])
+    _write(partial_run, "07_final_analysis.json", _fallback_analysis().model_dump())
+    final_analysis = mock.Mock(return_value=FINAL_ANALYSIS)
+
+    final = _resume(_patch_stages(generate_final_analysis=final_analysis))
+
+    assert final_analysis.call_count == 1
+    assert final["overall_score"] == 72
+    with open(partial_run / "07_final_analysis.json", encoding="utf-8") as f:
+        assert json.load(f)["overall_score"] == 72
+
+
+def test_resume_reuses_a_finished_final_analysis(partial_run):
+    _write(partial_run, "04_reddit_comments_complete.json", [])
+    _write(partial_run, "06_reddit_analyses_complete.json", [])
+    _write(partial_run, "07_final_analysis.json", FINAL_ANALYSIS.model_dump())
+
+    assert _resume(_patch_stages())["overall_score"] == 72
+
+
+def test_resume_retries_failed_analyses(partial_run):
+    _write(partial_run, "05_hn_analyses_complete.json", [
+        {"post": {"url": "https://example.com"}, "analysis": {"pain_points": ["Analysis failed"]}}
+    ])
+    _write(partial_run, "04_reddit_comments_complete.json", [])
+    _write(partial_run, "06_reddit_analyses_complete.json", [])
+    analyze_hn = mock.Mock(return_value=[{"post": {"url": "https://example.com"}, "analysis": {"relevant": True}}])
+
+    _resume(_patch_stages(analyze_hn_posts=analyze_hn, generate_final_analysis=lambda **kwargs: FINAL_ANALYSIS))
+
+    assert analyze_hn.call_count == 1
+    with open(partial_run / "05_hn_analyses_complete.json", encoding="utf-8") as f:
+        assert json.load(f)[0]["analysis"] == {"relevant": True}
+
+
+def test_streaming_resume_streams_only_the_missing_platform(partial_run):
+    with open(partial_run / "info.json", encoding="utf-8") as f:
+        info = json.load(f)
+    info["parameters"]["streaming"] = True
+    _write(partial_run, "info.json", info)
+    reddit_post = {"title": "Anyone tried this?", "permalink": "/r/test/1"}
+    streamed = {
+        "hn_posts": [],
+        "hn_analyses": [],
+        "reddit_posts_with_comments": [{"post": reddit_post, "comments": []}],
+        "reddit_analyses": [{"post": reddit_post, "analysis": {"relevant": False}}],
+    }
+    stream = mock.Mock(return_value=streamed)
+    final_analysis = mock.Mock(return_value=FINAL_ANALYSIS)
+
+    with mock.patch.object(validator, "stream_analyze_posts", stream):
+        _resume(_patch_stages(generate_final_analysis=final_analysis))
+
+    assert stream.call_args.kwargs["max_hn_posts"] == 0
+    assert stream.call_args.kwargs["max_reddit_posts"] == 1
+    assert final_analysis.call_args.kwargs["hn_analyses"][0]["analysis"] == {"relevant": True}
+    with open(partial_run / "02_hn_posts_complete.json", encoding="utf-8") as f:
+        assert len(json.load(f)) == 1
+    assert os.path.exists(partial_run / "06_reddit_analyses_complete.json")
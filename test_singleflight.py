@@ -0,0 +1,191 @@
+"""
+Tests for coalescing identical in-flight LLM and HTTP calls.
+"""
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
+
+import pytest
+import requests
+
+from SimpleLLM.language.llm import LLM, LLMProvider
+from SimpleLLM.language.singleflight import SingleFlight
+from business_validator.scrapers import fetch
+
+
+def test_concurrent_identical_llm_calls_share_one_request():
+    calls = []
+
+    def slow_generate(user_prompt, system_prompt="", response_format=None):
+        calls.append(user_prompt)
+        time.sleep(0.2)
+        return f"answer to {user_prompt}"
+
+    llm = LLM(LLMProvider.OPENROUTER, "test-model")
+    with mock.patch("SimpleLLM.language.llm.llm_flight", SingleFlight()) as flight, \
+            mock.patch.object(LLM, "_generate_text", side_effect=slow_generate):
+        with ThreadPoolExecutor(max_workers=6) as executor:
+            results = list(executor.map(llm.generate, ["trend"] * 5 + ["other"]))
+
+    assert sorted(calls) == ["other", "trend"]
+    assert [result.text for result in results] == ["answer to trend"] * 5 + ["answer to other"]
+    assert sum(result.coalesced for result in results) == 4
+    assert flight.stats() == {"calls": 6, "executed": 2, "coalesced": 4}
+
+
+def test_errors_are_shared_and_the_next_call_runs_again():
+    flight = SingleFlight()
+    started = threading.Event()
+
+    def failing():
+        started.set()
+        time.sleep(0.1)
+        raise ValueError("upstream failed")
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        leader = executor.submit(flight.do, "key", failing)
+        started.wait()
+        follower = executor.submit(flight.do, "key", lambda: "never run")
+        for future in (leader, follower):
+            with pytest.raises(ValueError):
+                future.result()
+    assert flight.do("key", lambda: "fresh") == ("fresh", False)
+
+
+def test_async_call_is_cancelled_only_when_every_caller_stops_waiting():
+    flight = SingleFlight()
+    runs = []
+
+    async def slow():
+        runs.append(1)
+        await asyncio.sleep(0.2)
+        return "done"
+
+    async def main():
+        first = asyncio.ensure_future(flight.do_async("key", slow))
+        second = asyncio.ensure_future(flight.do_async("key", slow))
+        await asyncio.sleep(0.05)
+        first.cancel()
+        assert await second == ("done", True)
+
+        lone = asyncio.ensure_future(flight.do_async("key", slow))
+        await asyncio.sleep(0.05)
+        lone.cancel()
+        await asyncio.sleep(0)
+        assert await flight.do_async("key", slow) == ("done", False)
+
+    asyncio.run(main())
+    assert len(runs) == 3
+
+
+def test_identical_fetches_share_one_request():
+    def slow_get(url, **kwargs):
+        time.sleep(0.2)
+        response = requests.Response()
+        response.status_code = 200
+        response._content = b"page"
+        return response
+
+    with mock.patch.object(fetch, "fetch_flight", SingleFlight()) as flight, \
+            mock.patch.object(fetch.session, "get", side_effect=slow_get) as get:
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            responses = list(executor.map(
+                lambda _: fetch.http_get("https://example.com/search?q=idea", use_cache=False), range(4)
+            ))
+
+    assert get.call_count == 1
+    assert all(response.content == b"page" for response in responses)
+    assert flight.stats()["coalesced"] == 3
+
+
+def test_concurrent_identical_streams_share_one_upstream():
+    opened = []
+    release = threading.Event()
+
+    def slow_stream(user_prompt, system_prompt="", response_format=None):
+        opened.append(user_prompt)
+        yield "first "
+        release.wait()
+        yield "second"
+
+    llm = LLM(LLMProvider.OPENROUTER, "test-model")
+    with mock.patch("SimpleLLM.language.llm.llm_flight", SingleFlight()) as flight, \
+            mock.patch.object(LLM, "_generate_text_stream", side_effect=slow_stream):
+        leader = llm.generate_text_stream("trend")
+        assert next(leader) == "first "
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            followers = [llm.generate_text_stream("trend") for _ in range(3)]
+            futures = [executor.submit(lambda stream: "".join(stream), stream) for stream in followers]
+            time.sleep(0.1)
+            release.set()
+            assert "".join(leader) == "second"
+            texts = [future.result() for future in futures]
+
+    assert opened == ["trend"]
+    assert texts == ["first second"] * 3
+    assert [stream.result.coalesced for stream in followers] == [True] * 3
+    assert not leader.result.coalesced
+    assert flight.stats() == {"calls": 4, "executed": 1, "coalesced": 3}
+
+
+def test_follower_streams_get_the_leaders_error():
+    flight = SingleFlight()
+
+    def failing():
+        yield "partial"
+        raise ValueError("upstream failed")
+
+    leader = flight.stream("key", failing)
+    assert next(leader) == "partial"
+    follower = flight.stream("key", lambda: iter(["never read"]))
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        future = executor.submit(list, follower)
+        time.sleep(0.05)
+        with pytest.raises(ValueError):
+            next(leader)
+        with pytest.raises(ValueError):
+            future.result()
+
+
+def test_async_streams_share_one_upstream():
+    flight = SingleFlight()
+    opened = []
+
+    async def upstream():
+        opened.append(1)
+        for chunk in ("a", "b", "c"):
+            await asyncio.sleep(0.02)
+            yield chunk
+
+    async def read():
+        return [chunk async for chunk in flight.stream_async("key", upstream)]
+
+    async def main():
+        return await asyncio.gather(read(), read(), read())
+
+    assert asyncio.run(main()) == [["a", "b", "c"]] * 3
+    assert opened == [1]
+
+
+def test_calls_bypassing_the_cache_are_not_coalesced():
+    calls = []
+
+    def slow_generate(user_prompt, system_prompt="", response_format=None):
+        calls.append(user_prompt)
+        time.sleep(0.1)
+        return "fresh"
+
+    llm = LLM(LLMProvider.OPENROUTER, "test-model")
+    with mock.patch("SimpleLLM.language.llm.llm_flight", SingleFlight()) as flight, \
+            mock.patch.object(LLM, "_generate_text", side_effect=slow_generate), \
+            mock.patch.object(LLM, "_generate_text_stream", side_effect=lambda *args, **kwargs: iter(["fresh"])):
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            results = list(executor.map(lambda _: llm.generate("trend", use_cache=False), range(3)))
+        streamed = "".join(llm.generate_text_stream("trend", use_cache=False))
+
+    assert len(calls) == 3
+    assert not any(result.coalesced for result in results)
+    assert streamed == "fresh"
+    assert flight.stats()["calls"] == 0
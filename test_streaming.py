@@ -0,0 +1,123 @@
+"""
+Tests for the streaming producer/consumer collection and analysis stage.
+"""
+import threading
+from unittest import mock
+
+from business_validator import streaming
+from business_validator.streaming import _PlatformQuota, stream_analyze_posts
+
+
+def _posts(prefix, count):
+    return [{"url": f"https://example.com/{prefix}/{i}", "title": f"{prefix} {i}"} for i in range(count)]
+
+
+def test_quota_drops_duplicates_and_stops_at_the_limit():
+    quota = _PlatformQuota(2)
+    first, second, third = _posts("hn", 3)
+
+    assert quota.claim(first) == 0
+    assert quota.claim(dict(first)) is None
+    assert quota.claim(second) == 1
+    assert quota.full.is_set()
+    assert quota.claim(third) is None
+
+
+def test_released_slot_can_be_claimed_again():
+    quota = _PlatformQuota(1)
+    failed, replacement = _posts("hn", 2)
+
+    assert quota.claim(failed) == 0
+    quota.release()
+    assert not quota.full.is_set()
+    assert quota.wait_for_room()
+    assert quota.claim(failed) is None
+    assert quota.claim(replacement) == 1
+    quota.done()
+    assert not quota.wait_for_room()
+
+
+def test_wait_for_room_blocks_until_running_analyses_settle():
+    quota = _PlatformQuota(1)
+    quota.claim(_posts("hn", 1)[0])
+    outcome = []
+    waiter = threading.Thread(target=lambda: outcome.append(quota.wait_for_room()))
+    waiter.start()
+    waiter.join(0.1)
+    assert waiter.is_alive()
+
+    quota.release()
+    waiter.join(1)
+    assert outcome == [True]
+
+
+def _scraper(pages, pulled):
+    def iter_posts(keyword, max_pages=3):
+        for post in pages[keyword]:
+            pulled.append(post["url"])
+            yield post
+    return iter_posts
+
+
+def _analyze(failing_urls=(), placeholder_urls=()):
+    def analyze(item, business_idea, index, data_dir):
+        post = item.get("post", item)
+        if post["url"] in failing_urls:
+            raise RuntimeError("analysis failed")
+        if post["url"] in placeholder_urls:
+            return {"post": post, "comments": [], "analysis": {"pain_points": ["Analysis failed"]}}
+        return {"post": post, "comments": item.get("comments", []), "analysis": {"relevant": True}}
+    return analyze
+
+
+def _run(hn_pages, reddit_pages, pulled, failing_urls=(), placeholder_urls=(), **kwargs):
+    with mock.patch.object(streaming, "iter_hackernews", _scraper(hn_pages, pulled)), \
+            mock.patch.object(streaming, "iter_reddit", _scraper(reddit_pages, pulled)), \
+            mock.patch.object(streaming, "hydrate_hn_post", side_effect=lambda post: post), \
+            mock.patch.object(streaming, "fetch_post_comments",
+                              side_effect=lambda post, index, max_comments, data_dir: {"post": post, "comments": []}), \
+            mock.patch.object(streaming, "analyze_hn_item", side_effect=_analyze(failing_urls, placeholder_urls)), \
+            mock.patch.object(streaming, "analyze_reddit_item", side_effect=_analyze(failing_urls, placeholder_urls)):
+        return stream_analyze_posts(list(hn_pages), "idea", "unused", analysis_workers=2, **kwargs)
+
+
+def test_scrapers_stop_once_the_quota_is_met():
+    hn = _posts("hn", 20)
+    reddit = _posts("reddit", 20)
+    pulled = []
+
+    result = _run({"ai": hn}, {"ai": reddit}, pulled, max_hn_posts=3, max_reddit_posts=2)
+
+    assert [item["post"]["url"] for item in result["hn_analyses"]] == [post["url"] for post in hn[:3]]
+    assert [item["post"]["url"] for item in result["reddit_analyses"]] == [post["url"] for post in reddit[:2]]
+    assert len([url for url in pulled if "/hn/" in url]) == 3
+    assert len([url for url in pulled if "/reddit/" in url]) == 2
+
+
+def test_duplicates_across_keywords_are_analyzed_once():
+    hn = _posts("hn", 3)
+    pulled = []
+
+    result = _run({"ai": hn, "ml": hn}, {"ai": [], "ml": []}, pulled, max_hn_posts=10)
+
+    assert sorted(item["post"]["url"] for item in result["hn_analyses"]) == [post["url"] for post in hn]
+
+
+def test_failed_analysis_gives_its_slot_to_the_next_post():
+    hn = _posts("hn", 5)
+    pulled = []
+
+    result = _run({"ai": hn}, {"ai": []}, pulled, failing_urls={hn[1]["url"]}, max_hn_posts=2)
+
+    assert [item["post"]["url"] for item in result["hn_analyses"]] == [hn[0]["url"], hn[2]["url"]]
+    assert len(pulled) == 3
+
+
+def test_placeholder_analysis_gives_its_slot_to_the_next_post():
+    reddit = _posts("reddit", 5)
+    pulled = []
+
+    result = _run({"ai": []}, {"ai": reddit}, pulled, placeholder_urls={reddit[0]["url"]}, max_reddit_posts=2)
+
+    assert [item["post"]["url"] for item in result["reddit_analyses"]] == [reddit[1]["url"], reddit[2]["url"]]
+    assert len(pulled) == 3
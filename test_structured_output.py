@@ -0,0 +1,46 @@
+"""
+Tests for the structured-output path of generate_basic_pydantic_json_model.
+"""
+import json
+from unittest import mock
+
+from pydantic import BaseModel
+
+from SimpleLLM.language import llm_addons
+from SimpleLLM.language.llm import LLM, LLMProvider
+from SimpleLLM.language.llm_addons import generate_basic_pydantic_json_model
+from SimpleLLM.language.llm_providers.errors import StructuredOutputUnsupportedError
+
+
+class Verdict(BaseModel):
+    relevant: bool
+    score: int
+
+
+def test_schema_is_sent_as_response_format():
+    llm = LLM.create(provider=LLMProvider.OPENAI, model_name="structured-model")
+    with mock.patch.object(LLM, "_generate_text", return_value='{"relevant": true, "score": 7}') as generate:
+        verdict = generate_basic_pydantic_json_model(Verdict, llm, "prompt")
+
+    assert verdict == Verdict(relevant=True, score=7)
+    assert generate.call_count == 1
+    response_format = generate.call_args.args[2]
+    assert response_format["type"] == "json_schema"
+    assert response_format["json_schema"]["schema"] == Verdict.model_json_schema()
+
+
+def test_models_rejecting_response_format_fall_back_and_are_remembered():
+    llm = LLM.create(provider=LLMProvider.OPENROUTER, model_name="prose-only-model")
+
+    def generate(user_prompt, system_prompt="", response_format=None):
+        if response_format:
+            raise StructuredOutputUnsupportedError("no response_format")
+        return "```json\n" + json.dumps({"relevant": False, "score": 2}) + "\n```"
+
+    with mock.patch.object(LLM, "_generate_text", side_effect=generate) as generate_text:
+        assert generate_basic_pydantic_json_model(Verdict, llm, "prompt").score == 2
+        assert generate_text.call_count == 2
+        assert not llm_addons.supports_structured_output(llm)
+
+        generate_basic_pydantic_json_model(Verdict, llm, "prompt")
+        assert generate_text.call_count == 3